@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from services.docling_service import DOCLING_SERVICE
+from services.icon_finder_service import ICON_FINDER_SERVICE
+
+HEALTH_ROUTER = APIRouter(tags=["Health"])
+
+
+@HEALTH_ROUTER.get("/health")
+async def get_liveness():
+    return {"status": "ok"}
+
+
+@HEALTH_ROUTER.get("/ready")
+async def get_readiness():
+    services = {
+        "icons": ICON_FINDER_SERVICE.is_ready,
+        "docling": DOCLING_SERVICE.is_ready,
+    }
+    ready = all(services.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "warming_up", "services": services},
+    )
@@ -3,21 +3,53 @@ import os
 
 from fastapi import FastAPI
 
+from services.concurrent_service import CONCURRENT_SERVICE
 from services.database import create_db_and_tables
-from utils.get_env import get_app_data_directory_env
+from services.docling_service import DOCLING_SERVICE
+from services.http_session_service import HTTP_SESSION_SERVICE
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.image_processing_service import IMAGE_PROCESSING_SERVICE
+from services.libreoffice_service import LIBREOFFICE_SERVICE
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
+from services.presentation_job_queue import PRESENTATION_JOB_QUEUE
+from utils.get_env import get_app_data_directory_env, get_disable_api_job_worker_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
 )
+from utils.parsers import parse_bool_or_none
+
+
+async def warm_up_services():
+    # Runs after startup so that heavy models don't delay serving requests
+    for service in [ICON_FINDER_SERVICE, DOCLING_SERVICE, LIBREOFFICE_SERVICE]:
+        try:
+            await service.initialize()
+        except Exception as e:
+            print(f"Error warming up {service.__class__.__name__}: {e}")
 
 
 @asynccontextmanager
 async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
-    Initializes the application data directory and checks LLM model availability.
+    Initializes the application data directory, checks LLM model availability
+    and starts warming up the icon index, document converter and LibreOffice
+    workers in background. Queued presentation generations are run in this
+    process too, unless they are left to separate job workers.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
     await check_llm_and_image_provider_api_or_model_availability()
+    CONCURRENT_SERVICE.run_task(None, warm_up_services)
+    run_job_worker = not parse_bool_or_none(get_disable_api_job_worker_env())
+    if run_job_worker:
+        PRESENTATION_JOB_QUEUE.start()
     yield
+    if run_job_worker:
+        await PRESENTATION_JOB_QUEUE.stop()
+    DOCLING_SERVICE.shutdown()
+    PDF_RASTERIZER_SERVICE.shutdown()
+    IMAGE_PROCESSING_SERVICE.shutdown()
+    await LIBREOFFICE_SERVICE.shutdown()
+    await HTTP_SESSION_SERVICE.close()
@@ -1,5 +1,4 @@
 import os
-import shutil
 import tempfile
 import subprocess
 from typing import List, Optional
@@ -35,7 +34,7 @@ async def process_pdf_slides(
 
     This endpoint:
     1. Validates the uploaded PDF file
-    2. Uses ImageMagick to convert PDF pages to PNG images
+    2. Renders PDF pages to images in parallel
     3. Returns screenshot URLs for each slide/page
 
     Note: Font installation is not needed since PDFs already have fonts embedded.
@@ -67,33 +66,25 @@ async def process_pdf_slides(
                 pdf_content = await pdf_file.read()
                 f.write(pdf_content)
 
-            # Generate screenshots from PDF using ImageMagick
-            screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
-                pdf_path, temp_dir
-            )
-            print(f"Generated {len(screenshot_paths)} PDF screenshots")
-
-            # Move screenshots to images directory and generate URLs
             images_dir = get_images_directory()
             presentation_id = uuid.uuid4()
             presentation_images_dir = os.path.join(images_dir, str(presentation_id))
-            os.makedirs(presentation_images_dir, exist_ok=True)
+
+            # Render screenshots from PDF directly into the images directory
+            screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
+                pdf_path, presentation_images_dir, "slide_"
+            )
+            print(f"Generated {len(screenshot_paths)} PDF screenshots")
 
             slides_data = []
 
             for i, screenshot_path in enumerate(screenshot_paths, 1):
-                # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
-                permanent_screenshot_path = os.path.join(
-                    presentation_images_dir, screenshot_filename
-                )
+                screenshot_filename = os.path.basename(screenshot_path)
 
                 if (
                     os.path.exists(screenshot_path)
                     and os.path.getsize(screenshot_path) > 0
                 ):
-                    # Use shutil.copy2 instead of os.rename to handle cross-device moves
-                    shutil.copy2(screenshot_path, permanent_screenshot_path)
                     screenshot_url = (
                         f"/app_data/images/{presentation_id}/{screenshot_filename}"
                     )
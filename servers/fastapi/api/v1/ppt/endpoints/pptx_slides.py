@@ -1,18 +1,21 @@
 import os
-import shutil
 import zipfile
 import tempfile
-import subprocess
 import uuid
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from pydantic import BaseModel
-import aiohttp
 import asyncio
 import xml.etree.ElementTree as ET
 import re
+import hashlib
+import io
+from collections import OrderedDict
+from xml.sax.saxutils import escape
 
 from services.documents_loader import DocumentsLoader
+from services.font_availability_service import FONT_AVAILABILITY_SERVICE
+from services.libreoffice_service import LIBREOFFICE_SERVICE
 from utils.asset_directory_utils import get_images_directory
 import uuid
 from constants.documents import POWERPOINT_TYPES
@@ -144,76 +147,50 @@ def normalize_font_family_name(raw_name: str) -> str:
     return normalized
 
 
+# Filter out theme font references and empty values
+_SYSTEM_FONTS = {"+mn-lt", "+mj-lt", "+mn-ea", "+mj-ea", "+mn-cs", "+mj-cs", ""}
+
+# Fonts extracted per slide, keyed by a hash of the slide XML
+_SLIDE_FONTS_CACHE: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+_SLIDE_FONTS_CACHE_SIZE = 2048
+
+
 def extract_fonts_from_oxml(xml_content: str) -> List[str]:
     """
     Extract font names from OXML content.
 
+    Every typeface attribute (latin, ea, cs, theme fonts, ...) is collected in a
+    single streaming pass. Results are memoized by slide content.
+
     Args:
         xml_content: OXML content as string
 
     Returns:
         List of unique font names found in the OXML
     """
-    fonts = set()
-
-    try:
-        # Parse the XML content
-        root = ET.fromstring(xml_content)
-
-        # Define namespaces commonly used in OXML
-        namespaces = {
-            "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
-            "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
-            "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-        }
-
-        # Search for font references in various OXML elements
-        # Look for latin fonts
-        for font_elem in root.findall(".//a:latin", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for east asian fonts
-        for font_elem in root.findall(".//a:ea", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for complex script fonts
-        for font_elem in root.findall(".//a:cs", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for font references in theme elements
-        for font_elem in root.findall(".//a:font", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for rPr (run properties) font references
-        for rpr_elem in root.findall(".//a:rPr", namespaces):
-            for font_elem in rpr_elem.findall(".//a:latin", namespaces):
-                if "typeface" in font_elem.attrib:
-                    fonts.add(font_elem.attrib["typeface"])
-
-        # Also search without namespace prefix for compatibility
-        for font_elem in root.findall(".//latin"):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Regex fallback for fonts that might be missed
-        font_pattern = r'typeface="([^"]+)"'
-        regex_fonts = re.findall(font_pattern, xml_content)
-        fonts.update(regex_fonts)
-
-        # Filter out system fonts and empty values
-        system_fonts = {"+mn-lt", "+mj-lt", "+mn-ea", "+mj-ea", "+mn-cs", "+mj-cs", ""}
-        fonts = {font for font in fonts if font not in system_fonts and font.strip()}
-
+    xml_bytes = xml_content.encode("utf-8")
+    cache_key = hashlib.sha256(xml_bytes).hexdigest()
+    fonts = _SLIDE_FONTS_CACHE.get(cache_key)
+    if fonts is not None:
+        _SLIDE_FONTS_CACHE.move_to_end(cache_key)
         return list(fonts)
 
+    try:
+        found_fonts = set()
+        for _, element in ET.iterparse(io.BytesIO(xml_bytes), events=("start",)):
+            typeface = element.attrib.get("typeface")
+            if typeface and typeface not in _SYSTEM_FONTS and typeface.strip():
+                found_fonts.add(typeface)
     except Exception as e:
         print(f"Error extracting fonts from OXML: {e}")
         return []
 
+    fonts = tuple(found_fonts)
+    _SLIDE_FONTS_CACHE[cache_key] = fonts
+    if len(_SLIDE_FONTS_CACHE) > _SLIDE_FONTS_CACHE_SIZE:
+        _SLIDE_FONTS_CACHE.popitem(last=False)
+    return list(fonts)
+
 
 async def check_google_font_availability(font_name: str) -> bool:
     """
@@ -225,19 +202,8 @@ async def check_google_font_availability(font_name: str) -> bool:
     Returns:
         True if font is available in Google Fonts, False otherwise
     """
-    try:
-        formatted_name = font_name.replace(" ", "+")
-        url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.head(
-                url, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                return response.status == 200
-
-    except Exception as e:
-        print(f"Error checking Google Font availability for {font_name}: {e}")
-        return False
+    availability = await FONT_AVAILABILITY_SERVICE.check_fonts([font_name])
+    return availability[font_name]
 
 
 async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResult:
@@ -264,14 +230,13 @@ async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResu
     if not normalized_fonts:
         return FontAnalysisResult(internally_supported_fonts=[], not_supported_fonts=[])
 
-    # Check each normalized font's availability in Google Fonts concurrently
-    tasks = [check_google_font_availability(font) for font in normalized_fonts]
-    results = await asyncio.gather(*tasks)
+    # Check each normalized font's availability in Google Fonts, cached and concurrently
+    availability = await FONT_AVAILABILITY_SERVICE.check_fonts(list(normalized_fonts))
 
     internally_supported_fonts = []
     not_supported_fonts = []
 
-    for font, is_available in zip(normalized_fonts, results):
+    for font, is_available in availability.items():
         if is_available:
             formatted_name = font.replace(" ", "+")
             google_fonts_url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
@@ -333,14 +298,18 @@ async def process_pptx_slides(
                 await _install_fonts(fonts, temp_dir)
 
             # Extract slide XMLs from PPTX
-            slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+            slide_xmls = _extract_slide_xmls(pptx_path)
 
             # Convert PPTX to PDF
-            pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir)
+            pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir, slide_xmls)
 
-            # Generate screenshots using LibreOffice
+            images_dir = get_images_directory()
+            presentation_id = uuid.uuid4()
+            presentation_images_dir = os.path.join(images_dir, str(presentation_id))
+
+            # Render screenshots directly into the images directory
             screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
-                pdf_path, temp_dir
+                pdf_path, presentation_images_dir, "slide_"
             )
             print(f"Screenshot paths: {screenshot_paths}")
 
@@ -350,29 +319,17 @@ async def process_pptx_slides(
                 f"Font analysis completed: {len(font_analysis.internally_supported_fonts)} supported, {len(font_analysis.not_supported_fonts)} not supported"
             )
 
-            # Move screenshots to images directory and generate URLs
-            images_dir = get_images_directory()
-            presentation_id = uuid.uuid4()
-            presentation_images_dir = os.path.join(images_dir, str(presentation_id))
-            os.makedirs(presentation_images_dir, exist_ok=True)
-
             slides_data = []
 
             for i, (xml_content, screenshot_path) in enumerate(
                 zip(slide_xmls, screenshot_paths), 1
             ):
-                # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
-                permanent_screenshot_path = os.path.join(
-                    presentation_images_dir, screenshot_filename
-                )
+                screenshot_filename = os.path.basename(screenshot_path)
 
                 if (
                     os.path.exists(screenshot_path)
                     and os.path.getsize(screenshot_path) > 0
                 ):
-                    # Use shutil.copy2 instead of os.rename to handle cross-device moves
-                    shutil.copy2(screenshot_path, permanent_screenshot_path)
                     screenshot_url = (
                         f"/app_data/images/{presentation_id}/{screenshot_filename}"
                     )
@@ -429,7 +386,7 @@ async def process_pptx_fonts(
             f.write(pptx_content)
 
         # Extract slide XMLs from PPTX
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+        slide_xmls = _extract_slide_xmls(pptx_path)
 
         # Analyze fonts across all slides (same logic as in /pptx-slides)
         font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
@@ -440,9 +397,11 @@ async def process_pptx_fonts(
         )
 
 
-def _create_font_alias_config(raw_fonts: List[str]) -> str:
-    """Create a temporary fontconfig configuration that aliases variant family names to normalized root families.
-    Returns the path to the config file.
+def _create_font_alias_config(
+    raw_fonts: List[str], temp_dir: str, fonts_dir: Optional[str] = None
+) -> Optional[str]:
+    """Create a per-request fontconfig configuration that aliases variant family names to normalized root families
+    and adds the uploaded fonts directory. Returns the path to the config file, or None if the default config is enough.
     """
     # Build mapping from raw -> normalized where different
     mappings: Dict[str, str] = {}
@@ -450,9 +409,10 @@ def _create_font_alias_config(raw_fonts: List[str]) -> str:
         normalized = normalize_font_family_name(f)
         if normalized and normalized != f:
             mappings[f] = normalized
-    # Create config only if we have mappings
-    fd, fonts_conf_path = tempfile.mkstemp(prefix="fonts_alias_", suffix=".conf")
-    os.close(fd)
+    # Create config only if we have mappings or uploaded fonts
+    if not mappings and not fonts_dir:
+        return None
+    fonts_conf_path = os.path.join(temp_dir, "fonts_alias.conf")
     with open(fonts_conf_path, "w", encoding="utf-8") as cfg:
         cfg.write(
             """<?xml version='1.0'?>
@@ -461,96 +421,72 @@ def _create_font_alias_config(raw_fonts: List[str]) -> str:
   <include>/etc/fonts/fonts.conf</include>
 """
         )
+        if fonts_dir:
+            # Only the uploaded fonts are scanned, the system cache is reused
+            cfg.write(f"""
+  <dir>{escape(fonts_dir)}</dir>
+  <cachedir>{escape(os.path.join(temp_dir, "fontconfig_cache"))}</cachedir>
+""")
         for src, dst in mappings.items():
-            cfg.write(
-                f"""
+            cfg.write(f"""
   <match target="pattern">
     <test name="family" compare="eq">
-      <string>{src}</string>
+      <string>{escape(src)}</string>
     </test>
     <edit name="family" mode="assign" binding="strong">
-      <string>{dst}</string>
+      <string>{escape(dst)}</string>
     </edit>
   </match>
-"""
-            )
+""")
         cfg.write("\n</fontconfig>\n")
     return fonts_conf_path
 
 
 async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
-    """Install provided font files to the system."""
+    """Save provided font files to the request's fonts directory."""
     fonts_dir = os.path.join(temp_dir, "fonts")
     os.makedirs(fonts_dir, exist_ok=True)
 
     for font_file in fonts:
-        # Save font file
-        font_path = os.path.join(fonts_dir, font_file.filename)
+        font_path = os.path.join(fonts_dir, os.path.basename(font_file.filename))
         with open(font_path, "wb") as f:
             font_content = await font_file.read()
             f.write(font_content)
 
-        # Install font (copy to system fonts directory)
-        try:
-            subprocess.run(
-                ["cp", font_path, "/usr/share/fonts/truetype/"],
-                check=True,
-                capture_output=True,
-            )
-        except subprocess.CalledProcessError as e:
-            print(f"Warning: Failed to install font {font_file.filename}: {e}")
 
-    # Refresh font cache
+def _extract_slide_xmls(pptx_path: str) -> List[str]:
+    """Read slide XML content directly from the PPTX archive."""
     try:
-        subprocess.run(["fc-cache", "-f", "-v"], check=True, capture_output=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Warning: Failed to refresh font cache: {e}")
-
-
-def _extract_slide_xmls(pptx_path: str, temp_dir: str) -> List[str]:
-    """Extract slide XML content from PPTX file."""
-    slide_xmls = []
-    extract_dir = os.path.join(temp_dir, "pptx_extract")
-
-    try:
-        # Unzip PPTX file
         with zipfile.ZipFile(pptx_path, "r") as zip_ref:
-            zip_ref.extractall(extract_dir)
-
-        # Look for slides in ppt/slides/ directory
-        slides_dir = os.path.join(extract_dir, "ppt", "slides")
+            # Only slides directly in ppt/slides/, media is never read
+            slide_names = [
+                name
+                for name in zip_ref.namelist()
+                if re.fullmatch(r"ppt/slides/slide\d+\.xml", name)
+            ]
+            if not slide_names:
+                raise Exception("No slides directory found in PPTX file")
 
-        if not os.path.exists(slides_dir):
-            raise Exception("No slides directory found in PPTX file")
+            # Sort slide XML files numerically
+            slide_names.sort(key=lambda x: int(re.search(r"(\d+)\.xml$", x).group(1)))
 
-        # Get all slide XML files and sort them numerically
-        slide_files = [
-            f
-            for f in os.listdir(slides_dir)
-            if f.startswith("slide") and f.endswith(".xml")
-        ]
-        slide_files.sort(key=lambda x: int(x.replace("slide", "").replace(".xml", "")))
-
-        # Read XML content from each slide
-        for slide_file in slide_files:
-            slide_path = os.path.join(slides_dir, slide_file)
-            with open(slide_path, "r", encoding="utf-8") as f:
-                slide_xmls.append(f.read())
-
-        return slide_xmls
+            return [zip_ref.read(name).decode("utf-8") for name in slide_names]
 
     except Exception as e:
         raise Exception(f"Failed to extract slide XMLs: {str(e)}")
 
 
-async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
-    """Generate PNG screenshots of PPTX slides using LibreOffice + ImageMagick."""
+async def _convert_pptx_to_pdf(
+    pptx_path: str, temp_dir: str, slide_xmls: Optional[List[str]] = None
+) -> str:
+    """Convert PPTX slides to PDF using the LibreOffice worker pool."""
     screenshots_dir = os.path.join(temp_dir, "screenshots")
     os.makedirs(screenshots_dir, exist_ok=True)
 
     try:
         # First, get the number of slides by extracting XMLs
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+        if slide_xmls is None:
+            slide_xmls = _extract_slide_xmls(pptx_path)
         slide_count = len(slide_xmls)
 
         # Build font alias config to force variant families to resolve to normalized root families
@@ -558,52 +494,29 @@ async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
         for xml in slide_xmls:
             raw_fonts.extend(extract_fonts_from_oxml(xml))
         raw_fonts = list({f for f in raw_fonts if f})
-        fonts_conf_path = _create_font_alias_config(raw_fonts)
-        env = os.environ.copy()
-        env["FONTCONFIG_FILE"] = fonts_conf_path
+        fonts_dir = os.path.join(temp_dir, "fonts")
+        fonts_conf_path = _create_font_alias_config(
+            raw_fonts, temp_dir, fonts_dir if os.path.isdir(fonts_dir) else None
+        )
 
         print(f"Found {slide_count} slides in presentation")
 
         # Step 1: Convert PPTX to PDF using LibreOffice
         print("Starting LibreOffice PDF conversion...")
-        pdf_filename = "temp_presentation.pdf"
-        pdf_path = os.path.join(screenshots_dir, pdf_filename)
-
         try:
-            result = subprocess.run(
-                [
-                    "libreoffice",
-                    "--headless",
-                    "--convert-to",
-                    "pdf",
-                    "--outdir",
-                    screenshots_dir,
-                    pptx_path,
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=500,
-                env=env,
+            pdf_path = await LIBREOFFICE_SERVICE.convert_to_pdf(
+                pptx_path, screenshots_dir, fonts_conf_path
             )
+        except asyncio.TimeoutError:
+            raise Exception("LibreOffice PDF conversion timed out")
+        except Exception as e:
+            raise Exception(f"LibreOffice PDF conversion failed: {str(e)}")
 
-            print(f"LibreOffice PDF conversion output: {result.stdout}")
-            if result.stderr:
-                print(f"LibreOffice PDF conversion warnings: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            raise Exception("LibreOffice PDF conversion timed out after 120 seconds")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else str(e)
-            raise Exception(f"LibreOffice PDF conversion failed: {error_msg}")
-
-        # Find the generated PDF file (LibreOffice uses original filename)
-        pdf_files = [f for f in os.listdir(screenshots_dir) if f.endswith(".pdf")]
-        if not pdf_files:
+        if not os.path.exists(pdf_path):
             raise Exception("LibreOffice failed to generate PDF file")
 
-        actual_pdf_path = os.path.join(screenshots_dir, pdf_files[0])
-        print(f"Generated PDF: {actual_pdf_path}")
-        return actual_pdf_path
+        print(f"Generated PDF: {pdf_path}")
+        return pdf_path
 
     except Exception as e:
         # Re-raise the specific exceptions we've already handled
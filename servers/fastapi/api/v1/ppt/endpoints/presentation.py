@@ -6,10 +6,11 @@ import os
 import random
 import traceback
 from typing import Annotated, List, Literal, Optional, Tuple
+from urllib.parse import quote
 import dirtyjson
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy import delete
+from sqlalchemy import and_, delete, exists, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from constants.presentation import DEFAULT_TEMPLATES
@@ -27,27 +28,42 @@ from enums.verbosity import Verbosity
 from models.pptx_models import PptxPresentationModel
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_structure_model import PresentationStructureModel
+from models.presentation_summary import (
+    PresentationSummary,
+    PresentationSummaryPage,
+    SlideThumbnail,
+)
 from models.presentation_with_slides import (
     PresentationWithSlides,
 )
+from models.sql.image_asset import ImageAsset
 from models.sql.template import TemplateModel
 
 from services.documents_loader import DocumentsLoader
+from services.presentation_job_queue import (
+    PRESENTATION_JOB_QUEUE,
+    is_transient_error,
+)
 from services.webhook_service import WebhookService
 from utils.get_layout_by_name import get_layout_by_name
 from services.image_generation_service import ImageGenerationService
 from utils.dict_utils import deep_update
-from utils.export_utils import export_presentation
+from utils.export_utils import (
+    create_pptx,
+    create_pptx_stream,
+    export_presentation,
+    get_export_file_name,
+    get_pptx_model,
+    iter_stream_chunks,
+)
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from models.sql.slide import SlideModel
 from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSEResponse
 from utils.usage_tracker import UsageTracker
 
 from services.database import get_async_session
-from services.temp_file_service import TEMP_FILE_SERVICE
 from services.concurrent_service import CONCURRENT_SERVICE
 from models.sql.presentation import PresentationModel
-from services.pptx_presentation_creator import PptxPresentationCreator
 from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
 )
@@ -58,6 +74,7 @@ from utils.llm_calls.generate_presentation_structure import (
 from utils.llm_calls.generate_slide_content import (
     get_slide_content_from_type_and_outline,
 )
+from utils.llm_provider import get_slide_generation_concurrency
 from utils.ppt_utils import (
     get_presentation_title_from_outlines,
     select_toc_or_list_slide_layout_index,
@@ -97,6 +114,95 @@ async def get_all_presentations(sql_session: AsyncSession = Depends(get_async_se
     return presentations_with_slides
 
 
+@PRESENTATION_ROUTER.get("/list", response_model=PresentationSummaryPage)
+async def list_presentations(
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Optional[str] = None,
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Newest presentations first with the first slide for thumbnails, without
+    the JSON columns of presentations. Pass next_cursor to get the next page.
+    """
+    first_slide = (SlideModel.presentation == PresentationModel.id) & (
+        SlideModel.index == 0
+    )
+    # The page is read from the (created_at, id) index of presentations
+    # first, so slides are only looked up for the presentations of the page
+    page_query = (
+        select(
+            PresentationModel.id,
+            PresentationModel.title,
+            PresentationModel.n_slides,
+            PresentationModel.created_at,
+            PresentationModel.updated_at,
+        )
+        .where(exists().where(first_slide))
+        .order_by(PresentationModel.created_at.desc(), PresentationModel.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        try:
+            created_at, id = PresentationSummaryPage.decode_cursor(cursor)
+        except Exception:
+            raise HTTPException(400, "Invalid cursor")
+        page_query = page_query.where(
+            or_(
+                PresentationModel.created_at < created_at,
+                and_(
+                    PresentationModel.created_at == created_at,
+                    PresentationModel.id < id,
+                ),
+            )
+        )
+
+    page = page_query.subquery()
+    query = (
+        select(
+            page,
+            SlideModel.id.label("slide_id"),
+            SlideModel.layout_group.label("slide_layout_group"),
+            SlideModel.layout.label("slide_layout"),
+            SlideModel.index.label("slide_index"),
+            SlideModel.content.label("slide_content"),
+            SlideModel.properties.label("slide_properties"),
+        )
+        .join(
+            SlideModel,
+            (SlideModel.presentation == page.c.id) & (SlideModel.index == 0),
+        )
+        .order_by(page.c.created_at.desc(), page.c.id.desc())
+    )
+
+    rows = (await sql_session.execute(query)).mappings().all()
+    presentations = [
+        PresentationSummary(
+            id=row["id"],
+            title=row["title"],
+            n_slides=row["n_slides"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            slides=[
+                SlideThumbnail(
+                    id=row["slide_id"],
+                    layout_group=row["slide_layout_group"],
+                    layout=row["slide_layout"],
+                    index=row["slide_index"],
+                    content=row["slide_content"],
+                    properties=row["slide_properties"],
+                )
+            ],
+        )
+        for row in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = presentations[-1]
+        next_cursor = PresentationSummaryPage.encode_cursor(last.created_at, last.id)
+    return PresentationSummaryPage(presentations=presentations, next_cursor=next_cursor)
+
+
 @PRESENTATION_ROUTER.get("/{id}", response_model=PresentationWithSlides)
 async def get_presentation(
     id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
@@ -284,49 +390,70 @@ async def stream_presentation(
         # These tasks will be gathered and awaited after all slides are generated
         async_assets_generation_tasks = []
 
-        slides: List[SlideModel] = []
-        yield SSEResponse(
-            event="response",
-            data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
-        ).to_string()
-        for i, slide_layout_index in enumerate(structure.slides):
-            slide_layout = layout.slides[slide_layout_index]
+        # Slide contents are generated concurrently, but are emitted in slide order
+        slide_generation_semaphore = asyncio.Semaphore(
+            get_slide_generation_concurrency()
+        )
 
-            try:
-                slide_content = await get_slide_content_from_type_and_outline(
-                    slide_layout,
+        async def generate_slide_content(i: int, slide_layout_index: int) -> dict:
+            async with slide_generation_semaphore:
+                return await get_slide_content_from_type_and_outline(
+                    layout.slides[slide_layout_index],
                     outline.slides[i],
                     presentation.language,
                     presentation.tone,
                     presentation.verbosity,
                     presentation.instructions,
                 )
-            except HTTPException as e:
-                yield SSEErrorResponse(detail=e.detail).to_string()
-                return
 
-            slide = SlideModel(
-                presentation=id,
-                layout_group=layout.name,
-                layout=slide_layout.id,
-                index=i,
-                speaker_note=slide_content.get("__speaker_note__", ""),
-                content=slide_content,
-            )
-            slides.append(slide)
+        slide_content_tasks = [
+            asyncio.create_task(generate_slide_content(i, slide_layout_index))
+            for i, slide_layout_index in enumerate(structure.slides)
+        ]
 
-            # This will mutate slide and add placeholder assets
-            process_slide_add_placeholder_assets(slide)
+        slides: List[SlideModel] = []
+        yield SSEResponse(
+            event="response",
+            data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
+        ).to_string()
+        try:
+            for i, slide_layout_index in enumerate(structure.slides):
+                slide_layout = layout.slides[slide_layout_index]
 
-            # This will mutate slide
-            async_assets_generation_tasks.append(
-                process_slide_and_fetch_assets(image_generation_service, slide)
-            )
+                try:
+                    slide_content = await slide_content_tasks[i]
+                except HTTPException as e:
+                    yield SSEErrorResponse(detail=e.detail).to_string()
+                    return
 
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": slide.model_dump_json()}),
-            ).to_string()
+                slide = SlideModel(
+                    presentation=id,
+                    layout_group=layout.name,
+                    layout=slide_layout.id,
+                    index=i,
+                    speaker_note=slide_content.get("__speaker_note__", ""),
+                    content=slide_content,
+                )
+                slides.append(slide)
+
+                # This will mutate slide and add placeholder assets
+                process_slide_add_placeholder_assets(slide)
+
+                # This will mutate slide
+                async_assets_generation_tasks.append(
+                    process_slide_and_fetch_assets(image_generation_service, slide)
+                )
+
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps(
+                        {"type": "chunk", "chunk": slide.model_dump_json()}
+                    ),
+                ).to_string()
+        finally:
+            # Stops pending generations on error or when the client disconnects
+            for task in slide_content_tasks:
+                task.cancel()
 
         yield SSEResponse(
             event="response",
@@ -406,20 +533,53 @@ async def update_presentation(
 async def export_presentation_as_pptx(
     pptx_model: Annotated[PptxPresentationModel, Body()],
 ):
-    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-
-    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-    await pptx_creator.create_ppt()
-
     export_directory = get_exports_directory()
     pptx_path = os.path.join(
         export_directory, f"{pptx_model.name or uuid.uuid4()}.pptx"
     )
-    pptx_creator.save(pptx_path)
+    await create_pptx(pptx_model, pptx_path)
 
     return pptx_path
 
 
+def get_pptx_streaming_response(stream, file_name: str) -> StreamingResponse:
+    return StreamingResponse(
+        iter_stream_chunks(stream),
+        media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(file_name)}",
+            "Content-Length": str(stream.getbuffer().nbytes),
+        },
+    )
+
+
+@PRESENTATION_ROUTER.post("/export/pptx/stream")
+async def stream_presentation_as_pptx(
+    pptx_model: Annotated[PptxPresentationModel, Body()],
+):
+    stream = await create_pptx_stream(pptx_model)
+    return get_pptx_streaming_response(
+        stream, get_export_file_name(pptx_model.name, "pptx")
+    )
+
+
+@PRESENTATION_ROUTER.post("/export/stream")
+async def stream_presentation_export(
+    id: Annotated[uuid.UUID, Body(embed=True, description="Presentation ID to export")],
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    presentation = await sql_session.get(PresentationModel, id)
+
+    if not presentation:
+        raise HTTPException(status_code=404, detail="Presentation not found")
+
+    pptx_model = await get_pptx_model(id)
+    stream = await create_pptx_stream(pptx_model)
+    return get_pptx_streaming_response(
+        stream, get_export_file_name(presentation.title, "pptx")
+    )
+
+
 @PRESENTATION_ROUTER.post("/export", response_model=PresentationPathAndEditPath)
 async def export_presentation_as_pptx_or_pdf(
     id: Annotated[uuid.UUID, Body(description="Presentation ID to export")],
@@ -493,6 +653,7 @@ async def generate_presentation_handler(
     presentation_id: uuid.UUID,
     async_status: Optional[AsyncPresentationGenerationTaskModel],
     sql_session: AsyncSession = Depends(get_async_session),
+    is_last_attempt: bool = True,
 ):
     try:
         # Initialize usage tracker to record all token usage
@@ -676,24 +837,22 @@ async def generate_presentation_handler(
             await sql_session.commit()
 
         image_generation_service = ImageGenerationService(get_images_directory())
-        async_assets_generation_tasks = []
-
-        # 7. Generate slide content concurrently (batched), then build slides and fetch assets
-        slides: List[SlideModel] = []
 
+        # 7. Generate slide content through a bounded pool and fetch assets
+        # for each slide as soon as its content is available
         slide_layout_indices = presentation_structure.slides
         slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
 
-        # Schedule slide content generation and asset fetching in batches of 10
-        batch_size = 10
-        for start in range(0, len(slide_layouts), batch_size):
-            end = min(start + batch_size, len(slide_layouts))
-
-            print(f"Generating slides from {start} to {end}")
+        slide_generation_semaphore = asyncio.Semaphore(
+            get_slide_generation_concurrency()
+        )
+        slides_without_content = len(slide_layouts)
 
-            # Generate contents for this batch concurrently
-            content_tasks = [
-                get_slide_content_from_type_and_outline(
+        async def generate_slide_and_fetch_assets(
+            i: int,
+        ) -> Tuple[SlideModel, List[ImageAsset]]:
+            async with slide_generation_semaphore:
+                slide_content = await get_slide_content_from_type_and_outline(
                     slide_layouts[i],
                     presentation_outlines.slides[i],
                     request.language,
@@ -702,43 +861,41 @@ async def generate_presentation_handler(
                     request.instructions,
                     usage_tracker,  # Pass usage tracker to record slide generation tokens
                 )
-                for i in range(start, end)
-            ]
-            batch_contents: List[dict] = await asyncio.gather(*content_tasks)
-
-            # Build slides for this batch
-            batch_slides: List[SlideModel] = []
-            for offset, slide_content in enumerate(batch_contents):
-                i = start + offset
-                slide_layout = slide_layouts[i]
-                slide = SlideModel(
-                    presentation=presentation_id,
-                    layout_group=layout_model.name,
-                    layout=slide_layout.id,
-                    index=i,
-                    speaker_note=slide_content.get("__speaker_note__"),
-                    content=slide_content,
-                )
-                slides.append(slide)
-                batch_slides.append(slide)
 
-            # Start asset fetch tasks for just-generated slides so they run while next batch is processed
-            asset_tasks = [
-                process_slide_and_fetch_assets(image_generation_service, slide)
-                for slide in batch_slides
-            ]
-            async_assets_generation_tasks.extend(asset_tasks)
+            # Only assets are left to fetch once the last slide has its content
+            nonlocal slides_without_content
+            slides_without_content -= 1
+            if async_status and not slides_without_content:
+                async_status.message = "Fetching assets for slides"
+                async_status.updated_at = datetime.now()
+                sql_session.add(async_status)
+                await sql_session.commit()
 
-        if async_status:
-            async_status.message = "Fetching assets for slides"
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
-            await sql_session.commit()
+            slide = SlideModel(
+                presentation=presentation_id,
+                layout_group=layout_model.name,
+                layout=slide_layouts[i].id,
+                index=i,
+                speaker_note=slide_content.get("__speaker_note__"),
+                content=slide_content,
+            )
+
+            # Asset fetching runs outside the semaphore so the slot is freed
+            # for the next slide content call
+            assets = await process_slide_and_fetch_assets(
+                image_generation_service, slide
+            )
+            return slide, assets
+
+        print(f"Generating {len(slide_layouts)} slides")
+        generated_slides_and_assets = await asyncio.gather(
+            *[generate_slide_and_fetch_assets(i) for i in range(len(slide_layouts))]
+        )
 
-        # Run all asset tasks concurrently while batches may still be generating content
-        generated_assets_list = await asyncio.gather(*async_assets_generation_tasks)
+        slides: List[SlideModel] = []
         generated_assets = []
-        for assets_list in generated_assets_list:
+        for slide, assets_list in generated_slides_and_assets:
+            slides.append(slide)
             generated_assets.extend(assets_list)
 
         # Track image generation count for usage
@@ -790,10 +947,19 @@ async def generate_presentation_handler(
         return response
 
     except Exception as e:
+        is_transient = is_transient_error(e)
         if not isinstance(e, HTTPException):
             traceback.print_exc()
             e = HTTPException(status_code=500, detail="Presentation generation failed")
 
+        # Transient failures of queued jobs are retried by the job queue
+        if async_status and not is_last_attempt and is_transient:
+            async_status.message = "Presentation generation failed, retrying"
+            async_status.updated_at = datetime.now()
+            sql_session.add(async_status)
+            await sql_session.commit()
+            raise e
+
         api_error_model = APIErrorModel.from_exception(e)
 
         # Triggering webhook on failure
@@ -836,28 +1002,13 @@ async def generate_presentation_sync(
 )
 async def generate_presentation_async(
     request: GeneratePresentationRequest,
-    background_tasks: BackgroundTasks,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
     try:
         (presentation_id,) = await check_if_api_request_is_valid(request, sql_session)
 
-        async_status = AsyncPresentationGenerationTaskModel(
-            status="pending",
-            message="Queued for generation",
-            data=None,
-        )
-        sql_session.add(async_status)
-        await sql_session.commit()
-
-        background_tasks.add_task(
-            generate_presentation_handler,
-            request,
-            presentation_id,
-            async_status=async_status,
-            sql_session=sql_session,
-        )
-        return async_status
+        # Picked up by a job worker in this or another process
+        return await PRESENTATION_JOB_QUEUE.enqueue(request, presentation_id)
 
     except Exception as e:
         if not isinstance(e, HTTPException):
@@ -882,6 +1033,20 @@ async def check_async_presentation_generation_status(
     return status
 
 
+@PRESENTATION_ROUTER.post(
+    "/status/{id}/cancel", response_model=AsyncPresentationGenerationTaskModel
+)
+async def cancel_async_presentation_generation(
+    id: str = Path(description="ID of the presentation generation task"),
+):
+    status = await PRESENTATION_JOB_QUEUE.cancel(id)
+    if not status:
+        raise HTTPException(
+            status_code=404, detail="No presentation generation task found"
+        )
+    return status
+
+
 @PRESENTATION_ROUTER.post("/edit", response_model=PresentationPathAndEditPath)
 async def edit_presentation_with_new_content(
     data: Annotated[EditPresentationRequest, Body()],
@@ -0,0 +1,70 @@
+from fastapi import APIRouter
+
+from services.document_cache_service import DOCUMENT_CACHE_SERVICE
+from services.export_cache_service import EXPORT_CACHE_SERVICE
+from services.font_availability_service import FONT_AVAILABILITY_SERVICE
+from services.image_cache_service import IMAGE_CACHE_SERVICE
+from services.image_processing_service import IMAGE_PROCESSING_SERVICE
+from services.libreoffice_service import LIBREOFFICE_SERVICE
+from services.llm_client_registry import LLM_CLIENT_REGISTRY
+from services.llm_rate_limiter import LLM_RATE_LIMITER
+from services.llm_response_cache import LLM_RESPONSE_CACHE
+from services.presentation_job_queue import PRESENTATION_JOB_QUEUE
+from services.single_flight_service import SINGLE_FLIGHT_SERVICE
+
+STATS_ROUTER = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+@STATS_ROUTER.get("/llm-clients")
+async def get_llm_client_stats():
+    return LLM_CLIENT_REGISTRY.get_stats()
+
+
+@STATS_ROUTER.get("/llm-rate-limits")
+async def get_llm_rate_limit_stats():
+    return LLM_RATE_LIMITER.get_stats()
+
+
+@STATS_ROUTER.get("/llm-cache")
+async def get_llm_cache_stats():
+    return LLM_RESPONSE_CACHE.get_stats()
+
+
+@STATS_ROUTER.get("/image-cache")
+async def get_image_cache_stats():
+    return IMAGE_CACHE_SERVICE.get_stats()
+
+
+@STATS_ROUTER.get("/document-cache")
+async def get_document_cache_stats():
+    return DOCUMENT_CACHE_SERVICE.get_stats()
+
+
+@STATS_ROUTER.get("/libreoffice")
+async def get_libreoffice_stats():
+    return LIBREOFFICE_SERVICE.get_stats()
+
+
+@STATS_ROUTER.get("/font-availability")
+async def get_font_availability_stats():
+    return FONT_AVAILABILITY_SERVICE.get_stats()
+
+
+@STATS_ROUTER.get("/image-processing")
+async def get_image_processing_stats():
+    return IMAGE_PROCESSING_SERVICE.get_stats()
+
+
+@STATS_ROUTER.get("/export-cache")
+async def get_export_cache_stats():
+    return EXPORT_CACHE_SERVICE.get_stats()
+
+
+@STATS_ROUTER.get("/presentation-jobs")
+async def get_presentation_job_stats():
+    return PRESENTATION_JOB_QUEUE.get_stats()
+
+
+@STATS_ROUTER.get("/single-flight")
+async def get_single_flight_stats():
+    return SINGLE_FLIGHT_SERVICE.get_stats()
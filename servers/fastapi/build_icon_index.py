@@ -0,0 +1,13 @@
+from services.icon_index import (
+    NumpyIconIndex,
+    get_icon_embedding_function,
+    load_icon_documents,
+)
+
+# Precomputes icon embeddings so the server does no embedding work on boot
+if __name__ == "__main__":
+    documents, ids = load_icon_documents()
+    index = NumpyIconIndex(get_icon_embedding_function())
+    print(f"Embedding {len(documents)} icons...")
+    index.build(documents, ids)
+    print(f"Icons index written to {index.embeddings_path}")
@@ -4,3 +4,13 @@ OPENAI_URL = "https://api.openai.com/v1"
 DEFAULT_OPENAI_MODEL = "gpt-4.1"
 DEFAULT_GOOGLE_MODEL = "models/gemini-2.5-flash"
 DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+
+# Number of slide content calls kept in flight per provider
+# Can be overridden with SLIDE_GENERATION_CONCURRENCY
+DEFAULT_SLIDE_GENERATION_CONCURRENCY = {
+    "openai": 10,
+    "google": 10,
+    "anthropic": 5,
+    "ollama": 2,
+    "custom": 4,
+}
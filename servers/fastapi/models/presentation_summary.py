@@ -0,0 +1,40 @@
+import base64
+from datetime import datetime
+import json
+from typing import List, Optional, Tuple
+import uuid
+
+from pydantic import BaseModel
+
+
+class SlideThumbnail(BaseModel):
+    id: uuid.UUID
+    layout_group: str
+    layout: str
+    index: int
+    content: dict
+    properties: Optional[dict] = None
+
+
+class PresentationSummary(BaseModel):
+    id: uuid.UUID
+    title: Optional[str] = None
+    n_slides: int
+    created_at: datetime
+    updated_at: datetime
+    slides: List[SlideThumbnail]
+
+
+class PresentationSummaryPage(BaseModel):
+    presentations: List[PresentationSummary]
+    next_cursor: Optional[str] = None
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+        payload = json.dumps([created_at.isoformat(), str(id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
@@ -3,7 +3,7 @@ import secrets
 from typing import Optional
 import uuid
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, DateTime
 from sqlmodel import Field, SQLModel
 
 
@@ -17,6 +17,21 @@ class AsyncPresentationGenerationTaskModel(SQLModel, table=True):
     status: str
     message: Optional[str] = None
     error: Optional[dict] = Field(sa_column=Column(JSON), default=None)
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    # Naive local times, newer SQLModel versions only store aware ones by default
+    created_at: datetime = Field(
+        default_factory=datetime.now, sa_column=Column(DateTime, nullable=False)
+    )
+    updated_at: datetime = Field(
+        default_factory=datetime.now, sa_column=Column(DateTime, nullable=False)
+    )
     data: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+
+    # Job queue state, a job is claimed by a worker until its lease expires
+    presentation_id: Optional[uuid.UUID] = Field(default=None, exclude=True)
+    request: Optional[dict] = Field(sa_column=Column(JSON), default=None, exclude=True)
+    attempts: Optional[int] = Field(default=0, exclude=True)
+    worker_id: Optional[str] = Field(default=None, exclude=True)
+    lease_expires_at: Optional[datetime] = Field(
+        sa_column=Column(DateTime), default=None, exclude=True
+    )
+    cancel_requested: Optional[bool] = Field(default=False, exclude=True)
@@ -18,3 +18,6 @@ class ImageAsset(SQLModel, table=True):
     is_uploaded: bool = Field(default=False)
     path: str
     extras: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+    # Generated images cached by IMAGE_CACHE_SERVICE, size is of local files
+    cache_key: Optional[str] = Field(default=None, index=True)
+    size: Optional[int] = None
@@ -1,8 +1,16 @@
 import uuid
 from sqlmodel import Field, Column, JSON, SQLModel
 
+# Namespace of the ids derived from keys
+KEY_ID_NAMESPACE = uuid.UUID("7f6c3a52-4e0b-4c1d-9a8e-2b5d6f1e0c93")
+
 
 class KeyValueSqlModel(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     key: str = Field(index=True)
     value: dict = Field(sa_column=Column(JSON))
+
+    @staticmethod
+    def get_id_for_key(key: str) -> uuid.UUID:
+        # The primary key keeps keys unique for rows written with upsert_key_values
+        return uuid.uuid5(KEY_ID_NAMESPACE, key)
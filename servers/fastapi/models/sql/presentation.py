@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import List, Optional
+import hashlib
+import json
+from typing import TYPE_CHECKING, List, Optional
 import uuid
-from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy import JSON, Column, DateTime, Index, String
 from sqlmodel import Boolean, Field, SQLModel
 
 from models.presentation_layout import PresentationLayoutModel
@@ -9,9 +11,15 @@ from models.presentation_outline_model import PresentationOutlineModel
 from models.presentation_structure_model import PresentationStructureModel
 from utils.datetime_utils import get_current_utc_datetime
 
+if TYPE_CHECKING:
+    from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+    from models.sql.slide import SlideModel
+
 
 class PresentationModel(SQLModel, table=True):
     __tablename__ = "presentations"
+    # Keyset pagination of the newest presentations
+    __table_args__ = (Index("ix_presentations_created_at_id", "created_at", "id"),)
 
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
     content: str
@@ -60,6 +68,43 @@ class PresentationModel(SQLModel, table=True):
             include_title_slide=self.include_title_slide,
         )
 
+    def get_content_version(
+        self,
+        slides: List["SlideModel"],
+        layout_codes: Optional[List["PresentationLayoutCodeModel"]] = None,
+    ) -> str:
+        """
+        Hash of the presentation, its slides and the layout codes of its custom
+        template, which changes whenever any of them is edited, regenerated or
+        replaced. Timestamps and slide ids are left out, since edits recreate
+        slides with new ids.
+        """
+        presentation = self.model_dump(
+            mode="json", exclude={"created_at", "updated_at"}
+        )
+        slides_content = [
+            {
+                field: getattr(each, field, None)
+                for field in type(each).model_fields
+                if field not in ("id", "presentation")
+            }
+            for each in sorted(slides, key=lambda slide: slide.index)
+        ]
+        layouts_content = sorted(
+            [
+                [str(each.presentation), each.layout_id, each.layout_code, each.fonts]
+                for each in layout_codes or []
+            ],
+            key=lambda layout: layout[:2],
+        )
+        payload = json.dumps(
+            [presentation, slides_content, layouts_content],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     def get_presentation_outline(self):
         if not self.outlines:
             return None
@@ -6,7 +6,7 @@ and public URLs are returned. Otherwise, falls back to local file storage.
 """
 
 import uuid
-from typing import Optional
+from typing import IO, Optional
 from azure.storage.blob import BlobServiceClient, ContentSettings
 from utils.get_env import (
     get_azure_storage_connection_string_env,
@@ -48,6 +48,18 @@ class BlobStorageService:
                 self._container_client.create_container(public_access="blob")
         return self._container_client
 
+    def _get_content_type(self, extension: str) -> str:
+        content_types = {
+            "png": "image/png",
+            "jpg": "image/jpeg",
+            "jpeg": "image/jpeg",
+            "gif": "image/gif",
+            "webp": "image/webp",
+            "pdf": "application/pdf",
+            "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        }
+        return content_types.get(extension.lower(), "application/octet-stream")
+
     def upload_bytes(
         self,
         data: bytes,
@@ -73,14 +85,7 @@ class BlobStorageService:
 
         # Auto-detect content type if not provided
         if content_type is None:
-            content_types = {
-                "png": "image/png",
-                "jpg": "image/jpeg",
-                "jpeg": "image/jpeg",
-                "gif": "image/gif",
-                "webp": "image/webp",
-            }
-            content_type = content_types.get(extension.lower(), "application/octet-stream")
+            content_type = self._get_content_type(extension)
 
         # Upload to blob storage
         container_client = self._get_container_client()
@@ -95,6 +100,44 @@ class BlobStorageService:
         # Return public URL
         return blob_client.url
 
+    def upload_stream(
+        self,
+        stream: IO[bytes],
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Upload a stream to blob storage in blocks and return the public URL.
+
+        Args:
+            stream: Readable binary stream, uploaded from its current position
+            file_name: Name of the file, kept as the last part of the blob name
+            content_type: MIME type (detected from the file name if not provided)
+
+        Returns:
+            Public URL to the uploaded blob
+        """
+        if not self.is_enabled:
+            raise RuntimeError("Azure Blob Storage is not configured")
+
+        blob_name = f"{uuid.uuid4()}/{file_name}"
+
+        if content_type is None:
+            content_type = self._get_content_type(file_name.rsplit(".", 1)[-1])
+
+        container_client = self._get_container_client()
+        blob_client = container_client.get_blob_client(blob_name)
+
+        # Streams larger than a single put are uploaded as blocks
+        blob_client.upload_blob(
+            stream,
+            overwrite=True,
+            max_concurrency=4,
+            content_settings=ContentSettings(content_type=content_type),
+        )
+
+        return blob_client.url
+
     def upload_file(self, file_path: str) -> str:
         """
         Upload a file from disk to blob storage and return the public URL.
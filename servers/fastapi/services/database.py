@@ -1,12 +1,14 @@
 from collections.abc import AsyncGenerator
 import os
+from sqlalchemy import Table, delete, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
-    create_async_engine,
     async_sessionmaker,
     AsyncSession,
 )
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, select
 
 from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
@@ -19,12 +21,11 @@ from models.sql.slide import SlideModel
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from models.sql.template import TemplateModel
 from models.sql.webhook_subscription import WebhookSubscription
-from utils.db_utils import get_database_url_and_connect_args
-
+from utils.db_utils import create_database_engine, get_database_url_and_connect_args
 
 database_url, connect_args = get_database_url_and_connect_args()
 
-sql_engine: AsyncEngine = create_async_engine(database_url, connect_args=connect_args)
+sql_engine: AsyncEngine = create_database_engine(database_url, connect_args)
 async_session_maker = async_sessionmaker(sql_engine, expire_on_commit=False)
 
 
@@ -35,8 +36,8 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
 
 # Container DB (Lives inside the container)
 container_db_url = "sqlite+aiosqlite:////app/container.db"
-container_db_engine: AsyncEngine = create_async_engine(
-    container_db_url, connect_args={"check_same_thread": False}
+container_db_engine: AsyncEngine = create_database_engine(
+    container_db_url, {"check_same_thread": False}
 )
 container_db_async_session_maker = async_sessionmaker(
     container_db_engine, expire_on_commit=False
@@ -48,24 +49,92 @@ async def get_container_db_async_session() -> AsyncGenerator[AsyncSession, None]
         yield session
 
 
+async def upsert_key_values(sql_session: AsyncSession, values: dict[str, dict]):
+    """
+    Writes values of the KeyValueSqlModel table by key. Rows get an id
+    derived from their key, so concurrent writers of the same key conflict
+    on the primary key instead of inserting duplicate rows, and the writer
+    that lost updates the row of the other one.
+    """
+    ids = {key: KeyValueSqlModel.get_id_for_key(key) for key in values}
+    for attempt in range(2):
+        try:
+            # Rows of the same keys written with random ids
+            await sql_session.execute(
+                delete(KeyValueSqlModel).where(
+                    KeyValueSqlModel.key.in_(list(ids.keys())),
+                    KeyValueSqlModel.id.not_in(list(ids.values())),
+                )
+            )
+            existing = {
+                row.id: row
+                for row in await sql_session.scalars(
+                    select(KeyValueSqlModel).where(
+                        KeyValueSqlModel.id.in_(list(ids.values()))
+                    )
+                )
+            }
+            for key, value in values.items():
+                row = existing.get(ids[key]) or KeyValueSqlModel(id=ids[key], key=key)
+                row.value = value
+                sql_session.add(row)
+            await sql_session.commit()
+            return
+        except IntegrityError:
+            await sql_session.rollback()
+            if attempt:
+                raise
+
+
+def add_missing_columns(sync_conn: Connection, tables: list[Table]):
+    """
+    create_all doesn't alter existing tables, so nullable columns added to a
+    model later are added to databases created before them here.
+    """
+    inspector = inspect(sync_conn)
+    preparer = sync_conn.dialect.identifier_preparer
+    for table in tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_columns = {each["name"] for each in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(
+                text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                )
+            )
+            print(f"Added column {column.name} to {table.name}")
+
+
+def add_missing_indexes(sync_conn: Connection, tables: list[Table]):
+    """create_all doesn't add indexes to existing tables either"""
+    for table in tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 # Create Database and Tables
 async def create_db_and_tables():
+    tables = [
+        PresentationModel.__table__,
+        SlideModel.__table__,
+        KeyValueSqlModel.__table__,
+        ImageAsset.__table__,
+        PresentationLayoutCodeModel.__table__,
+        TemplateModel.__table__,
+        WebhookSubscription.__table__,
+        AsyncPresentationGenerationTaskModel.__table__,
+    ]
     async with sql_engine.begin() as conn:
         await conn.run_sync(
-            lambda sync_conn: SQLModel.metadata.create_all(
-                sync_conn,
-                tables=[
-                    PresentationModel.__table__,
-                    SlideModel.__table__,
-                    KeyValueSqlModel.__table__,
-                    ImageAsset.__table__,
-                    PresentationLayoutCodeModel.__table__,
-                    TemplateModel.__table__,
-                    WebhookSubscription.__table__,
-                    AsyncPresentationGenerationTaskModel.__table__,
-                ],
-            )
+            lambda sync_conn: SQLModel.metadata.create_all(sync_conn, tables=tables)
         )
+        await conn.run_sync(add_missing_columns, tables)
+        await conn.run_sync(add_missing_indexes, tables)
 
     async with container_db_engine.begin() as conn:
         await conn.run_sync(
@@ -1,33 +1,195 @@
-from docling.document_converter import (
-    DocumentConverter,
-    PdfFormatOption,
-    PowerpointFormatOption,
-    WordFormatOption,
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+from typing import Dict, List, Optional
+
+from utils.get_env import (
+    get_document_parse_timeout_env,
+    get_document_parser_workers_env,
 )
-from docling.datamodel.pipeline_options import PdfPipelineOptions
-from docling.datamodel.base_models import InputFormat
+
+DEFAULT_PARSER_WORKERS = 2
+DEFAULT_PARSE_TIMEOUT = 600
+
+# Options that change the parsed output, part of the document cache key
+PARSER_OPTIONS = {"parser": "docling", "do_ocr": False}
 
 
 class DoclingService:
+    """
+    Shared Docling converter.
+
+    Conversions run in a bounded set of worker processes, each holding its
+    own converter, so parsing large documents never blocks the event loop.
+    Docling and its models are imported when a worker starts, either on the
+    first conversion or from the warm-up task started by the app lifespan.
+    A worker stuck on a document is terminated and replaced by a new one
+    right away, without affecting conversions running in the others.
+    """
+
     def __init__(self):
-        self.pipeline_options = PdfPipelineOptions()
-        self.pipeline_options.do_ocr = False
+        self._converter = None
+        self._lock = threading.Lock()
+        self._idle_workers: Optional[List[ProcessPoolExecutor]] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._warm_ups: Dict[ProcessPoolExecutor, Future] = {}
+        self._ready = False
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    @property
+    def converter(self):
+        if self._converter is None:
+            with self._lock:
+                if self._converter is None:
+                    self._converter = self._create_converter()
+        return self._converter
+
+    def _create_converter(self):
+        from docling.document_converter import (
+            DocumentConverter,
+            PdfFormatOption,
+            PowerpointFormatOption,
+            WordFormatOption,
+        )
+        from docling.datamodel.pipeline_options import PdfPipelineOptions
+        from docling.datamodel.base_models import InputFormat
+
+        print("Initializing Docling converter...")
+        pipeline_options = PdfPipelineOptions()
+        pipeline_options.do_ocr = PARSER_OPTIONS["do_ocr"]
 
-        self.converter = DocumentConverter(
+        converter = DocumentConverter(
             allowed_formats=[InputFormat.PPTX, InputFormat.PDF, InputFormat.DOCX],
             format_options={
                 InputFormat.DOCX: WordFormatOption(
-                    pipeline_options=self.pipeline_options,
+                    pipeline_options=pipeline_options,
                 ),
                 InputFormat.PPTX: PowerpointFormatOption(
-                    pipeline_options=self.pipeline_options,
+                    pipeline_options=pipeline_options,
                 ),
                 InputFormat.PDF: PdfFormatOption(
-                    pipeline_options=self.pipeline_options,
+                    pipeline_options=pipeline_options,
                 ),
             },
         )
+        print("Docling converter initialized.")
+        return converter
+
+    def get_workers(self) -> int:
+        workers = get_document_parser_workers_env()
+        return max(1, int(workers)) if workers else DEFAULT_PARSER_WORKERS
+
+    def get_timeout(self) -> int:
+        timeout = get_document_parse_timeout_env()
+        return int(timeout) if timeout else DEFAULT_PARSE_TIMEOUT
+
+    def _create_worker(self) -> ProcessPoolExecutor:
+        # Spawned workers don't inherit the server's threads and event loop
+        worker = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+        )
+        # Starts the worker process, which loads the converter
+        self._warm_ups[worker] = worker.submit(_warm_up_worker)
+        return worker
+
+    def _get_idle_workers(self) -> List[ProcessPoolExecutor]:
+        if self._idle_workers is None:
+            self._idle_workers = [
+                self._create_worker() for _ in range(self.get_workers())
+            ]
+            self._semaphore = asyncio.Semaphore(len(self._idle_workers))
+        return self._idle_workers
+
+    async def _acquire_worker(self) -> ProcessPoolExecutor:
+        idle_workers = self._get_idle_workers()
+        await self._semaphore.acquire()
+        return idle_workers.pop()
+
+    def _release_worker(self, worker: ProcessPoolExecutor):
+        self._idle_workers.append(worker)
+        self._semaphore.release()
+
+    def _terminate_worker(self, worker: ProcessPoolExecutor):
+        self._warm_ups.pop(worker, None)
+        # A stuck conversion can't be cancelled, so its process is terminated
+        processes = list((worker._processes or {}).values())
+        worker.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _replace_worker(self, worker: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        self._terminate_worker(worker)
+        return self._create_worker()
+
+    async def initialize(self):
+        self._get_idle_workers()
+        await asyncio.gather(
+            *[asyncio.wrap_future(each) for each in list(self._warm_ups.values())]
+        )
+        self._ready = True
 
     def parse_to_markdown(self, file_path: str) -> str:
         result = self.converter.convert(file_path)
         return result.document.export_to_markdown()
+
+    async def parse_to_markdown_async(self, file_path: str) -> str:
+        """
+        Parses the file in an idle worker process, raises TimeoutError if the
+        parse itself takes too long. Waiting for a worker isn't timed.
+        """
+        for attempt in range(2):
+            worker = await self._acquire_worker()
+            try:
+                # Loading the converter of a new worker isn't timed either
+                await asyncio.wrap_future(self._warm_ups[worker])
+                markdown = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(
+                        worker, _parse_to_markdown, file_path
+                    ),
+                    timeout=self.get_timeout(),
+                )
+                self._ready = True
+                return markdown
+            except asyncio.TimeoutError:
+                print(f"Timed out parsing {os.path.basename(file_path)}")
+                worker = self._replace_worker(worker)
+                raise
+            except asyncio.CancelledError:
+                # The worker is still busy with the conversion
+                worker = self._replace_worker(worker)
+                raise
+            except BrokenProcessPool:
+                # Worker crashed, other workers keep parsing
+                worker = self._replace_worker(worker)
+                if attempt:
+                    raise
+            finally:
+                self._release_worker(worker)
+
+    def shutdown(self):
+        for worker in list(self._warm_ups.keys()):
+            self._terminate_worker(worker)
+        self._idle_workers = None
+
+
+def _initialize_worker():
+    DOCLING_SERVICE.converter
+
+
+def _warm_up_worker():
+    pass
+
+
+def _parse_to_markdown(file_path: str) -> str:
+    return DOCLING_SERVICE.parse_to_markdown(file_path)
+
+
+DOCLING_SERVICE = DoclingService()
@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import List, Optional
+
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_disable_document_cache_env,
+    get_document_cache_max_size_mb_env,
+)
+from utils.parsers import parse_bool_or_none
+
+DEFAULT_MAX_SIZE_MB = 1024
+
+MARKDOWN_FILE_NAME = "document.md"
+
+# Files are hashed in chunks to keep memory flat for large uploads
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class DocumentCacheService:
+    """
+    On-disk cache of parsed documents and rendered page images.
+
+    Entries are keyed by the SHA-256 of the file bytes and the parser
+    options, so the same upload is parsed once no matter which endpoint
+    loads it. Each entry is a directory whose modification time is bumped
+    on every hit, and least recently used entries are removed once the
+    cache grows over its size limit.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self._cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def cache_dir(self) -> str:
+        if self._cache_dir is None:
+            app_data_directory = get_app_data_directory_env() or "/tmp/presenton"
+            self._cache_dir = os.path.join(app_data_directory, "document_cache")
+        os.makedirs(self._cache_dir, exist_ok=True)
+        return self._cache_dir
+
+    def is_enabled(self) -> bool:
+        return not (parse_bool_or_none(get_disable_document_cache_env()) or False)
+
+    def get_max_size(self) -> int:
+        max_size_mb = get_document_cache_max_size_mb_env()
+        return int(max_size_mb or DEFAULT_MAX_SIZE_MB) * 1024 * 1024
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def get_key(self, file_hash: str, **options) -> str:
+        payload = json.dumps([file_hash, options], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _get_entry_dir(self, key: str) -> Optional[str]:
+        entry_dir = os.path.join(self.cache_dir, key)
+        if not os.path.isdir(entry_dir):
+            return None
+        os.utime(entry_dir)
+        return entry_dir
+
+    def _set_entry_dir(self, key: str, write_entry):
+        entry_dir = os.path.join(self.cache_dir, key)
+        if os.path.isdir(entry_dir):
+            return
+
+        # Entries are written aside and renamed so readers never see partial files
+        staging_dir = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}")
+        os.makedirs(staging_dir)
+        try:
+            write_entry(staging_dir)
+            os.rename(staging_dir, entry_dir)
+        except OSError:
+            # Another request cached the same document first
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(
+                each.stat().st_size for each in os.scandir(entry.path) if each.is_file()
+            )
+            entries.append((entry.stat().st_mtime, size, entry.path))
+            total_size += size
+
+        max_size = self.get_max_size()
+        for _, size, entry_path in sorted(entries):
+            if total_size <= max_size:
+                break
+            shutil.rmtree(entry_path, ignore_errors=True)
+            total_size -= size
+            self.evictions += 1
+
+    def _get_markdown(self, key: str) -> Optional[str]:
+        entry_dir = self._get_entry_dir(key)
+        if entry_dir is None:
+            return None
+        with open(os.path.join(entry_dir, MARKDOWN_FILE_NAME), "r") as f:
+            return f.read()
+
+    def _set_markdown(self, key: str, markdown: str):
+        def write_entry(entry_dir: str):
+            with open(os.path.join(entry_dir, MARKDOWN_FILE_NAME), "w") as f:
+                f.write(markdown)
+
+        self._set_entry_dir(key, write_entry)
+
+    def _get_page_images(
+        self, key: str, output_dir: str, file_name_prefix: str
+    ) -> Optional[List[str]]:
+        entry_dir = self._get_entry_dir(key)
+        if entry_dir is None:
+            return None
+
+        with open(os.path.join(entry_dir, "pages.json"), "r") as f:
+            page_names = json.load(f)
+        os.makedirs(output_dir, exist_ok=True)
+        image_paths = []
+        for page_name in page_names:
+            image_path = os.path.join(output_dir, f"{file_name_prefix}{page_name}")
+            _link_or_copy(os.path.join(entry_dir, page_name), image_path)
+            image_paths.append(image_path)
+        return image_paths
+
+    def _set_page_images(self, key: str, image_paths: List[str]):
+        def write_entry(entry_dir: str):
+            page_names = []
+            for page_number, image_path in enumerate(image_paths, 1):
+                extension = os.path.splitext(image_path)[1]
+                page_name = f"{page_number}{extension}"
+                _link_or_copy(image_path, os.path.join(entry_dir, page_name))
+                page_names.append(page_name)
+            with open(os.path.join(entry_dir, "pages.json"), "w") as f:
+                json.dump(page_names, f)
+
+        self._set_entry_dir(key, write_entry)
+
+    async def _run(self, func, *args):
+        try:
+            value = await asyncio.to_thread(func, *args)
+        except Exception as e:
+            print(f"Error accessing document cache: {e}")
+            return None
+        return value
+
+    def _record(self, value):
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    async def get_markdown(self, key: str) -> Optional[str]:
+        markdown = await self._run(self._get_markdown, key)
+        self._record(markdown)
+        return markdown
+
+    async def set_markdown(self, key: str, markdown: str):
+        await self._run(self._set_markdown, key, markdown)
+
+    async def get_page_images(
+        self, key: str, output_dir: str, file_name_prefix: str = "page_"
+    ) -> Optional[List[str]]:
+        image_paths = await self._run(
+            self._get_page_images, key, output_dir, file_name_prefix
+        )
+        self._record(image_paths)
+        return image_paths
+
+    async def set_page_images(self, key: str, image_paths: List[str]):
+        await self._run(self._set_page_images, key, image_paths)
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def _link_or_copy(source_path: str, destination_path: str):
+    # Hard links share the file, so eviction never removes images still in use
+    try:
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+        os.link(source_path, destination_path)
+    except OSError:
+        shutil.copyfile(source_path, destination_path)
+
+
+DOCUMENT_CACHE_SERVICE = DocumentCacheService()
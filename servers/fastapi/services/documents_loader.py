@@ -2,7 +2,6 @@ import mimetypes
 from fastapi import HTTPException
 import os, asyncio
 from typing import List, Optional, Tuple
-import pdfplumber
 
 from constants.documents import (
     PDF_MIME_TYPES,
@@ -10,7 +9,9 @@ from constants.documents import (
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from services.docling_service import DOCLING_SERVICE, PARSER_OPTIONS
+from services.document_cache_service import DOCUMENT_CACHE_SERVICE
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
 
 
 class DocumentsLoader:
@@ -18,7 +19,7 @@ class DocumentsLoader:
     def __init__(self, file_paths: List[str]):
         self._file_paths = file_paths
 
-        self.docling_service = DoclingService()
+        self.docling_service = DOCLING_SERVICE
 
         self._documents: List[str] = []
         self._images: List[List[str]] = []
@@ -39,19 +40,35 @@ class DocumentsLoader:
     ):
         """If load_images is True, temp_dir must be provided"""
 
-        documents: List[str] = []
-        images: List[str] = []
-
         for file_path in self._file_paths:
             if not os.path.exists(file_path):
                 raise HTTPException(
                     status_code=404, detail=f"File {file_path} not found"
                 )
 
-            document = ""
-            imgs = []
+        # Files are parsed concurrently, results keep the order of file paths
+        results = await asyncio.gather(
+            *[
+                self.load_document(file_path, temp_dir, load_text, load_images)
+                for file_path in self._file_paths
+            ]
+        )
+
+        self._documents = [document for document, _ in results]
+        self._images = [imgs for _, imgs in results]
 
-            mime_type = mimetypes.guess_type(file_path)[0]
+    async def load_document(
+        self,
+        file_path: str,
+        temp_dir: Optional[str],
+        load_text: bool,
+        load_images: bool,
+    ) -> Tuple[str, List[str]]:
+        document = ""
+        imgs = []
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+        try:
             if mime_type in PDF_MIME_TYPES:
                 document, imgs = await self.load_pdf(
                     file_path, load_text, load_images, temp_dir
@@ -59,15 +76,16 @@ class DocumentsLoader:
             elif mime_type in TEXT_MIME_TYPES:
                 document = await self.load_text(file_path)
             elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
+                document = await self.load_powerpoint(file_path)
             elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
-
-            documents.append(document)
-            images.append(imgs)
+                document = await self.load_msword(file_path)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Timed out parsing {os.path.basename(file_path)}",
+            )
 
-        self._documents = documents
-        self._images = images
+        return document, imgs
 
     async def load_pdf(
         self,
@@ -80,7 +98,7 @@ class DocumentsLoader:
         document: str = ""
 
         if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
+            document = await self.parse_to_markdown(file_path)
 
         if load_images:
             image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
@@ -91,25 +109,46 @@ class DocumentsLoader:
         with open(file_path, "r") as file:
             return await asyncio.to_thread(file.read)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await self.parse_to_markdown(file_path)
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await self.parse_to_markdown(file_path)
 
-    @classmethod
-    def get_page_images_from_pdf(cls, file_path: str, temp_dir: str) -> List[str]:
-        with pdfplumber.open(file_path) as pdf:
-            images = []
-            for page in pdf.pages:
-                img = page.to_image(resolution=150)
-                image_path = os.path.join(temp_dir, f"page_{page.page_number}.png")
-                img.save(image_path)
-                images.append(image_path)
-            return images
+    async def parse_to_markdown(self, file_path: str) -> str:
+        if not DOCUMENT_CACHE_SERVICE.is_enabled():
+            return await self.docling_service.parse_to_markdown_async(file_path)
+
+        file_hash = await asyncio.to_thread(DOCUMENT_CACHE_SERVICE.hash_file, file_path)
+        cache_key = DOCUMENT_CACHE_SERVICE.get_key(file_hash, **PARSER_OPTIONS)
+        document = await DOCUMENT_CACHE_SERVICE.get_markdown(cache_key)
+        if document is None:
+            document = await self.docling_service.parse_to_markdown_async(file_path)
+            await DOCUMENT_CACHE_SERVICE.set_markdown(cache_key, document)
+        return document
 
     @classmethod
-    async def get_page_images_from_pdf_async(cls, file_path: str, temp_dir: str):
-        return await asyncio.to_thread(
-            cls.get_page_images_from_pdf, file_path, temp_dir
+    async def get_page_images_from_pdf_async(
+        cls, file_path: str, output_dir: str, file_name_prefix: str = "page_"
+    ) -> List[str]:
+        """Renders every page of the pdf as an image directly into output_dir"""
+        if not DOCUMENT_CACHE_SERVICE.is_enabled():
+            return await PDF_RASTERIZER_SERVICE.render_pages(
+                file_path, output_dir, file_name_prefix
+            )
+
+        file_hash = await asyncio.to_thread(DOCUMENT_CACHE_SERVICE.hash_file, file_path)
+        cache_key = DOCUMENT_CACHE_SERVICE.get_key(
+            file_hash,
+            pages=PDF_RASTERIZER_SERVICE.get_image_format(),
+            resolution=PDF_RASTERIZER_SERVICE.get_resolution(),
+        )
+        images = await DOCUMENT_CACHE_SERVICE.get_page_images(
+            cache_key, output_dir, file_name_prefix
         )
+        if images is None:
+            images = await PDF_RASTERIZER_SERVICE.render_pages(
+                file_path, output_dir, file_name_prefix
+            )
+            await DOCUMENT_CACHE_SERVICE.set_page_images(cache_key, images)
+        return images
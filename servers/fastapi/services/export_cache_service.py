@@ -0,0 +1,187 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlmodel import select
+
+from models.sql.key_value import KeyValueSqlModel
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from services.database import async_session_maker, upsert_key_values
+from utils.get_env import get_disable_export_cache_env
+from utils.parsers import parse_bool_or_none
+
+KEY_PREFIX = "export:"
+CUSTOM_TEMPLATE_PREFIX = "custom-"
+
+
+class ExportCacheService:
+    """
+    Reuses the last exported file of a presentation until it changes.
+
+    The content version of a presentation is a hash of its row, slides and
+    the layout codes of its custom template, and the last export of each
+    presentation and format is stored in the KeyValueSqlModel table with the
+    version it was made from. A local file is only reused if its size and
+    modification time still match, since presentations with the same title
+    export to the same path. Concurrent exports of the same version share
+    one export.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def is_enabled(self) -> bool:
+        return not (parse_bool_or_none(get_disable_export_cache_env()) or False)
+
+    def _get_key(self, presentation_id: uuid.UUID, export_as: str) -> str:
+        return f"{KEY_PREFIX}{presentation_id}:{export_as}"
+
+    def _get_file_signature(self, path: str) -> Optional[list]:
+        # Blob urls are unique per upload
+        if path.startswith("http"):
+            return []
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _get_template_ids(self, layout_groups: Iterable[str]) -> List[uuid.UUID]:
+        template_ids = set()
+        for layout_group in layout_groups:
+            if not layout_group.startswith(CUSTOM_TEMPLATE_PREFIX):
+                continue
+            try:
+                template_ids.add(uuid.UUID(layout_group[len(CUSTOM_TEMPLATE_PREFIX) :]))
+            except ValueError:
+                continue
+        return list(template_ids)
+
+    async def get_content_version(self, presentation_id: uuid.UUID) -> Optional[str]:
+        async with async_session_maker() as sql_session:
+            presentation = await sql_session.get(PresentationModel, presentation_id)
+            if not presentation:
+                return None
+            slides = list(
+                await sql_session.scalars(
+                    select(SlideModel).where(SlideModel.presentation == presentation_id)
+                )
+            )
+            # Custom templates can be edited after the presentation is made
+            layout_groups = [each.layout_group for each in slides]
+            if presentation.layout:
+                layout_groups.append(presentation.layout.get("name") or "")
+            template_ids = self._get_template_ids(layout_groups)
+            layout_codes = []
+            if template_ids:
+                layout_codes = await sql_session.scalars(
+                    select(PresentationLayoutCodeModel).where(
+                        PresentationLayoutCodeModel.presentation.in_(template_ids)
+                    )
+                )
+            return presentation.get_content_version(slides, list(layout_codes))
+
+    async def get(
+        self, presentation_id: uuid.UUID, version: str, export_as: str
+    ) -> Optional[str]:
+        """Returns the path of the export of this version, if it still exists"""
+        async with async_session_maker() as sql_session:
+            entry = await sql_session.get(
+                KeyValueSqlModel,
+                KeyValueSqlModel.get_id_for_key(
+                    self._get_key(presentation_id, export_as)
+                ),
+            )
+        if not entry or entry.value.get("version") != version:
+            return None
+
+        path = entry.value["path"]
+        if self._get_file_signature(path) != entry.value.get("signature"):
+            return None
+        return path
+
+    async def set(
+        self, presentation_id: uuid.UUID, version: str, export_as: str, path: str
+    ):
+        signature = self._get_file_signature(path)
+        if signature is None:
+            return
+
+        key = self._get_key(presentation_id, export_as)
+        value = {
+            "version": version,
+            "path": path,
+            "signature": signature,
+            "exported_at": time.time(),
+        }
+        async with async_session_maker() as sql_session:
+            await upsert_key_values(sql_session, {key: value})
+
+    async def _export_and_set(
+        self,
+        presentation_id: uuid.UUID,
+        version: str,
+        export_as: str,
+        export: Callable[[], Awaitable[str]],
+    ) -> str:
+        path = await export()
+        try:
+            await self.set(presentation_id, version, export_as, path)
+        except Exception as e:
+            print(f"Error writing export cache: {e}")
+        return path
+
+    async def get_or_export(
+        self,
+        presentation_id: uuid.UUID,
+        export_as: str,
+        export: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Returns the path of the current export, calling export only if needed"""
+        if not self.is_enabled():
+            return await export()
+
+        try:
+            version = await self.get_content_version(presentation_id)
+            path = version and await self.get(presentation_id, version, export_as)
+        except Exception as e:
+            print(f"Error reading export cache: {e}")
+            return await export()
+
+        if not version:
+            return await export()
+        if path:
+            self.hits += 1
+            return path
+
+        # Repeated clicks wait for the export already running for this version
+        flight_key = (str(presentation_id), version, export_as)
+        task = self._in_flight.get(flight_key)
+        if task:
+            self.hits += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(
+                self._export_and_set(presentation_id, version, export_as, export)
+            )
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_flight": len(self._in_flight),
+        }
+
+
+EXPORT_CACHE_SERVICE = ExportCacheService()
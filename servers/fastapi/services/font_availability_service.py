@@ -0,0 +1,211 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+import aiohttp
+from sqlmodel import select
+
+from models.sql.key_value import KeyValueSqlModel
+from services.database import async_session_maker, upsert_key_values
+from services.http_session_service import HTTP_SESSION_SERVICE
+from utils.get_env import (
+    get_google_fonts_cache_ttl_env,
+    get_google_fonts_concurrency_env,
+    get_google_fonts_list_path_env,
+    get_google_fonts_offline_env,
+)
+from utils.parsers import parse_bool_or_none
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+# Unavailable fonts are checked again sooner, they may be added to Google Fonts
+NEGATIVE_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_CONCURRENCY = 8
+DEFAULT_FONTS_LIST_PATH = "assets/google_fonts.json"
+
+KEY_PREFIX = "google_font_availability:"
+
+
+class FontAvailabilityService:
+    """
+    Cached Google Fonts availability lookups.
+
+    Fonts in the bundled font list are always available. Other fonts are
+    looked up in the KeyValueSqlModel table, where positive and negative
+    results are stored with the time they were checked, and only expired or
+    unknown fonts are checked against Google Fonts with bounded concurrency.
+    In offline mode, or when a check fails, the last known result is used.
+    """
+
+    def __init__(self):
+        self._memory_cache: Dict[str, dict] = {}
+        self._bundled_fonts: Optional[Set[str]] = None
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def is_offline(self) -> bool:
+        return parse_bool_or_none(get_google_fonts_offline_env()) or False
+
+    def get_ttl(self, available: bool) -> int:
+        ttl = get_google_fonts_cache_ttl_env()
+        ttl = int(ttl) if ttl else DEFAULT_TTL_SECONDS
+        return ttl if available else min(ttl, NEGATIVE_TTL_SECONDS)
+
+    def get_concurrency(self) -> int:
+        concurrency = get_google_fonts_concurrency_env()
+        return max(1, int(concurrency)) if concurrency else DEFAULT_CONCURRENCY
+
+    def get_bundled_fonts(self) -> Set[str]:
+        if self._bundled_fonts is None:
+            self._bundled_fonts = set()
+            fonts_list_path = (
+                get_google_fonts_list_path_env() or DEFAULT_FONTS_LIST_PATH
+            )
+            if os.path.exists(fonts_list_path):
+                with open(fonts_list_path, "r") as f:
+                    fonts_list = json.load(f)
+                # Either a list of families or a Google Fonts API response
+                if isinstance(fonts_list, dict):
+                    fonts_list = [each["family"] for each in fonts_list["items"]]
+                self._bundled_fonts = {each.lower() for each in fonts_list}
+        return self._bundled_fonts
+
+    def _get_key(self, font_name: str) -> str:
+        return f"{KEY_PREFIX}{font_name.lower()}"
+
+    async def _get_cached(self, font_names: List[str]) -> Dict[str, dict]:
+        cached = {}
+        keys_to_read = []
+        for font_name in font_names:
+            key = self._get_key(font_name)
+            if key in self._memory_cache:
+                cached[font_name] = self._memory_cache[key]
+            else:
+                keys_to_read.append(key)
+
+        if keys_to_read:
+            try:
+                async with async_session_maker() as sql_session:
+                    rows = await sql_session.scalars(
+                        select(KeyValueSqlModel).where(
+                            KeyValueSqlModel.id.in_(
+                                [
+                                    KeyValueSqlModel.get_id_for_key(key)
+                                    for key in keys_to_read
+                                ]
+                            )
+                        )
+                    )
+                    for row in rows:
+                        self._memory_cache[row.key] = row.value
+            except Exception as e:
+                print(f"Error reading font availability cache: {e}")
+
+            for font_name in font_names:
+                key = self._get_key(font_name)
+                if font_name not in cached and key in self._memory_cache:
+                    cached[font_name] = self._memory_cache[key]
+
+        return cached
+
+    async def _set_cached(self, results: Dict[str, bool]):
+        values = {
+            self._get_key(font_name): {
+                "available": available,
+                "checked_at": time.time(),
+            }
+            for font_name, available in results.items()
+        }
+        self._memory_cache.update(values)
+
+        try:
+            async with async_session_maker() as sql_session:
+                await upsert_key_values(sql_session, values)
+        except Exception as e:
+            print(f"Error writing font availability cache: {e}")
+
+    async def _fetch_availability(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        font_name: str,
+    ) -> Optional[bool]:
+        formatted_name = font_name.replace(" ", "+")
+        url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
+        async with semaphore:
+            try:
+                async with session.head(
+                    url, timeout=aiohttp.ClientTimeout(total=10)
+                ) as response:
+                    return response.status == 200
+            except Exception as e:
+                print(f"Error checking Google Font availability for {font_name}: {e}")
+                self.errors += 1
+                return None
+
+    async def check_fonts(self, font_names: List[str]) -> Dict[str, bool]:
+        """Returns whether each font is available in Google Fonts"""
+        font_names = list(dict.fromkeys(font_names))
+        bundled_fonts = self.get_bundled_fonts()
+        cached = await self._get_cached(
+            [each for each in font_names if each.lower() not in bundled_fonts]
+        )
+        offline = self.is_offline()
+
+        results = {}
+        fonts_to_fetch = []
+        for font_name in font_names:
+            entry = cached.get(font_name)
+            if font_name.lower() in bundled_fonts:
+                results[font_name] = True
+            elif entry and (
+                offline
+                or time.time() - entry["checked_at"] < self.get_ttl(entry["available"])
+            ):
+                results[font_name] = entry["available"]
+            else:
+                fonts_to_fetch.append(font_name)
+        self.hits += len(results)
+        self.misses += len(fonts_to_fetch)
+
+        fetched = {}
+        if fonts_to_fetch and not offline:
+            semaphore = asyncio.Semaphore(self.get_concurrency())
+            session = HTTP_SESSION_SERVICE.get_session()
+            availabilities = await asyncio.gather(
+                *[
+                    self._fetch_availability(session, semaphore, font_name)
+                    for font_name in fonts_to_fetch
+                ]
+            )
+            fetched = {
+                font_name: available
+                for font_name, available in zip(fonts_to_fetch, availabilities)
+                if available is not None
+            }
+            if fetched:
+                await self._set_cached(fetched)
+
+        for font_name in fonts_to_fetch:
+            if font_name in fetched:
+                results[font_name] = fetched[font_name]
+            else:
+                # Offline or failed, fall back to the last known result
+                entry = cached.get(font_name)
+                results[font_name] = entry["available"] if entry else False
+
+        return {font_name: results[font_name] for font_name in font_names}
+
+    def get_stats(self) -> dict:
+        return {
+            "offline": self.is_offline(),
+            "bundled_fonts": len(self.get_bundled_fonts()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+FONT_AVAILABILITY_SERVICE = FontAvailabilityService()
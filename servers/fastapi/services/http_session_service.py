@@ -0,0 +1,74 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from utils.get_env import get_http_max_connections_per_host_env
+
+MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 8
+KEEPALIVE_TIMEOUT = 30
+DNS_CACHE_TTL = 300
+
+
+class HttpSessionService:
+    """
+    Process-wide aiohttp session for outgoing downloads.
+
+    Connections are kept alive and reused across requests, and every host is
+    limited to a fixed number of concurrent requests so that large batches
+    queue up instead of opening hundreds of sockets at once.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def get_max_connections_per_host(self) -> int:
+        max_connections = get_http_max_connections_per_host_env()
+        if max_connections:
+            return max(1, int(max_connections))
+        return DEFAULT_MAX_CONNECTIONS_PER_HOST
+
+    def get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            self._session = aiohttp.ClientSession(
+                trust_env=True,
+                connector=aiohttp.TCPConnector(
+                    limit=MAX_CONNECTIONS,
+                    limit_per_host=self.get_max_connections_per_host(),
+                    keepalive_timeout=KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                ),
+                # Waiting for a free connection doesn't count towards the timeout
+                timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=60),
+            )
+            self._session_loop = loop
+            self._host_semaphores = {}
+        return self._session
+
+    @asynccontextmanager
+    async def limit_host(self, url: str):
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.get_max_connections_per_host())
+            self._host_semaphores[host] = semaphore
+        async with semaphore:
+            yield
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+HTTP_SESSION_SERVICE = HttpSessionService()
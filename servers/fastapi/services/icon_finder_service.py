@@ -1,40 +1,76 @@
 import asyncio
-import json
+import threading
+from typing import List, Tuple
 import chromadb
 from chromadb.config import Settings
-from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+from services.icon_index import (
+    NumpyIconIndex,
+    get_icon_embedding_function,
+    load_icon_documents,
+)
+from services.single_flight_service import SINGLE_FLIGHT_SERVICE
+from utils.get_env import get_icon_search_backend_env
+
+# Concurrent searches made within this window are embedded and queried together
+BATCH_WINDOW_SECONDS = 0.01
+MAX_BATCH_SIZE = 64
 
 
 class IconFinderService:
+    """
+    Loads the icon index on first search, or ahead of time by the warm-up
+    task started from the app lifespan, so importing it stays cheap.
+    """
+
     def __init__(self):
         self.collection_name = "icons"
-        self.client = chromadb.PersistentClient(
-            path="chroma", settings=Settings(anonymized_telemetry=False)
-        )
-        print("Initializing icons collection...")
-        self._initialize_icons_collection()
-        print("Icons collection initialized.")
+        self.numpy_index = None
+        self.collection = None
+        self._initialized = False
+        self._lock = threading.Lock()
+
+        self._pending_searches: List[Tuple[str, int, asyncio.Future]] = []
+        self._flush_task = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._initialized
+
+    def _initialize(self):
+        with self._lock:
+            if self._initialized:
+                return
+
+            self.embedding_function = get_icon_embedding_function()
+
+            # Prebuilt embeddings are used unless chroma is explicitly requested
+            numpy_index = NumpyIconIndex(self.embedding_function)
+            if get_icon_search_backend_env() != "chroma" and numpy_index.exists():
+                print("Loading icons index...")
+                numpy_index.load()
+                self.numpy_index = numpy_index
+                print("Icons index loaded.")
+            else:
+                self.client = chromadb.PersistentClient(
+                    path="chroma", settings=Settings(anonymized_telemetry=False)
+                )
+                print("Initializing icons collection...")
+                self._initialize_icons_collection()
+                print("Icons collection initialized.")
+
+            self._initialized = True
+
+    async def initialize(self):
+        await asyncio.to_thread(self._initialize)
 
     def _initialize_icons_collection(self):
-        self.embedding_function = ONNXMiniLM_L6_V2()
-        self.embedding_function.DOWNLOAD_PATH = "chroma/models"
-        self.embedding_function._download_model_if_not_exists()
         try:
             self.collection = self.client.get_collection(
                 self.collection_name, embedding_function=self.embedding_function
             )
         except Exception:
-            with open("assets/icons.json", "r") as f:
-                icons = json.load(f)
-
-            documents = []
-            ids = []
-
-            for i, each in enumerate(icons["icons"]):
-                if each["name"].split("-")[-1] == "bold":
-                    doc_text = f"{each['name']} {each['tags']}"
-                    documents.append(doc_text)
-                    ids.append(each["name"])
+            documents, ids = load_icon_documents()
 
             if documents:
                 self.collection = self.client.create_collection(
@@ -44,13 +80,77 @@ class IconFinderService:
                 )
                 self.collection.add(documents=documents, ids=ids)
 
-    async def search_icons(self, query: str, k: int = 1):
-        result = await asyncio.to_thread(
-            self.collection.query,
-            query_texts=[query],
-            n_results=k,
+    def _query_icons(self, queries: List[str], k: int) -> List[List[str]]:
+        self._initialize()
+
+        # Embeds every query in a single ONNX pass and queries the index once
+        if self.numpy_index:
+            icon_ids = self.numpy_index.query(queries, k)
+        else:
+            icon_ids = self.collection.query(query_texts=queries, n_results=k)["ids"]
+        return [[f"/static/icons/bold/{each}.svg" for each in ids] for ids in icon_ids]
+
+    async def _flush_pending_searches(self):
+        await asyncio.sleep(BATCH_WINDOW_SECONDS)
+
+        while self._pending_searches:
+            # Searches stay pending until answered, see _on_flush_done
+            batch = self._pending_searches[:MAX_BATCH_SIZE]
+
+            # Queries with a smaller k get the top results of the largest k
+            max_k = max(k for _, k, _ in batch)
+            try:
+                results = await asyncio.to_thread(
+                    self._query_icons, [query for query, _, _ in batch], max_k
+                )
+                for (_, k, future), icons in zip(batch, results):
+                    if not future.done():
+                        future.set_result(icons[:k])
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            self._pending_searches = self._pending_searches[len(batch) :]
+
+    def _on_flush_done(self, task: asyncio.Task):
+        # Runs even if the flush is cancelled before it starts, so later
+        # searches start a new flush and none waits forever. Searches made
+        # after the flush ended belong to the flush they started.
+        if self._flush_task is not task:
+            return
+        self._flush_task = None
+        pending = self._pending_searches
+        self._pending_searches = []
+        for _, _, future in pending:
+            if future.done():
+                continue
+            if task.cancelled():
+                future.cancel()
+            else:
+                future.set_exception(
+                    task.exception() or RuntimeError("Icon search was not run")
+                )
+
+    async def search_icons(self, query: str, k: int = 1) -> List[str]:
+        # Repeated queries of a deck are searched once
+        return await SINGLE_FLIGHT_SERVICE.run(
+            "icons",
+            SINGLE_FLIGHT_SERVICE.get_key(query, k),
+            lambda: self._search_icons(query, k),
+            share=list,
         )
-        return [f"/static/icons/bold/{each}.svg" for each in result["ids"][0]]
+
+    async def _search_icons(self, query: str, k: int) -> List[str]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending_searches.append((query, k, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_pending_searches())
+            self._flush_task.add_done_callback(self._on_flush_done)
+        return await future
+
+    async def search_icons_batch(self, queries: List[str], k: int = 1):
+        """Searches icons for all queries, sharing a batch with concurrent callers"""
+        return await asyncio.gather(*[self.search_icons(query, k) for query in queries])
 
 
 ICON_FINDER_SERVICE = IconFinderService()
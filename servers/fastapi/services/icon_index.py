@@ -0,0 +1,107 @@
+import json
+import os
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+ICON_EMBEDDINGS_PATH = "assets/icons_embeddings.npy"
+ICON_IDS_PATH = "assets/icons_embeddings_ids.json"
+ICONS_PATH = "assets/icons.json"
+BOLD_ICONS_DIRECTORY = "static/icons/bold"
+
+
+def load_icon_documents() -> Tuple[List[str], List[str]]:
+    if not os.path.exists(ICONS_PATH):
+        return load_icon_documents_from_files()
+
+    with open(ICONS_PATH, "r") as f:
+        icons = json.load(f)
+
+    documents = []
+    ids = []
+
+    for each in icons["icons"]:
+        if each["name"].split("-")[-1] == "bold":
+            doc_text = f"{each['name']} {each['tags']}"
+            documents.append(doc_text)
+            ids.append(each["name"])
+
+    return documents, ids
+
+
+def load_icon_documents_from_files() -> Tuple[List[str], List[str]]:
+    """Documents of the bundled bold icons, named after their files without tags"""
+    print(f"{ICONS_PATH} not found, indexing icons by file name")
+    ids = sorted(
+        os.path.splitext(each)[0]
+        for each in os.listdir(BOLD_ICONS_DIRECTORY)
+        if each.endswith("-bold.svg")
+    )
+    documents = [f"{each} {' '.join(each.split('-')[:-1])}" for each in ids]
+    return documents, ids
+
+
+def get_icon_embedding_function() -> ONNXMiniLM_L6_V2:
+    embedding_function = ONNXMiniLM_L6_V2()
+    embedding_function.DOWNLOAD_PATH = "chroma/models"
+    embedding_function._download_model_if_not_exists()
+    return embedding_function
+
+
+class NumpyIconIndex:
+    """
+    In-memory cosine similarity index over precomputed icon embeddings.
+
+    Embeddings are stored as a normalized float32 matrix in a .npy file and
+    memory-mapped on load. A search embeds all queries at once and scores
+    them against every icon with a single matrix multiplication.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Callable[[List[str]], List[np.ndarray]],
+        embeddings_path: str = ICON_EMBEDDINGS_PATH,
+        ids_path: str = ICON_IDS_PATH,
+    ):
+        self.embedding_function = embedding_function
+        self.embeddings_path = embeddings_path
+        self.ids_path = ids_path
+        self.embeddings: Optional[np.ndarray] = None
+        self.ids: List[str] = []
+
+    def exists(self) -> bool:
+        return os.path.exists(self.embeddings_path) and os.path.exists(self.ids_path)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.asarray(self.embedding_function(texts), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def build(self, documents: List[str], ids: List[str]):
+        embeddings = self._embed(documents)
+
+        os.makedirs(os.path.dirname(self.embeddings_path) or ".", exist_ok=True)
+        np.save(self.embeddings_path, embeddings)
+        with open(self.ids_path, "w") as f:
+            json.dump(ids, f)
+
+    def load(self):
+        self.embeddings = np.load(self.embeddings_path, mmap_mode="r")
+        with open(self.ids_path, "r") as f:
+            self.ids = json.load(f)
+
+    def query(self, queries: List[str], k: int) -> List[List[str]]:
+        k = min(k, len(self.ids))
+        if not queries or k <= 0:
+            return [[] for _ in queries]
+
+        scores = self._embed(queries) @ self.embeddings.T
+
+        # Unordered top k per query, then sorted by score
+        top_k = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_k_scores = np.take_along_axis(scores, top_k, axis=1)
+        order = np.argsort(-top_k_scores, axis=1)
+        top_k = np.take_along_axis(top_k, order, axis=1)
+
+        return [[self.ids[index] for index in row] for row in top_k]
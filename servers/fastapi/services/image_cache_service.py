@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlmodel import select
+
+from models.sql.image_asset import ImageAsset
+from services.concurrent_service import CONCURRENT_SERVICE
+from services.database import async_session_maker
+from utils.get_env import get_disable_image_cache_env, get_image_cache_max_size_mb_env
+from utils.parsers import parse_bool_or_none
+
+DEFAULT_MAX_SIZE_MB = 2048
+
+# Minimum seconds between two eviction passes
+EVICTION_INTERVAL = 10 * 60
+EVICTION_BATCH_SIZE = 500
+
+
+class ImageCacheService:
+    """
+    Content-addressed cache for generated images.
+
+    Generated images are indexed in the ImageAsset table by their cache_key
+    column. The key is a hash of provider, model, quality and the full
+    prompt with theme, so an identical prompt is served from the existing
+    file or blob instead of calling the provider again.
+
+    Images are shared with the presentations that use them and listed in the
+    image library, so files and rows are never deleted by the cache. Once
+    the total indexed size of local files is over the limit, the oldest are
+    only removed from the index. Images in blob storage are never evicted.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._last_eviction_at = 0.0
+
+    def is_enabled(self) -> bool:
+        return not (parse_bool_or_none(get_disable_image_cache_env()) or False)
+
+    def get_max_size(self) -> int:
+        max_size_mb = get_image_cache_max_size_mb_env()
+        return int(max_size_mb or DEFAULT_MAX_SIZE_MB) * 1024 * 1024
+
+    def get_key(
+        self, provider: str, model: str, quality: Optional[str], prompt: str
+    ) -> str:
+        payload = json.dumps([provider, model, quality, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Returns the path or url of a cached image, if any"""
+        image_path = None
+        try:
+            async with async_session_maker() as sql_session:
+                image_paths = await sql_session.scalars(
+                    select(ImageAsset.path)
+                    .where(ImageAsset.cache_key == key)
+                    .order_by(ImageAsset.created_at.desc())
+                )
+                for each_path in image_paths:
+                    if each_path.startswith("http") or os.path.exists(each_path):
+                        image_path = each_path
+                        break
+        except Exception as e:
+            print(f"Error reading image cache: {e}")
+
+        if image_path:
+            self.hits += 1
+            return image_path
+
+        self.misses += 1
+        if time.time() - self._last_eviction_at > EVICTION_INTERVAL:
+            self._last_eviction_at = time.time()
+            CONCURRENT_SERVICE.run_task(None, self.evict)
+        return None
+
+    async def evict(self):
+        """Removes the oldest entries from the index once it is over the size limit"""
+        newest_first = (ImageAsset.created_at.desc(), ImageAsset.id.desc())
+        cached_images = (
+            select(
+                ImageAsset.id,
+                func.sum(ImageAsset.size)
+                .over(order_by=newest_first)
+                .label("total_size"),
+            )
+            .where(ImageAsset.cache_key.is_not(None), ImageAsset.size.is_not(None))
+            .subquery()
+        )
+        async with async_session_maker() as sql_session:
+            evicted_ids = (
+                await sql_session.scalars(
+                    select(cached_images.c.id).where(
+                        cached_images.c.total_size > self.get_max_size()
+                    )
+                )
+            ).all()
+
+            for index in range(0, len(evicted_ids), EVICTION_BATCH_SIZE):
+                batch = evicted_ids[index : index + EVICTION_BATCH_SIZE]
+                await sql_session.execute(
+                    update(ImageAsset)
+                    .where(ImageAsset.id.in_(batch))
+                    .values(cache_key=None, size=None)
+                )
+                await sql_session.commit()
+                self.evictions += len(batch)
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+IMAGE_CACHE_SERVICE = ImageCacheService()
@@ -1,18 +1,25 @@
 import asyncio
 import base64
+import hashlib
 import io
 import json
 import os
+from typing import Optional, Tuple
 import aiohttp
 from fastapi import HTTPException
-from google import genai
-from openai import NOT_GIVEN, AsyncOpenAI
+from openai import NOT_GIVEN
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from services.blob_storage_service import get_blob_storage_service
+from services.image_cache_service import IMAGE_CACHE_SERVICE
+from services.llm_client_registry import LLM_CLIENT_REGISTRY
+from services.single_flight_service import SINGLE_FLIGHT_SERVICE
 from utils.get_env import (
     get_dall_e_3_quality_env,
+    get_google_api_key_env,
     get_gpt_image_1_5_quality_env,
+    get_image_provider_env,
+    get_openai_api_key_env,
     get_pexels_api_key_env,
 )
 from utils.get_env import get_pixabay_api_key_env
@@ -61,6 +68,27 @@ class ImageGenerationService:
     def is_stock_provider_selected(self):
         return is_pixels_selected() or is_pixabay_selected()
 
+    def get_image_model_and_quality(self) -> Tuple[str, str, Optional[str]]:
+        """Returns provider, model and quality used to generate images"""
+        provider = get_image_provider_env() or ""
+        if is_dalle3_selected():
+            return provider, "dall-e-3", get_dall_e_3_quality_env() or "standard"
+        elif is_gpt_image_1_5_selected():
+            return (
+                provider,
+                "gpt-image-1.5",
+                get_gpt_image_1_5_quality_env() or "medium",
+            )
+        elif is_gemini_flash_selected():
+            return provider, "gemini-2.5-flash-image-preview", None
+        elif is_nanobanana_pro_selected():
+            return provider, "gemini-3-pro-image-preview", None
+        elif is_comfyui_selected():
+            # The workflow decides which model is used
+            workflow = get_comfyui_workflow_env() or ""
+            return provider, hashlib.sha256(workflow.encode()).hexdigest(), None
+        return provider, "", None
+
     async def generate_image(self, prompt: ImagePrompt) -> str | ImageAsset:
         """
         Generates an image based on the provided prompt.
@@ -81,8 +109,38 @@ class ImageGenerationService:
         image_prompt = prompt.get_image_prompt(
             with_theme=not self.is_stock_provider_selected()
         )
+
+        # Identical prompts generated at the same time share one image, only
+        # the first caller gets the ImageAsset to track it
+        return await SINGLE_FLIGHT_SERVICE.run(
+            "image",
+            SINGLE_FLIGHT_SERVICE.get_key(
+                *self.get_image_model_and_quality(),
+                image_prompt,
+                self.output_directory,
+            ),
+            lambda: self._generate_image(prompt, image_prompt),
+            share=lambda image: (
+                image.path if isinstance(image, ImageAsset) else image
+            ),
+        )
+
+    async def _generate_image(
+        self, prompt: ImagePrompt, image_prompt: str
+    ) -> str | ImageAsset:
         print(f"Request - Generating Image for {image_prompt}")
 
+        # Stock providers only search for images, so only generated ones are cached
+        cache_key = None
+        if not self.is_stock_provider_selected() and IMAGE_CACHE_SERVICE.is_enabled():
+            cache_key = IMAGE_CACHE_SERVICE.get_key(
+                *self.get_image_model_and_quality(), image_prompt
+            )
+            cached_image_path = await IMAGE_CACHE_SERVICE.get(cache_key)
+            if cached_image_path:
+                print(f"Using cached image for {image_prompt}")
+                return cached_image_path
+
         try:
             if self.is_stock_provider_selected():
                 image_path = await self.image_gen_func(image_prompt)
@@ -91,18 +149,30 @@ class ImageGenerationService:
                     image_prompt, self.output_directory
                 )
             if image_path:
-                # Blob URLs and stock provider URLs are returned directly
+                extras = {
+                    "prompt": prompt.prompt,
+                    "theme_prompt": prompt.theme_prompt,
+                }
+
                 if image_path.startswith("http"):
+                    # Generated images uploaded to blob storage are tracked for caching
+                    if cache_key:
+                        return ImageAsset(
+                            path=image_path,
+                            is_uploaded=False,
+                            extras=extras,
+                            cache_key=cache_key,
+                        )
+                    # Stock provider URLs are returned directly
                     return image_path
                 # Local file paths are wrapped in ImageAsset for database tracking
                 elif os.path.exists(image_path):
                     return ImageAsset(
                         path=image_path,
                         is_uploaded=False,
-                        extras={
-                            "prompt": prompt.prompt,
-                            "theme_prompt": prompt.theme_prompt,
-                        },
+                        extras=extras,
+                        cache_key=cache_key,
+                        size=os.path.getsize(image_path),
                     )
             raise Exception(f"Image not found at {image_path}")
 
@@ -113,7 +183,7 @@ class ImageGenerationService:
     async def generate_image_openai(
         self, prompt: str, output_directory: str, model: str, quality: str
     ) -> str:
-        client = AsyncOpenAI()
+        client = LLM_CLIENT_REGISTRY.get_openai_image_client(get_openai_api_key_env())
         result = await client.images.generate(
             model=model,
             prompt=prompt,
@@ -159,7 +229,7 @@ class ImageGenerationService:
         self, prompt: str, output_directory: str, model: str
     ) -> str:
         """Base method for Google image generation models."""
-        client = genai.Client()
+        client = LLM_CLIENT_REGISTRY.get_google_client(get_google_api_key_env())
         response = await asyncio.to_thread(
             client.models.generate_content,
             model=model,
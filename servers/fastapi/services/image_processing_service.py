@@ -0,0 +1,199 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import json
+import multiprocessing
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.get_env import get_image_processing_workers_env, get_temp_directory_env
+from utils.image_utils import apply_picture_transforms
+
+# Processed images kept on disk, the least recently used ones are deleted
+MAX_CACHED_IMAGES = 1000
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> Optional[str]:
+    try:
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+    except OSError:
+        return None
+
+
+class ImageProcessingService:
+    """
+    Applies picture transforms for PPTX export in a pool of worker processes.
+
+    Processed images are cached on the hash of the source file and the
+    transform parameters, so repeated logos and backgrounds are processed
+    once per process, not once per picture. Returned images are in use until
+    released, and images in use are never evicted.
+    """
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cached_images: "OrderedDict[str, str]" = OrderedDict()
+        self._keys_by_path: Dict[str, str] = {}
+        # Number of exports using each cached image
+        self._in_use: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache_dir(self) -> str:
+        cache_dir = os.path.join(
+            get_temp_directory_env() or "/tmp/presenton", "processed_images"
+        )
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+
+    def get_workers(self) -> int:
+        workers = get_image_processing_workers_env()
+        if workers:
+            return max(1, int(workers))
+        return min(4, os.cpu_count() or 1)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.get_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor):
+        if self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_key(self, file_hash: str, transforms: dict) -> str:
+        payload = json.dumps([file_hash, transforms], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _get_cached(self, key: str) -> Optional[str]:
+        image_path = self._cached_images.get(key)
+        if image_path and os.path.exists(image_path):
+            self._cached_images.move_to_end(key)
+            return image_path
+        return None
+
+    def _set_cached(self, key: str, image_path: str):
+        self._cached_images[key] = image_path
+        self._keys_by_path[image_path] = key
+        self._evict()
+
+    def _evict(self):
+        # Images in use are kept even over the limit, until they are released
+        n_evicted = len(self._cached_images) - MAX_CACHED_IMAGES
+        if n_evicted <= 0:
+            return
+        keys_to_evict = [key for key in self._cached_images if key not in self._in_use]
+        for key in keys_to_evict[:n_evicted]:
+            evicted_path = self._cached_images.pop(key)
+            self._keys_by_path.pop(evicted_path, None)
+            if os.path.exists(evicted_path):
+                os.remove(evicted_path)
+
+    def _use(self, keys: Set[str]):
+        for key in keys:
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+
+    def release_images(self, image_paths: List[Optional[str]]):
+        """Releases the images returned by process_images once they are used"""
+        for image_path in set(image_paths):
+            key = self._keys_by_path.get(image_path) if image_path else None
+            if key not in self._in_use:
+                continue
+            self._in_use[key] -= 1
+            if not self._in_use[key]:
+                del self._in_use[key]
+        self._evict()
+
+    async def process_images(self, jobs: List[Tuple[str, dict]]) -> List[Optional[str]]:
+        """
+        Applies transforms to (image path, transforms) jobs and returns the
+        processed image paths, None for images that couldn't be opened. The
+        paths must be passed to release_images once they are no longer used.
+        """
+        file_hashes = await asyncio.gather(
+            *[asyncio.to_thread(hash_file, image_path) for image_path, _ in jobs]
+        )
+
+        keys: List[Optional[str]] = []
+        processed_images: Dict[str, str] = {}
+        jobs_to_run: Dict[str, Tuple[str, dict]] = {}
+        for (image_path, transforms), file_hash in zip(jobs, file_hashes):
+            if file_hash is None:
+                print(f"Could not open image: {image_path}")
+                keys.append(None)
+                continue
+            key = self.get_key(file_hash, transforms)
+            keys.append(key)
+            if key in processed_images or key in jobs_to_run:
+                continue
+            cached_image = self._get_cached(key)
+            if cached_image:
+                processed_images[key] = cached_image
+            else:
+                jobs_to_run[key] = (image_path, transforms)
+        # Before processing, so cached images aren't evicted in the meantime
+        self._use(set(processed_images.keys()))
+
+        self.misses += len(jobs_to_run)
+        self.hits += sum(1 for key in keys if key) - len(jobs_to_run)
+
+        if jobs_to_run:
+            results = await self._run_jobs(
+                [
+                    (image_path, transforms, os.path.join(self.cache_dir, f"{key}.png"))
+                    for key, (image_path, transforms) in jobs_to_run.items()
+                ]
+            )
+            for key, result in zip(jobs_to_run.keys(), results):
+                if result:
+                    processed_images[key] = result
+                    self._use({key})
+                    self._set_cached(key, result)
+
+        return [processed_images.get(key) if key else None for key in keys]
+
+    async def _run_jobs(self, jobs: List[Tuple[str, dict, str]]) -> List[Optional[str]]:
+        # A single image isn't worth a round trip to the worker processes
+        if len(jobs) == 1:
+            return [await asyncio.to_thread(apply_picture_transforms, *jobs[0])]
+
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.gather(
+                *[
+                    loop.run_in_executor(pool, apply_picture_transforms, *job)
+                    for job in jobs
+                ]
+            )
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._reset_pool(self._pool)
+
+    def get_stats(self) -> dict:
+        return {
+            "cached_images": len(self._cached_images),
+            "images_in_use": len(self._in_use),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+IMAGE_PROCESSING_SERVICE = ImageProcessingService()
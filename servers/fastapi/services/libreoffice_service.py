@@ -0,0 +1,309 @@
+import asyncio
+import os
+import socket
+from typing import List, Optional
+
+from utils.get_env import (
+    get_libreoffice_max_jobs_per_worker_env,
+    get_libreoffice_uno_python_env,
+    get_libreoffice_workers_env,
+    get_temp_directory_env,
+)
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_JOBS_PER_WORKER = 50
+DEFAULT_UNO_PYTHON = "/usr/bin/python3"
+
+STARTUP_TIMEOUT = 60
+CONVERSION_TIMEOUT = 500
+
+UNO_CONVERT_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "utils",
+    "uno_convert.py",
+)
+
+
+def get_profile_url(profile_dir: str) -> str:
+    return f"-env:UserInstallation=file://{profile_dir}"
+
+
+def get_free_port() -> int:
+    # Ports picked by the OS, so other instances on the host don't collide
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LibreOfficeWorker:
+    """Headless LibreOffice instance listening for UNO connections"""
+
+    def __init__(self, profile_dir: str):
+        self.port: Optional[int] = None
+        self.profile_dir = profile_dir
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.jobs = 0
+
+    async def start(self):
+        # A new port on every start, the previous one may not be released yet
+        self.port = get_free_port()
+        self.process = await asyncio.create_subprocess_exec(
+            "libreoffice",
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nolockcheck",
+            get_profile_url(self.profile_dir),
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self.jobs = 0
+
+        deadline = asyncio.get_running_loop().time() + STARTUP_TIMEOUT
+        while not await self.is_healthy():
+            if (
+                self.process.returncode is not None
+                or asyncio.get_running_loop().time() > deadline
+            ):
+                await self.stop()
+                raise Exception(
+                    f"LibreOffice worker on port {self.port} failed to start"
+                )
+            await asyncio.sleep(0.25)
+        print(f"LibreOffice worker started on port {self.port}")
+
+    async def is_healthy(self) -> bool:
+        if self.process is None or self.process.returncode is not None:
+            return False
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            writer.close()
+            await writer.wait_closed()
+            return True
+        except OSError:
+            return False
+
+    async def convert(self, input_path: str, output_path: str, uno_python: str):
+        self.jobs += 1
+        process = await asyncio.create_subprocess_exec(
+            uno_python,
+            UNO_CONVERT_SCRIPT,
+            str(self.port),
+            input_path,
+            output_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(
+                process.communicate(), timeout=CONVERSION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise Exception(stderr.decode(errors="ignore"))
+
+    async def stop(self):
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        self.process = None
+
+
+class LibreOfficeService:
+    """
+    Converts documents to PDF with a pool of warm LibreOffice instances.
+
+    Conversion jobs wait in a queue for an idle worker. A worker is checked
+    before every job and restarted when its process died, its listener stopped
+    responding or it has handled the maximum number of jobs.
+
+    Jobs that need their own fontconfig, and every job when the UNO bindings
+    are not installed, run a one-off LibreOffice process instead, since
+    fontconfig is only read when a process starts. These reuse a persistent
+    profile so that LibreOffice doesn't create one on every run.
+    """
+
+    def __init__(self):
+        self._idle_workers: Optional[asyncio.Queue] = None
+        self._idle_profiles: Optional[asyncio.Queue] = None
+        self._workers: List[LibreOfficeWorker] = []
+        self._uno_available: Optional[bool] = None
+        self.conversions = 0
+        self.restarts = 0
+        self.recycles = 0
+
+    @property
+    def base_dir(self) -> str:
+        return os.path.join(get_temp_directory_env() or "/tmp/presenton", "libreoffice")
+
+    def get_workers(self) -> int:
+        workers = get_libreoffice_workers_env()
+        return max(1, int(workers)) if workers else DEFAULT_WORKERS
+
+    def get_max_jobs_per_worker(self) -> int:
+        max_jobs = get_libreoffice_max_jobs_per_worker_env()
+        return int(max_jobs) if max_jobs else DEFAULT_MAX_JOBS_PER_WORKER
+
+    def get_uno_python(self) -> str:
+        return get_libreoffice_uno_python_env() or DEFAULT_UNO_PYTHON
+
+    async def is_uno_available(self) -> bool:
+        if self._uno_available is None:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    self.get_uno_python(),
+                    "-c",
+                    "import uno",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                self._uno_available = await process.wait() == 0
+            except OSError:
+                self._uno_available = False
+            if not self._uno_available:
+                print("LibreOffice UNO bindings not found, using one-off conversions")
+        return self._uno_available
+
+    def _get_idle_workers(self) -> asyncio.Queue:
+        if self._idle_workers is None:
+            self._idle_workers = asyncio.Queue()
+            for i in range(self.get_workers()):
+                worker = LibreOfficeWorker(os.path.join(self.base_dir, f"worker_{i}"))
+                self._workers.append(worker)
+                self._idle_workers.put_nowait(worker)
+        return self._idle_workers
+
+    def _get_idle_profiles(self) -> asyncio.Queue:
+        if self._idle_profiles is None:
+            self._idle_profiles = asyncio.Queue()
+            for i in range(self.get_workers()):
+                self._idle_profiles.put_nowait(
+                    os.path.join(self.base_dir, f"profile_{i}")
+                )
+        return self._idle_profiles
+
+    async def _prepare_worker(self, worker: LibreOfficeWorker):
+        if worker.jobs >= self.get_max_jobs_per_worker():
+            self.recycles += 1
+            await worker.stop()
+        if not await worker.is_healthy():
+            if worker.process is not None:
+                self.restarts += 1
+            await worker.stop()
+            await worker.start()
+
+    async def initialize(self):
+        if not await self.is_uno_available():
+            return
+        idle_workers = self._get_idle_workers()
+        workers = [idle_workers.get_nowait() for _ in range(idle_workers.qsize())]
+        try:
+            await asyncio.gather(*[self._prepare_worker(each) for each in workers])
+        finally:
+            for worker in workers:
+                idle_workers.put_nowait(worker)
+
+    async def _convert_with_worker(self, input_path: str, output_path: str):
+        idle_workers = self._get_idle_workers()
+        worker = await idle_workers.get()
+        try:
+            await self._prepare_worker(worker)
+            await worker.convert(input_path, output_path, self.get_uno_python())
+        except Exception:
+            # A failed job may leave the instance stuck, so it is restarted
+            await worker.stop()
+            raise
+        finally:
+            idle_workers.put_nowait(worker)
+
+    async def _convert_with_process(
+        self, input_path: str, output_dir: str, fontconfig_file: Optional[str]
+    ):
+        env = os.environ.copy()
+        if fontconfig_file:
+            env["FONTCONFIG_FILE"] = fontconfig_file
+
+        idle_profiles = self._get_idle_profiles()
+        profile_dir = await idle_profiles.get()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "libreoffice",
+                "--headless",
+                "--norestore",
+                get_profile_url(profile_dir),
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                output_dir,
+                input_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=CONVERSION_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
+        finally:
+            idle_profiles.put_nowait(profile_dir)
+
+        print(f"LibreOffice PDF conversion output: {stdout.decode(errors='ignore')}")
+        if process.returncode != 0:
+            raise Exception(stderr.decode(errors="ignore"))
+
+    async def convert_to_pdf(
+        self, input_path: str, output_dir: str, fontconfig_file: Optional[str] = None
+    ) -> str:
+        """
+        Converts the document into output_dir and returns the pdf path.
+        Raises asyncio.TimeoutError if the conversion takes too long.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(
+            output_dir, f"{os.path.splitext(os.path.basename(input_path))[0]}.pdf"
+        )
+
+        # Running instances can't pick up a different fontconfig
+        if fontconfig_file is None and await self.is_uno_available():
+            await self._convert_with_worker(input_path, output_path)
+        else:
+            await self._convert_with_process(input_path, output_dir, fontconfig_file)
+
+        self.conversions += 1
+        return output_path
+
+    async def shutdown(self):
+        await asyncio.gather(*[worker.stop() for worker in self._workers])
+
+    def get_stats(self) -> dict:
+        return {
+            "uno_available": self._uno_available,
+            "conversions": self.conversions,
+            "restarts": self.restarts,
+            "recycles": self.recycles,
+            "workers": [
+                {
+                    "port": worker.port,
+                    "running": worker.process is not None,
+                    "jobs": worker.jobs,
+                }
+                for worker in self._workers
+            ],
+        }
+
+
+LIBREOFFICE_SERVICE = LibreOfficeService()
@@ -1,4 +1,5 @@
 import asyncio
+import copy
 import dirtyjson
 import json
 from typing import AsyncGenerator, List, Optional
@@ -39,7 +40,11 @@ from models.llm_tool_call import (
     OpenAIToolCallFunction,
 )
 from models.llm_tools import LLMDynamicTool, LLMTool
+from services.llm_client_registry import LLM_CLIENT_REGISTRY
+from services.llm_rate_limiter import LLM_RATE_LIMITER
+from services.llm_response_cache import LLM_RESPONSE_CACHE
 from services.llm_tool_calls_handler import LLMToolCallsHandler
+from services.single_flight_service import SINGLE_FLIGHT_SERVICE
 from utils.async_iterator import iterator_to_async
 from utils.dummy_functions import do_nothing_async
 from utils.get_env import (
@@ -112,7 +117,7 @@ class LLMClient:
                 status_code=400,
                 detail="OpenAI API Key is not set",
             )
-        return AsyncOpenAI()
+        return LLM_CLIENT_REGISTRY.get_openai_client(get_openai_api_key_env())
 
     def _get_google_client(self):
         if not get_google_api_key_env():
@@ -120,7 +125,7 @@ class LLMClient:
                 status_code=400,
                 detail="Google API Key is not set",
             )
-        return genai.Client()
+        return LLM_CLIENT_REGISTRY.get_google_client(get_google_api_key_env())
 
     def _get_anthropic_client(self):
         if not get_anthropic_api_key_env():
@@ -128,12 +133,12 @@ class LLMClient:
                 status_code=400,
                 detail="Anthropic API Key is not set",
             )
-        return AsyncAnthropic()
+        return LLM_CLIENT_REGISTRY.get_anthropic_client(get_anthropic_api_key_env())
 
     def _get_ollama_client(self):
-        return AsyncOpenAI(
-            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
+        return LLM_CLIENT_REGISTRY.get_openai_client(
             api_key="ollama",
+            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
         )
 
     def _get_custom_client(self):
@@ -142,9 +147,9 @@ class LLMClient:
                 status_code=400,
                 detail="Custom LLM URL is not set",
             )
-        return AsyncOpenAI(
-            base_url=get_custom_llm_url_env(),
+        return LLM_CLIENT_REGISTRY.get_openai_client(
             api_key=get_custom_llm_api_key_env() or "null",
+            base_url=get_custom_llm_url_env(),
         )
 
     # ? Prompts
@@ -401,15 +406,13 @@ class LLMClient:
             depth=depth,
         )
 
-    async def generate(
+    async def _generate_with_provider(
         self,
         model: str,
         messages: List[LLMMessage],
-        max_tokens: Optional[int] = None,
-        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int],
+        parsed_tools: Optional[List[dict]],
     ):
-        parsed_tools = self.tool_calls_handler.parse_tools(tools)
-
         content = None
         match self.llm_provider:
             case LLMProvider.OPENAI:
@@ -441,6 +444,24 @@ class LLMClient:
                 content = await self._generate_custom(
                     model=model, messages=messages, max_tokens=max_tokens
                 )
+        return content
+
+    async def generate(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+    ):
+        parsed_tools = self.tool_calls_handler.parse_tools(tools)
+
+        content = await LLM_RATE_LIMITER.run(
+            self.llm_provider.value,
+            model,
+            lambda: self._generate_with_provider(
+                model, messages, max_tokens, parsed_tools
+            ),
+        )
         if content is None:
             raise HTTPException(
                 status_code=400,
@@ -781,9 +802,70 @@ class LLMClient:
         strict: bool = False,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
+    ) -> dict:
+        # Calls with tools can have side effects, so they are never cached or shared
+        if tools:
+            return await self._generate_structured(
+                model, messages, response_format, strict, tools, max_tokens
+            )
+
+        request_key = LLM_RESPONSE_CACHE.get_key(
+            self.llm_provider.value, model, messages, response_format, strict
+        )
+        cache_key = None
+        if LLM_RESPONSE_CACHE.is_enabled():
+            cache_key = request_key
+            cached_content = await LLM_RESPONSE_CACHE.get(cache_key)
+            if cached_content is not None:
+                return cached_content
+
+        # Identical requests made while this one runs wait for its response
+        return await SINGLE_FLIGHT_SERVICE.run(
+            "llm",
+            SINGLE_FLIGHT_SERVICE.get_key(request_key, max_tokens),
+            lambda: self._generate_structured(
+                model, messages, response_format, strict, tools, max_tokens, cache_key
+            ),
+            share=copy.deepcopy,
+        )
+
+    async def _generate_structured(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]],
+        max_tokens: Optional[int],
+        cache_key: Optional[str] = None,
     ) -> dict:
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
+        content = await LLM_RATE_LIMITER.run(
+            self.llm_provider.value,
+            model,
+            lambda: self._generate_structured_with_provider(
+                model, messages, response_format, strict, parsed_tools, max_tokens
+            ),
+        )
+        if content is None:
+            raise HTTPException(
+                status_code=400,
+                detail="LLM did not return any content",
+            )
+        if cache_key:
+            await LLM_RESPONSE_CACHE.set(cache_key, content)
+        return content
+
+    async def _generate_structured_with_provider(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool,
+        parsed_tools: Optional[List[dict]],
+        max_tokens: Optional[int],
+    ) -> dict | None:
         content = None
         match self.llm_provider:
             case LLMProvider.OPENAI:
@@ -827,11 +909,6 @@ class LLMClient:
                     strict=strict,
                     max_tokens=max_tokens,
                 )
-        if content is None:
-            raise HTTPException(
-                status_code=400,
-                detail="LLM did not return any content",
-            )
         return content
 
     # ? Stream Unstructured Content
@@ -1104,6 +1181,21 @@ class LLMClient:
     ):
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
+        return LLM_RATE_LIMITER.stream(
+            self.llm_provider.value,
+            model,
+            lambda: self._stream_with_provider(
+                model, messages, max_tokens, parsed_tools
+            ),
+        )
+
+    def _stream_with_provider(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int],
+        parsed_tools: Optional[List[dict]],
+    ):
         match self.llm_provider:
             case LLMProvider.OPENAI:
                 return self._stream_openai(
@@ -1528,6 +1620,23 @@ class LLMClient:
     ):
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
+        return LLM_RATE_LIMITER.stream(
+            self.llm_provider.value,
+            model,
+            lambda: self._stream_structured_with_provider(
+                model, messages, response_format, strict, parsed_tools, max_tokens
+            ),
+        )
+
+    def _stream_structured_with_provider(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool,
+        parsed_tools: Optional[List[dict]],
+        max_tokens: Optional[int],
+    ):
         match self.llm_provider:
             case LLMProvider.OPENAI:
                 return self._stream_openai_structured(
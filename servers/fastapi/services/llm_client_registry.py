@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import importlib.util
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient as AnthropicHttpxClient
+from google import genai
+from openai import (
+    DEFAULT_MAX_RETRIES as OPENAI_DEFAULT_MAX_RETRIES,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient as OpenAIHttpxClient,
+)
+
+from services.concurrent_service import CONCURRENT_SERVICE
+from services.llm_rate_limiter import LLM_RATE_LIMITER
+
+# Connection pool limits shared by every provider client
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30
+
+# Seconds to wait before closing a client that was replaced, so that
+# in-flight requests made with the old credentials can finish
+STALE_CLIENT_CLOSE_DELAY = 120
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry of provider SDK clients.
+
+    Clients are keyed by provider, base url and a hash of the api key, so
+    every LLMClient instance with the same credentials shares one HTTP
+    connection pool. A client is only replaced when the credentials for
+    its provider and base url change.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str, str], Any] = {}
+        self._created_at: Dict[Tuple[str, str, str], datetime] = {}
+        self._hits: Dict[Tuple[str, str, str], int] = {}
+        self.total_hits = 0
+        self.total_misses = 0
+        self.total_replaced = 0
+        self.http2 = importlib.util.find_spec("h2") is not None
+
+    def _get_http_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+
+    def _get_event_hooks(self) -> dict:
+        # Rate limit headers of every response, retries of the SDKs included
+        return {"response": [LLM_RATE_LIMITER.on_response]}
+
+    def _get_or_create(
+        self,
+        provider: str,
+        base_url: Optional[str],
+        api_key: Optional[str],
+        factory: Callable[[], Any],
+    ):
+        key_hash = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+        key = (provider, base_url or "", key_hash)
+
+        client = self._clients.get(key)
+        if client is not None:
+            self.total_hits += 1
+            self._hits[key] += 1
+            return client
+
+        # Credentials for this provider and base url changed
+        for stale_key in [
+            each for each in self._clients if each[:2] == key[:2] and each != key
+        ]:
+            self._discard(stale_key)
+            self.total_replaced += 1
+
+        client = factory()
+        self._clients[key] = client
+        self._created_at[key] = datetime.now()
+        self._hits[key] = 0
+        self.total_misses += 1
+        print(f"Created {provider} client for {base_url or 'default url'}")
+        return client
+
+    def _discard(self, key: Tuple[str, str, str]):
+        client = self._clients.pop(key)
+        self._created_at.pop(key, None)
+        self._hits.pop(key, None)
+
+        close = getattr(client, "close", None)
+        if close and asyncio.iscoroutinefunction(close):
+            try:
+                asyncio.get_running_loop()
+                CONCURRENT_SERVICE.run_task(STALE_CLIENT_CLOSE_DELAY, close)
+            except RuntimeError:
+                pass
+
+    def get_openai_client(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> AsyncOpenAI:
+        return self._get_or_create(
+            "openai",
+            base_url,
+            api_key,
+            lambda: AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                # LLM_RATE_LIMITER retries rate limited calls with its backoff
+                max_retries=0,
+                http_client=OpenAIHttpxClient(
+                    http2=self.http2,
+                    limits=self._get_http_limits(),
+                    event_hooks=self._get_event_hooks(),
+                ),
+            ),
+        )
+
+    def get_openai_image_client(self, api_key: Optional[str] = None) -> AsyncOpenAI:
+        """
+        OpenAI client for image generation, which doesn't go through
+        LLM_RATE_LIMITER, so it keeps the SDK retries. It shares the
+        connection pool of the client returned by get_openai_client.
+        """
+        return self.get_openai_client(api_key).with_options(
+            max_retries=OPENAI_DEFAULT_MAX_RETRIES
+        )
+
+    def get_anthropic_client(self, api_key: Optional[str] = None) -> AsyncAnthropic:
+        return self._get_or_create(
+            "anthropic",
+            None,
+            api_key,
+            lambda: AsyncAnthropic(
+                api_key=api_key,
+                # LLM_RATE_LIMITER retries rate limited calls with its backoff
+                max_retries=0,
+                http_client=AnthropicHttpxClient(
+                    http2=self.http2,
+                    limits=self._get_http_limits(),
+                    event_hooks=self._get_event_hooks(),
+                ),
+            ),
+        )
+
+    def get_google_client(self, api_key: Optional[str] = None) -> genai.Client:
+        return self._get_or_create(
+            "google",
+            None,
+            api_key,
+            lambda: genai.Client(api_key=api_key),
+        )
+
+    def get_stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            "hits": self.total_hits,
+            "misses": self.total_misses,
+            "replaced": self.total_replaced,
+            "clients": [
+                {
+                    "provider": key[0],
+                    "base_url": key[1] or None,
+                    "created_at": self._created_at[key].isoformat(),
+                    "hits": self._hits[key],
+                }
+                for key in self._clients
+            ],
+        }
+
+
+LLM_CLIENT_REGISTRY = LLMClientRegistry()
@@ -0,0 +1,357 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+import random
+import re
+import time
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from anthropic import APIConnectionError as AnthropicConnectionError
+import httpx
+from openai import APIConnectionError as OpenAIConnectionError
+
+from utils.get_env import (
+    get_llm_max_concurrency_env,
+    get_llm_rate_limit_retries_env,
+    get_llm_requests_per_minute_env,
+)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_RETRIES = 3
+
+# Backoff after a rate limited request without a retry-after header
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# Concurrency is lowered at most once per window, since requests in flight
+# when the provider starts rejecting them all fail together
+DECREASE_WINDOW_SECONDS = 1.0
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+# Limiter of the request being made, for the response hook of http clients
+_current_limiter: ContextVar[Optional["ProviderRateLimiter"]] = ContextVar(
+    "current_llm_rate_limiter", default=None
+)
+
+
+def is_rate_limit_error(e: Exception) -> bool:
+    # openai and anthropic errors have status_code, google errors have code
+    return getattr(e, "status_code", None) == 429 or getattr(e, "code", None) == 429
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """Errors the provider SDKs would retry, which are left to this limiter"""
+    if is_rate_limit_error(e):
+        return True
+    if isinstance(
+        e,
+        (
+            asyncio.TimeoutError,
+            httpx.TransportError,
+            OpenAIConnectionError,
+            AnthropicConnectionError,
+        ),
+    ):
+        return True
+    status_code = getattr(e, "status_code", None) or getattr(e, "code", None)
+    return isinstance(status_code, int) and (
+        status_code in (408, 409) or status_code >= 500
+    )
+
+
+def get_backoff_seconds(attempt: int) -> float:
+    # Full jitter, so failed requests don't retry all at once
+    return random.uniform(
+        0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2**attempt)
+    )
+
+
+def parse_reset_seconds(value: Optional[str]) -> Optional[float]:
+    """Parses reset headers, either a duration like 6m0s or a timestamp"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    durations = DURATION_PATTERN.findall(value)
+    if durations:
+        return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in durations)
+
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+    except ValueError:
+        return None
+
+
+def parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ProviderRateLimiter:
+    """
+    Token bucket and adaptive concurrency limit for one provider and model.
+
+    Concurrency grows by one after as many successful requests as the
+    current limit and halves on rate limited requests, down to one. The
+    token bucket starts from LLM_REQUESTS_PER_MINUTE and follows the request
+    limits providers report in their rate limit headers. When the provider
+    says no requests are left, or asks to retry after some time, no request
+    starts until then.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: Optional[int]):
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.in_flight = 0
+        self.waiting = 0
+        self.blocked_until = 0.0
+        self.requests_per_minute = requests_per_minute
+        self.tokens = float(requests_per_minute or 0)
+        self.rate_limited = 0
+        self._successes = 0
+        self._consecutive_rate_limits = 0
+        self._last_decrease_at = 0.0
+        self._last_refill_at = time.monotonic()
+        self._condition = asyncio.Condition()
+
+    def _refill(self, now: float):
+        if self.requests_per_minute:
+            self.tokens = min(
+                float(self.requests_per_minute),
+                self.tokens
+                + (now - self._last_refill_at) * self.requests_per_minute / 60,
+            )
+        self._last_refill_at = now
+
+    def _get_delay(self) -> Optional[float]:
+        """Seconds until a request can start, None if it waits for a free slot"""
+        if self.in_flight >= self.limit:
+            return None
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.requests_per_minute and self.tokens < 1:
+            return (1 - self.tokens) * 60 / self.requests_per_minute
+        return 0
+
+    async def acquire(self):
+        self.waiting += 1
+        try:
+            async with self._condition:
+                while (delay := self._get_delay()) != 0:
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                self.in_flight += 1
+                if self.requests_per_minute:
+                    self.tokens -= 1
+        finally:
+            self.waiting -= 1
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        self._consecutive_rate_limits = 0
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_concurrency:
+            self.limit += 1
+            self._successes = 0
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        now = time.monotonic()
+        self.rate_limited += 1
+        self._successes = 0
+
+        if now - self._last_decrease_at >= DECREASE_WINDOW_SECONDS:
+            self.limit = max(1, self.limit // 2)
+            self._consecutive_rate_limits += 1
+            self._last_decrease_at = now
+
+        if retry_after is None:
+            retry_after = get_backoff_seconds(self._consecutive_rate_limits)
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def on_headers(self, headers: Mapping[str, str]):
+        # OpenAI compatible and Anthropic request limit headers
+        limit = parse_int(
+            headers.get("x-ratelimit-limit-requests")
+            or headers.get("anthropic-ratelimit-requests-limit")
+        )
+        remaining = parse_int(
+            headers.get("x-ratelimit-remaining-requests")
+            or headers.get("anthropic-ratelimit-requests-remaining")
+        )
+        reset_seconds = parse_reset_seconds(
+            headers.get("x-ratelimit-reset-requests")
+            or headers.get("anthropic-ratelimit-requests-reset")
+        )
+
+        if limit and limit != self.requests_per_minute:
+            now = time.monotonic()
+            self._refill(now)
+            self.requests_per_minute = limit
+            self.tokens = min(self.tokens, float(limit))
+        if remaining is not None and self.requests_per_minute:
+            self.tokens = min(self.tokens, float(remaining))
+        if remaining == 0 and reset_seconds:
+            self.blocked_until = max(
+                self.blocked_until, time.monotonic() + reset_seconds
+            )
+
+    def get_stats(self) -> dict:
+        return {
+            "concurrency_limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "requests_per_minute": self.requests_per_minute,
+            "blocked_for": max(0.0, round(self.blocked_until - time.monotonic(), 2)),
+            "rate_limited": self.rate_limited,
+        }
+
+
+class LLMRateLimiter:
+    """
+    Process-wide limits for LLM requests, keyed by provider and model.
+
+    Every LLMClient call waits for its limiter before reaching the provider
+    and is retried a few times when rate limited or when the provider fails
+    transiently, instead of failing the deck it belongs to. Retries are
+    owned here, the SDK clients of the registry don't retry, and report
+    the rate limit headers of every response.
+    """
+
+    def __init__(self):
+        self._limiters: Dict[Tuple[str, str], ProviderRateLimiter] = {}
+
+    def get_retries(self) -> int:
+        retries = get_llm_rate_limit_retries_env()
+        return max(0, int(retries)) if retries else DEFAULT_RETRIES
+
+    def get_limiter(self, provider: str, model: str) -> ProviderRateLimiter:
+        key = (provider, model)
+        if key not in self._limiters:
+            max_concurrency = get_llm_max_concurrency_env()
+            requests_per_minute = get_llm_requests_per_minute_env()
+            self._limiters[key] = ProviderRateLimiter(
+                (
+                    max(1, int(max_concurrency))
+                    if max_concurrency
+                    else DEFAULT_MAX_CONCURRENCY
+                ),
+                int(requests_per_minute) if requests_per_minute else None,
+            )
+        return self._limiters[key]
+
+    def _get_retry_after(self, e: Exception) -> Optional[float]:
+        response = getattr(e, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        return parse_reset_seconds(headers.get("retry-after"))
+
+    @asynccontextmanager
+    async def limit(self, provider: str, model: str) -> AsyncIterator[None]:
+        limiter = self.get_limiter(provider, model)
+        await limiter.acquire()
+        token = _current_limiter.set(limiter)
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limit_error(e):
+                limiter.on_rate_limited(self._get_retry_after(e))
+            raise
+        else:
+            limiter.on_success()
+        finally:
+            _current_limiter.reset(token)
+            await limiter.release()
+
+    async def _wait_before_retry(
+        self, provider: str, model: str, e: Exception, attempt: int
+    ):
+        if is_rate_limit_error(e):
+            # The limiter already holds requests back until the retry is due
+            print(f"Rate limited by {provider} for {model}, retrying")
+            return
+        print(f"Request to {provider} for {model} failed, retrying: {e}")
+        await asyncio.sleep(get_backoff_seconds(attempt))
+
+    async def run(
+        self, provider: str, model: str, call: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Calls the provider within its limits, retrying rate limited calls"""
+        retries = self.get_retries()
+        for attempt in range(retries + 1):
+            try:
+                async with self.limit(provider, model):
+                    return await call()
+            except Exception as e:
+                if not is_retryable_error(e) or attempt == retries:
+                    raise
+                await self._wait_before_retry(provider, model, e, attempt)
+
+    async def stream(
+        self, provider: str, model: str, get_stream: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        """
+        Streams from the provider within its limits. A stream is only retried
+        if it was rate limited before yielding anything.
+        """
+        retries = self.get_retries()
+        for attempt in range(retries + 1):
+            started = False
+            try:
+                async with self.limit(provider, model):
+                    async for chunk in get_stream():
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if started or not is_retryable_error(e) or attempt == retries:
+                    raise
+                await self._wait_before_retry(provider, model, e, attempt)
+
+    async def on_response(self, response: httpx.Response):
+        """Response hook for the http clients of provider SDKs"""
+        limiter = _current_limiter.get()
+        if limiter is None:
+            return
+        # Rate limited responses are handled when the SDK raises them
+        limiter.on_headers(response.headers)
+
+    def get_stats(self) -> dict:
+        return {
+            "limiters": [
+                {"provider": provider, "model": model, **limiter.get_stats()}
+                for (provider, model), limiter in self._limiters.items()
+            ],
+            "waiting": sum(each.waiting for each in self._limiters.values()),
+        }
+
+
+LLM_RATE_LIMITER = LLMRateLimiter()
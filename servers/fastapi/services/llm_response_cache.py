@@ -0,0 +1,189 @@
+import asyncio
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Iterator, List, Optional
+
+from models.llm_message import LLMMessage
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_llm_response_cache_env,
+    get_llm_response_cache_max_entries_env,
+    get_llm_response_cache_ttl_env,
+)
+from utils.parsers import parse_bool_or_none
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+
+# Prompts inject the current date and time, which would make every key unique.
+# Only the injected one is matched, dates in user content are kept.
+TIMESTAMP_PATTERN = re.compile(
+    r"(Current Date and Time(?::[ \t]*|[ \t]*\n\s*))"
+    r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"
+)
+
+
+class LLMResponseCache:
+    """
+    Opt-in, content-addressed cache for structured LLM responses.
+
+    Responses are stored in a SQLite file inside the app data directory,
+    expire after a TTL and are evicted least recently used first once the
+    maximum number of entries is reached.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self._db_path = db_path
+        self._initialized = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path is None:
+            app_data_directory = get_app_data_directory_env() or "/tmp/presenton"
+            os.makedirs(app_data_directory, exist_ok=True)
+            self._db_path = os.path.join(app_data_directory, "llm_cache.db")
+        return self._db_path
+
+    def is_enabled(self) -> bool:
+        return parse_bool_or_none(get_llm_response_cache_env()) or False
+
+    def get_ttl(self) -> int:
+        ttl = get_llm_response_cache_ttl_env()
+        return int(ttl) if ttl else DEFAULT_TTL_SECONDS
+
+    def get_max_entries(self) -> int:
+        max_entries = get_llm_response_cache_max_entries_env()
+        return int(max_entries) if max_entries else DEFAULT_MAX_ENTRIES
+
+    def get_key(
+        self,
+        provider: str,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool,
+    ) -> str:
+        serialized_messages = []
+        for message in messages:
+            message_dict = message.model_dump(mode="json")
+            if isinstance(message_dict.get("content"), str):
+                message_dict["content"] = TIMESTAMP_PATTERN.sub(
+                    r"\1", message_dict["content"]
+                )
+            serialized_messages.append(message_dict)
+
+        payload = json.dumps(
+            [provider, model, serialized_messages, response_format, strict],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        if not self._initialized:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed_at REAL NOT NULL
+                )
+                """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_responses_last_accessed_at "
+                "ON llm_responses (last_accessed_at)"
+            )
+            connection.commit()
+            self._initialized = True
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created_at = row
+            if now - created_at > self.get_ttl():
+                connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+
+            connection.execute(
+                "UPDATE llm_responses SET last_accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            return json.loads(value)
+
+    def _set(self, key: str, value: dict):
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            connection.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?",
+                (now - self.get_ttl(),),
+            )
+            count = connection.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[
+                0
+            ]
+            overflow = count - self.get_max_entries()
+            if overflow > 0:
+                connection.execute(
+                    """
+                    DELETE FROM llm_responses WHERE key IN (
+                        SELECT key FROM llm_responses
+                        ORDER BY last_accessed_at ASC LIMIT ?
+                    )
+                    """,
+                    (overflow,),
+                )
+                self.evictions += overflow
+
+    async def get(self, key: str) -> Optional[dict]:
+        try:
+            value = await asyncio.to_thread(self._get, key)
+        except Exception as e:
+            print(f"Error reading LLM response cache: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: dict):
+        try:
+            await asyncio.to_thread(self._set, key, value)
+        except Exception as e:
+            print(f"Error writing LLM response cache: {e}")
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+LLM_RESPONSE_CACHE = LLMResponseCache()
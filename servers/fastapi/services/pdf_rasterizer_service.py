@@ -0,0 +1,141 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+from typing import List, Optional
+
+import pdfplumber
+
+from utils.get_env import (
+    get_pdf_page_image_dpi_env,
+    get_pdf_page_image_format_env,
+    get_pdf_rasterizer_workers_env,
+)
+
+DEFAULT_RESOLUTION = 150
+DEFAULT_IMAGE_FORMAT = "png"
+IMAGE_QUALITY = 90
+
+# Pillow format and file extension for each supported page image format
+IMAGE_FORMATS = {
+    "png": ("PNG", "png"),
+    "jpeg": ("JPEG", "jpg"),
+    "jpg": ("JPEG", "jpg"),
+    "webp": ("WEBP", "webp"),
+}
+
+# Pages rendered by one worker task, small enough that early pages land quickly
+PAGES_PER_TASK = 4
+
+
+class PdfRasterizerService:
+    """
+    Renders PDF pages to images across a pool of worker processes.
+
+    Pages are split into small contiguous chunks rendered in parallel and
+    written directly into the output directory as page images.
+    """
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def get_workers(self) -> int:
+        workers = get_pdf_rasterizer_workers_env()
+        if workers:
+            return max(1, int(workers))
+        return min(4, os.cpu_count() or 1)
+
+    def get_resolution(self) -> int:
+        resolution = get_pdf_page_image_dpi_env()
+        return int(resolution) if resolution else DEFAULT_RESOLUTION
+
+    def get_image_format(self) -> str:
+        image_format = (get_pdf_page_image_format_env() or "").lower()
+        return image_format if image_format in IMAGE_FORMATS else DEFAULT_IMAGE_FORMAT
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.get_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor):
+        if self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def render_pages(
+        self, file_path: str, output_dir: str, file_name_prefix: str = "page_"
+    ) -> List[str]:
+        """Renders every page into output_dir and returns image paths in page order"""
+        os.makedirs(output_dir, exist_ok=True)
+        resolution = self.get_resolution()
+        image_format = self.get_image_format()
+
+        page_count = await asyncio.to_thread(get_page_count, file_path)
+        chunks = [
+            list(range(start, min(start + PAGES_PER_TASK, page_count)))
+            for start in range(0, page_count, PAGES_PER_TASK)
+        ]
+        args = (file_path, output_dir, file_name_prefix, resolution, image_format)
+
+        # Short documents aren't worth a round trip to the worker processes
+        if len(chunks) <= 1:
+            return await asyncio.to_thread(render_page_chunk, *args, range(page_count))
+
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            results = await asyncio.gather(
+                *[
+                    loop.run_in_executor(pool, render_page_chunk, *args, chunk)
+                    for chunk in chunks
+                ]
+            )
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise
+        return [image_path for chunk in results for image_path in chunk]
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._reset_pool(self._pool)
+
+
+def get_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def render_page_chunk(
+    file_path: str,
+    output_dir: str,
+    file_name_prefix: str,
+    resolution: int,
+    image_format: str,
+    page_indexes: List[int],
+) -> List[str]:
+    pil_format, extension = IMAGE_FORMATS[image_format]
+    image_paths = []
+    with pdfplumber.open(file_path) as pdf:
+        for page_index in page_indexes:
+            page = pdf.pages[page_index]
+            image = page.to_image(resolution=resolution).original
+            if pil_format == "JPEG" and image.mode != "RGB":
+                image = image.convert("RGB")
+
+            image_path = os.path.join(
+                output_dir, f"{file_name_prefix}{page.page_number}.{extension}"
+            )
+            image.save(image_path, pil_format, quality=IMAGE_QUALITY)
+            image_paths.append(image_path)
+
+            # Pages already rendered don't need to stay in memory
+            page.close()
+    return image_paths
+
+
+PDF_RASTERIZER_SERVICE = PdfRasterizerService()
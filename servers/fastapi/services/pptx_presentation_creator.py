@@ -1,5 +1,5 @@
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from lxml import etree
 from services.html_to_text_runs_service import (
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
@@ -11,7 +11,6 @@ from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from lxml.etree import fromstring, tostring
-from PIL import Image
 from pptx.oxml.xmlchemy import OxmlElement
 
 from pptx.util import Pt
@@ -35,14 +34,8 @@ from models.pptx_models import (
     PptxTextRunModel,
 )
 from utils.download_helpers import download_files
-from utils.image_utils import (
-    clip_image,
-    create_circle_image,
-    fit_image,
-    invert_image,
-    round_image_corners,
-    set_image_opacity,
-)
+from services.image_processing_service import IMAGE_PROCESSING_SERVICE
+from utils.image_utils import apply_picture_transforms
 import uuid
 
 BLANK_SLIDE_LAYOUT = 6
@@ -55,6 +48,9 @@ class PptxPresentationCreator:
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
 
+        # Processed image paths of picture models, None if it couldn't be opened
+        self._processed_pictures: Dict[int, Optional[str]] = {}
+
         self._ppt = Presentation()
         self._ppt.slide_width = Pt(1280)
         self._ppt.slide_height = Pt(720)
@@ -110,15 +106,73 @@ class PptxPresentationCreator:
                     each_shape.picture.path = each_image_path
                     each_shape.picture.is_network = False
 
+    def get_picture_transforms(
+        self, picture_model: PptxPictureBoxModel
+    ) -> Optional[dict]:
+        if not (
+            picture_model.clip
+            or picture_model.border_radius
+            or picture_model.invert
+            or picture_model.opacity
+            or picture_model.object_fit
+            or picture_model.shape
+        ):
+            return None
+
+        return {
+            "width": picture_model.position.width,
+            "height": picture_model.position.height,
+            "clip": picture_model.clip,
+            "border_radius": picture_model.border_radius,
+            "object_fit": (
+                picture_model.object_fit.model_dump(mode="json")
+                if picture_model.object_fit
+                else None
+            ),
+            "circle": picture_model.shape == PptxBoxShapeEnum.CIRCLE,
+            "invert": picture_model.invert,
+            "opacity": picture_model.opacity,
+        }
+
+    async def process_pictures(self):
+        """Applies the transforms of every picture in the deck ahead of time"""
+        picture_models: List[PptxPictureBoxModel] = []
+        jobs = []
+        shape_models = list(self._ppt_model.shapes or [])
+        for slide_model in self._slide_models:
+            shape_models.extend(slide_model.shapes)
+
+        for shape_model in shape_models:
+            if type(shape_model) is not PptxPictureBoxModel:
+                continue
+            transforms = self.get_picture_transforms(shape_model)
+            if transforms:
+                picture_models.append(shape_model)
+                jobs.append((shape_model.picture.path, transforms))
+
+        if not jobs:
+            return
+
+        processed_paths = await IMAGE_PROCESSING_SERVICE.process_images(jobs)
+        for picture_model, processed_path in zip(picture_models, processed_paths):
+            self._processed_pictures[id(picture_model)] = processed_path
+
     async def create_ppt(self):
         await self.fetch_network_assets()
+        await self.process_pictures()
 
-        for slide_model in self._slide_models:
-            # Adding global shapes to slide
-            if self._ppt_model.shapes:
-                slide_model.shapes.append(self._ppt_model.shapes)
-
-            self.add_and_populate_slide(slide_model)
+        try:
+            for slide_model in self._slide_models:
+                # Adding global shapes to slide
+                if self._ppt_model.shapes:
+                    slide_model.shapes.extend(self._ppt_model.shapes)
+
+                self.add_and_populate_slide(slide_model)
+        finally:
+            # Pictures are read into the presentation when they are added
+            IMAGE_PROCESSING_SERVICE.release_images(
+                list(self._processed_pictures.values())
+            )
 
     def set_presentation_theme(self):
         slide_master = self._ppt.slide_master
@@ -176,52 +230,27 @@ class PptxPresentationCreator:
 
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
         image_path = picture_model.picture.path
-        if (
-            picture_model.clip
-            or picture_model.border_radius
-            or picture_model.invert
-            or picture_model.opacity
-            or picture_model.object_fit
-            or picture_model.shape
-        ):
-            try:
-                image = Image.open(image_path)
-            except Exception:
-                print(f"Could not open image: {image_path}")
+        if id(picture_model) in self._processed_pictures:
+            image_path = self._processed_pictures[id(picture_model)]
+            if not image_path:
                 return
-
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
-                )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
+        else:
+            transforms = self.get_picture_transforms(picture_model)
+            if transforms:
+                image_path = apply_picture_transforms(
+                    image_path,
+                    transforms,
+                    os.path.join(self._temp_dir, f"{uuid.uuid4()}.png"),
                 )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.invert:
-                image = invert_image(image)
-            if picture_model.opacity:
-                image = set_image_opacity(image, picture_model.opacity)
-            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-            image.save(image_path)
+                if not image_path:
+                    return
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
         )
 
+        # python-pptx stores an image once however many slides use it, and the
+        # processed images of identical pictures share one cached path
         slide.shapes.add_picture(image_path, *margined_position.to_pt_list())
 
     def add_autoshape(self, slide: Slide, autoshape_box_model: PptxAutoShapeBoxModel):
@@ -0,0 +1,419 @@
+import asyncio
+from datetime import datetime, timedelta
+import os
+import socket
+import traceback
+from typing import Dict, List, Optional
+import uuid
+
+import aiohttp
+from anthropic import APIConnectionError as AnthropicConnectionError
+from fastapi import HTTPException
+import httpx
+from openai import APIConnectionError as OpenAIConnectionError
+from sqlalchemy import or_, update
+from sqlmodel import select
+
+from enums.webhook_event import WebhookEvent
+from models.api_error_model import APIErrorModel
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from services.concurrent_service import CONCURRENT_SERVICE
+from services.database import async_session_maker
+from services.webhook_service import WebhookService
+from utils.get_env import (
+    get_job_lease_seconds_env,
+    get_job_max_attempts_env,
+    get_job_poll_interval_env,
+    get_job_worker_concurrency_env,
+)
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_MAX_ATTEMPTS = 3
+# Delay before the first retry of a failed job, doubled on every attempt
+RETRY_DELAY_SECONDS = 5
+
+PENDING = "pending"
+COMPLETED = "completed"
+ERROR = "error"
+CANCELLED = "cancelled"
+
+TRANSIENT_ERRORS = (
+    asyncio.TimeoutError,
+    ConnectionError,
+    aiohttp.ClientConnectionError,
+    httpx.TransportError,
+    OpenAIConnectionError,
+    AnthropicConnectionError,
+)
+
+
+def is_transient_error(e: BaseException) -> bool:
+    """
+    Whether a failed generation can succeed if retried. Provider errors are
+    wrapped in HTTPException 500 by the llm calls, so the original error at
+    the bottom of the chain decides: timeouts, connection errors, rate
+    limits and server errors are retried, invalid requests, keys and
+    content are not.
+    """
+    while e.__cause__ or e.__context__:
+        e = e.__cause__ or e.__context__
+    if isinstance(e, TRANSIENT_ERRORS):
+        return True
+    # HTTPException and provider SDK errors have status_code, google errors code
+    status_code = getattr(e, "status_code", None) or getattr(e, "code", None)
+    return isinstance(status_code, int) and (status_code >= 500 or status_code == 429)
+
+
+class PresentationJobQueue:
+    """
+    Durable queue of async presentation generations.
+
+    Jobs are rows of AsyncPresentationGenerationTaskModel holding the
+    generation request. A worker claims a pending job by setting a lease on
+    it with a conditional update, so any number of API and worker processes
+    can poll the same table, and keeps the lease alive with heartbeats while
+    the job runs. Jobs whose worker died are claimed again once their lease
+    expires, until they run out of attempts. Cancellation is requested on
+    the row and picked up by the heartbeat of the worker running the job.
+    """
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._running: Dict[str, asyncio.Task] = {}
+        self._worker_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.cancelled = 0
+
+    def get_concurrency(self) -> int:
+        concurrency = get_job_worker_concurrency_env()
+        return max(1, int(concurrency)) if concurrency else DEFAULT_CONCURRENCY
+
+    def get_lease_seconds(self) -> int:
+        lease_seconds = get_job_lease_seconds_env()
+        return max(3, int(lease_seconds)) if lease_seconds else DEFAULT_LEASE_SECONDS
+
+    def get_poll_interval(self) -> float:
+        poll_interval = get_job_poll_interval_env()
+        return float(poll_interval) if poll_interval else DEFAULT_POLL_INTERVAL
+
+    def get_max_attempts(self) -> int:
+        max_attempts = get_job_max_attempts_env()
+        return max(1, int(max_attempts)) if max_attempts else DEFAULT_MAX_ATTEMPTS
+
+    async def enqueue(
+        self, request: GeneratePresentationRequest, presentation_id: uuid.UUID
+    ) -> AsyncPresentationGenerationTaskModel:
+        async_status = AsyncPresentationGenerationTaskModel(
+            status=PENDING,
+            message="Queued for generation",
+            data=None,
+            presentation_id=presentation_id,
+            request=request.model_dump(mode="json"),
+        )
+        async with async_session_maker() as sql_session:
+            sql_session.add(async_status)
+            await sql_session.commit()
+        return async_status
+
+    async def cancel(
+        self, task_id: str
+    ) -> Optional[AsyncPresentationGenerationTaskModel]:
+        """
+        Requests cancellation of a job. Jobs that aren't running are cancelled
+        at once, running ones by their worker on its next heartbeat.
+        """
+        async with async_session_maker() as sql_session:
+            async_status = await sql_session.get(
+                AsyncPresentationGenerationTaskModel, task_id
+            )
+            if not async_status or async_status.status != PENDING:
+                return async_status
+
+            async_status.cancel_requested = True
+            if not self._is_leased(async_status):
+                self._set_cancelled(async_status)
+            sql_session.add(async_status)
+            await sql_session.commit()
+
+        # Running in this process, no need to wait for the heartbeat
+        if task_id in self._running:
+            self._running[task_id].cancel()
+        return async_status
+
+    def _is_leased(self, async_status: AsyncPresentationGenerationTaskModel) -> bool:
+        return bool(
+            async_status.worker_id
+            and async_status.lease_expires_at
+            and async_status.lease_expires_at > datetime.now()
+        )
+
+    def _set_cancelled(self, async_status: AsyncPresentationGenerationTaskModel):
+        async_status.status = CANCELLED
+        async_status.message = "Presentation generation cancelled"
+        async_status.lease_expires_at = None
+        async_status.updated_at = datetime.now()
+
+    async def _claim_jobs(self, limit: int) -> List[str]:
+        now = datetime.now()
+        async with async_session_maker() as sql_session:
+            candidates = await sql_session.scalars(
+                select(AsyncPresentationGenerationTaskModel.id)
+                .where(
+                    AsyncPresentationGenerationTaskModel.status == PENDING,
+                    AsyncPresentationGenerationTaskModel.request.is_not(None),
+                    or_(
+                        AsyncPresentationGenerationTaskModel.lease_expires_at.is_(None),
+                        AsyncPresentationGenerationTaskModel.lease_expires_at < now,
+                    ),
+                )
+                .order_by(AsyncPresentationGenerationTaskModel.created_at)
+                .limit(limit)
+            )
+
+            claimed = []
+            for task_id in list(candidates):
+                # Only one worker can move the lease of an unleased job
+                result = await sql_session.execute(
+                    update(AsyncPresentationGenerationTaskModel)
+                    .where(
+                        AsyncPresentationGenerationTaskModel.id == task_id,
+                        AsyncPresentationGenerationTaskModel.status == PENDING,
+                        or_(
+                            AsyncPresentationGenerationTaskModel.lease_expires_at.is_(
+                                None
+                            ),
+                            AsyncPresentationGenerationTaskModel.lease_expires_at < now,
+                        ),
+                    )
+                    .values(
+                        worker_id=self.worker_id,
+                        lease_expires_at=now
+                        + timedelta(seconds=self.get_lease_seconds()),
+                    )
+                )
+                await sql_session.commit()
+                if result.rowcount == 1:
+                    claimed.append(task_id)
+            return claimed
+
+    async def _renew_lease(self, task_id: str) -> bool:
+        """Extends the lease of a job, False if it was lost or cancelled"""
+        async with async_session_maker() as sql_session:
+            result = await sql_session.execute(
+                update(AsyncPresentationGenerationTaskModel)
+                .where(
+                    AsyncPresentationGenerationTaskModel.id == task_id,
+                    AsyncPresentationGenerationTaskModel.worker_id == self.worker_id,
+                    or_(
+                        AsyncPresentationGenerationTaskModel.cancel_requested.is_(None),
+                        AsyncPresentationGenerationTaskModel.cancel_requested == False,
+                    ),
+                )
+                .values(
+                    lease_expires_at=datetime.now()
+                    + timedelta(seconds=self.get_lease_seconds())
+                )
+            )
+            await sql_session.commit()
+            return result.rowcount == 1
+
+    async def _heartbeat(self, task_id: str, job: asyncio.Task):
+        while not job.done():
+            await asyncio.sleep(self.get_lease_seconds() / 3)
+            try:
+                if not await self._renew_lease(task_id):
+                    job.cancel()
+                    return
+            except Exception as e:
+                print(f"Error renewing lease of {task_id}: {e}")
+
+    async def _generate(
+        self, async_status: AsyncPresentationGenerationTaskModel, sql_session
+    ):
+        # Imported here, the handler lives with the endpoints that enqueue jobs
+        from api.v1.ppt.endpoints.presentation import generate_presentation_handler
+
+        await generate_presentation_handler(
+            GeneratePresentationRequest(**async_status.request),
+            async_status.presentation_id or uuid.uuid4(),
+            async_status,
+            sql_session,
+            is_last_attempt=async_status.attempts >= self.get_max_attempts(),
+        )
+
+    async def _set_failed(
+        self,
+        async_status: AsyncPresentationGenerationTaskModel,
+        sql_session,
+        e: HTTPException,
+    ):
+        """Records a job that won't be retried, as the handler does"""
+        api_error_model = APIErrorModel.from_exception(e)
+        CONCURRENT_SERVICE.run_task(
+            None,
+            WebhookService.send_webhook,
+            WebhookEvent.PRESENTATION_GENERATION_FAILED,
+            api_error_model.model_dump(mode="json"),
+        )
+
+        async_status.status = ERROR
+        async_status.message = "Presentation generation failed"
+        async_status.error = api_error_model.model_dump(mode="json")
+        async_status.worker_id = None
+        async_status.lease_expires_at = None
+        async_status.updated_at = datetime.now()
+        sql_session.add(async_status)
+        await sql_session.commit()
+        self.failed += 1
+
+    async def _run_job(self, task_id: str):
+        async with async_session_maker() as sql_session:
+            async_status = await sql_session.get(
+                AsyncPresentationGenerationTaskModel, task_id
+            )
+            if not async_status:
+                return
+
+            if async_status.cancel_requested:
+                self._set_cancelled(async_status)
+                sql_session.add(async_status)
+                await sql_session.commit()
+                self.cancelled += 1
+                return
+
+            async_status.attempts = (async_status.attempts or 0) + 1
+            if async_status.attempts > self.get_max_attempts():
+                # Its last worker died while running it
+                await self._set_failed(
+                    async_status,
+                    sql_session,
+                    HTTPException(
+                        status_code=500,
+                        detail="Presentation generation was interrupted too many times",
+                    ),
+                )
+                return
+            sql_session.add(async_status)
+            await sql_session.commit()
+
+            job = asyncio.create_task(self._generate(async_status, sql_session))
+            heartbeat = asyncio.create_task(self._heartbeat(task_id, job))
+            try:
+                await job
+            except asyncio.CancelledError:
+                await sql_session.rollback()
+                await sql_session.refresh(async_status)
+                if async_status.worker_id != self.worker_id:
+                    # Lost the lease, the job belongs to another worker now
+                    return
+                if async_status.cancel_requested:
+                    self._set_cancelled(async_status)
+                    self.cancelled += 1
+                else:
+                    # Shutting down, the interrupted attempt isn't counted
+                    async_status.attempts -= 1
+                    async_status.worker_id = None
+                    async_status.lease_expires_at = None
+                sql_session.add(async_status)
+                await sql_session.commit()
+                return
+            except Exception as e:
+                # The handler records the error itself on the last attempt
+                traceback.print_exc()
+                await sql_session.rollback()
+                await sql_session.refresh(async_status)
+                if not is_transient_error(e):
+                    await self._set_failed(
+                        async_status,
+                        sql_session,
+                        (
+                            e
+                            if isinstance(e, HTTPException)
+                            else HTTPException(
+                                status_code=500,
+                                detail="Presentation generation failed",
+                            )
+                        ),
+                    )
+                    return
+                # Not claimed again before the retry delay
+                async_status.worker_id = None
+                async_status.lease_expires_at = datetime.now() + timedelta(
+                    seconds=RETRY_DELAY_SECONDS * 2 ** (async_status.attempts - 1)
+                )
+                sql_session.add(async_status)
+                await sql_session.commit()
+                self.retried += 1
+                return
+            finally:
+                heartbeat.cancel()
+
+            async_status.worker_id = None
+            async_status.lease_expires_at = None
+            sql_session.add(async_status)
+            await sql_session.commit()
+            if async_status.status == COMPLETED:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    async def run_worker(self, concurrency: Optional[int] = None):
+        """Claims and runs jobs until stopped"""
+        concurrency = concurrency or self.get_concurrency()
+        self._stopping = False
+        print(f"Presentation job worker {self.worker_id} started")
+
+        while not self._stopping:
+            free_slots = concurrency - len(self._running)
+            claimed = []
+            if free_slots > 0:
+                try:
+                    claimed = await self._claim_jobs(free_slots)
+                except Exception as e:
+                    print(f"Error claiming presentation jobs: {e}")
+
+            for task_id in claimed:
+                task = asyncio.create_task(self._run_job(task_id))
+                self._running[task_id] = task
+                task.add_done_callback(
+                    lambda _, task_id=task_id: self._running.pop(task_id, None)
+                )
+
+            if not claimed:
+                await asyncio.sleep(self.get_poll_interval())
+
+    def start(self, concurrency: Optional[int] = None):
+        if self._worker_task is None:
+            self._worker_task = asyncio.create_task(self.run_worker(concurrency))
+
+    async def stop(self):
+        """Stops claiming jobs and releases the running ones to other workers"""
+        self._stopping = True
+        if self._worker_task:
+            self._worker_task.cancel()
+            self._worker_task = None
+        for task in list(self._running.values()):
+            task.cancel()
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "running": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "cancelled": self.cancelled,
+        }
+
+
+PRESENTATION_JOB_QUEUE = PresentationJobQueue()
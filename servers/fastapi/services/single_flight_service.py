@@ -0,0 +1,69 @@
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from utils.get_env import get_disable_single_flight_env
+from utils.parsers import parse_bool_or_none
+
+T = TypeVar("T")
+
+
+class SingleFlightService:
+    """
+    Shares one call between identical concurrent requests.
+
+    Calls are keyed by a namespace and a hash of their canonical arguments.
+    While a call is running, identical requests wait for it instead of
+    making their own, and get its result or exception. Callers get a copy
+    made by the share function of the call, so they can't change each
+    other's results. Nothing is kept once the call finishes; caching
+    results is left to the caches of each service.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.calls: Dict[str, int] = {}
+        self.shared: Dict[str, int] = {}
+
+    def is_enabled(self) -> bool:
+        return not (parse_bool_or_none(get_disable_single_flight_env()) or False)
+
+    def get_key(self, *args) -> str:
+        payload = json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def run(
+        self,
+        namespace: str,
+        key: str,
+        call: Callable[[], Awaitable[T]],
+        share: Optional[Callable[[T], T]] = None,
+    ) -> T:
+        if not self.is_enabled():
+            return await call()
+
+        flight_key = (namespace, key)
+        task = self._in_flight.get(flight_key)
+        if task:
+            self.shared[namespace] = self.shared.get(namespace, 0) + 1
+            result = await asyncio.shield(task)
+            return share(result) if share else result
+
+        self.calls[namespace] = self.calls.get(namespace, 0) + 1
+        task = asyncio.create_task(call())
+        self._in_flight[flight_key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        # Cancelling the first caller doesn't cancel the call of the others
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.is_enabled(),
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "shared": self.shared,
+        }
+
+
+SINGLE_FLIGHT_SERVICE = SingleFlightService()
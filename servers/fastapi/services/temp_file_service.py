@@ -5,11 +5,28 @@ from utils.get_env import get_temp_directory_env
 import uuid
 
 
+def is_process_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
 class TempFileService:
 
     def __init__(self):
-        self.base_dir = get_temp_directory_env() or "/tmp/presenton"
+        # The temp directory is shared by the API, job workers, LibreOffice
+        # profiles and the processed image cache, so each process only owns
+        # a directory of its own and cleans up the ones of exited processes
+        self.processes_dir = os.path.join(
+            get_temp_directory_env() or "/tmp/presenton", "processes"
+        )
+        self.base_dir = os.path.join(self.processes_dir, str(os.getpid()))
         self.cleanup_base_dir()
+        self.cleanup_exited_processes_dirs()
         os.makedirs(self.base_dir, exist_ok=True)
 
     def create_dir_in_dir(self, base_dir: str, dir_name: Optional[str] = None) -> str:
@@ -66,5 +83,12 @@ class TempFileService:
     def cleanup_base_dir(self):
         self.cleanup_temp_dir(self.base_dir)
 
+    def cleanup_exited_processes_dirs(self):
+        if not os.path.isdir(self.processes_dir):
+            return
+        for name in os.listdir(self.processes_dir):
+            if name.isdigit() and not is_process_running(int(name)):
+                self.cleanup_temp_dir(os.path.join(self.processes_dir, name))
+
 
 TEMP_FILE_SERVICE = TempFileService()
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sqlite3
+import time
+from typing import Tuple
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from utils.db_utils import create_database_engine, get_engine_kwargs
+
+N_WRITERS = 5
+WRITE_TRANSACTION_SECONDS = 0.2
+# The driver waits 5 seconds for locks by default, shortened to keep the
+# workload fast. busy_timeout replaces it on tuned connections.
+CONNECT_ARGS = {"check_same_thread": False, "timeout": 0.05}
+
+
+def test_server_databases_get_pool_settings():
+    assert get_engine_kwargs("sqlite+aiosqlite:////tmp/presenton/fastapi.db") == {}
+    assert get_engine_kwargs("postgresql+asyncpg://db/presenton") == {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
+
+    with patch.dict(
+        os.environ,
+        {
+            "DATABASE_POOL_SIZE": "5",
+            "DATABASE_MAX_OVERFLOW": "0",
+            "DATABASE_POOL_PRE_PING": "false",
+        },
+    ):
+        kwargs = get_engine_kwargs("mysql+aiomysql://db/presenton")
+    assert kwargs["pool_size"] == 5
+    assert kwargs["max_overflow"] == 0
+    assert kwargs["pool_pre_ping"] is False
+
+
+def test_sqlite_connections_use_wal(tmp_path):
+    engine = create_database_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", {"check_same_thread": False}
+    )
+
+    async def get_pragmas():
+        async with engine.connect() as conn:
+            return [
+                (await conn.execute(text(f"PRAGMA {pragma}"))).scalar()
+                for pragma in ["journal_mode", "busy_timeout", "synchronous"]
+            ]
+
+    with patch.dict(os.environ, {"SQLITE_BUSY_TIMEOUT": "1000"}):
+        journal_mode, busy_timeout, synchronous = asyncio.run(get_pragmas())
+    assert journal_mode == "wal"
+    assert busy_timeout == 1000
+    # NORMAL
+    assert synchronous == 1
+
+
+def run_overlapping_writes(engine, database_path) -> Tuple[int, int, int]:
+    """
+    Generations that keep their write transaction open while awaiting
+    something else, next to an export holding a read transaction on the
+    same file. Returns slides written, writes that failed with database is
+    locked and the slides the export saw.
+    """
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    presentation = PresentationModel(
+        content="Prompt", n_slides=N_WRITERS, language="English"
+    )
+
+    async def write_slide(index: int) -> bool:
+        try:
+            async with session_maker() as sql_session:
+                sql_session.add(
+                    SlideModel(
+                        presentation=presentation.id,
+                        layout_group="general",
+                        layout="general:basic-info-slide",
+                        index=index,
+                        content={"title": f"Slide {index}"},
+                    )
+                )
+                await sql_session.flush()
+                await asyncio.sleep(WRITE_TRANSACTION_SECONDS)
+                await sql_session.commit()
+            return True
+        except OperationalError as e:
+            assert "database is locked" in str(e)
+            return False
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[PresentationModel.__table__, SlideModel.__table__],
+                )
+            )
+        async with session_maker() as sql_session:
+            sql_session.add(presentation)
+            await sql_session.commit()
+
+        reader = sqlite3.connect(database_path, isolation_level=None)
+        try:
+            reader.execute("BEGIN")
+            reader.execute("SELECT count(*) FROM slides").fetchone()
+            results = await asyncio.gather(
+                *[write_slide(index) for index in range(N_WRITERS)]
+            )
+            (seen_by_reader,) = reader.execute("SELECT count(*) FROM slides").fetchone()
+        finally:
+            reader.close()
+
+        await engine.dispose()
+        with sqlite3.connect(database_path) as conn:
+            (written,) = conn.execute("SELECT count(*) FROM slides").fetchone()
+        return written, results.count(False), seen_by_reader
+
+    return asyncio.run(run())
+
+
+def test_overlapping_writes_lock_the_database_without_pragmas(tmp_path):
+    database_path = tmp_path / "test.db"
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", connect_args=CONNECT_ARGS
+    )
+
+    written, locked, _ = run_overlapping_writes(engine, database_path)
+    assert locked > 0
+    assert written == N_WRITERS - locked
+
+
+def test_overlapping_writes_wait_for_each_other_with_wal(tmp_path):
+    database_path = tmp_path / "test.db"
+    engine = create_database_engine(
+        f"sqlite+aiosqlite:///{database_path}", CONNECT_ARGS
+    )
+
+    started_at = time.perf_counter()
+    written, locked, seen_by_reader = run_overlapping_writes(engine, database_path)
+    elapsed = time.perf_counter() - started_at
+
+    assert locked == 0
+    assert written == N_WRITERS
+    # Writers committed while the export kept reading its own snapshot
+    assert seen_by_reader == 0
+    # Write transactions run one after the other, not much longer than that
+    assert elapsed < N_WRITERS * WRITE_TRANSACTION_SECONDS + 5
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services.docling_service import DoclingService
+
+
+def initialize_worker():
+    pass
+
+
+def parse_to_markdown(file_path: str) -> str:
+    # Paths of these tests are the seconds the parse takes
+    time.sleep(float(file_path))
+    return f"Parsed in {file_path}s"
+
+
+def run_with_workers(workers: int, run):
+    service = DoclingService()
+
+    async def run_and_shutdown():
+        try:
+            await service.initialize()
+            return await run(service)
+        finally:
+            service.shutdown()
+
+    with patch.dict(
+        os.environ,
+        {"DOCUMENT_PARSER_WORKERS": str(workers), "DOCUMENT_PARSE_TIMEOUT": "1"},
+    ), patch("services.docling_service._initialize_worker", initialize_worker), patch(
+        "services.docling_service._parse_to_markdown", parse_to_markdown
+    ):
+        return asyncio.run(run_and_shutdown())
+
+
+def test_time_waiting_for_a_worker_is_not_part_of_the_timeout():
+    async def run(service):
+        return await asyncio.gather(
+            *[service.parse_to_markdown_async("0.6") for _ in range(3)]
+        )
+
+    assert run_with_workers(1, run) == ["Parsed in 0.6s"] * 3
+
+
+def test_stuck_parses_only_terminate_their_own_worker():
+    async def run(service):
+        stuck, parsed = await asyncio.gather(
+            service.parse_to_markdown_async("30"),
+            service.parse_to_markdown_async("0.8"),
+            return_exceptions=True,
+        )
+        assert isinstance(stuck, asyncio.TimeoutError)
+        assert parsed == "Parsed in 0.8s"
+        assert service.is_ready
+
+        # The stuck worker was replaced
+        return await asyncio.gather(
+            *[service.parse_to_markdown_async("0.1") for _ in range(2)]
+        )
+
+    started_at = time.monotonic()
+    assert run_with_workers(2, run) == ["Parsed in 0.1s"] * 2
+    assert time.monotonic() - started_at < 20
+
+
+def test_parses_that_take_too_long_raise():
+    async def run(service):
+        with pytest.raises(asyncio.TimeoutError):
+            await service.parse_to_markdown_async("30")
+        return await service.parse_to_markdown_async("0")
+
+    assert run_with_workers(1, run) == "Parsed in 0s"
@@ -0,0 +1,105 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from services.docling_service import DOCLING_SERVICE
+from services.document_cache_service import DOCUMENT_CACHE_SERVICE, DocumentCacheService
+from services.documents_loader import DocumentsLoader
+
+
+@pytest.fixture(autouse=True)
+def document_cache_dir(tmp_path):
+    with patch.object(DOCUMENT_CACHE_SERVICE, "_cache_dir", str(tmp_path / "cache")):
+        yield
+
+
+def create_files(tmp_path, names):
+    file_paths = []
+    for name in names:
+        file_path = tmp_path / name
+        file_path.write_text(name)
+        file_paths.append(str(file_path))
+    return file_paths
+
+
+def test_documents_are_parsed_concurrently_in_order(tmp_path):
+    file_paths = create_files(tmp_path, ["slow.docx", "notes.txt", "fast.pptx"])
+    running = []
+    max_running = 0
+
+    async def parse_to_markdown_async(file_path):
+        nonlocal max_running
+        running.append(file_path)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0.05 if "slow" in file_path else 0.01)
+        running.remove(file_path)
+        return f"parsed {file_path.split('/')[-1]}"
+
+    loader = DocumentsLoader(file_paths)
+    with patch.object(
+        DOCLING_SERVICE, "parse_to_markdown_async", parse_to_markdown_async
+    ):
+        asyncio.run(loader.load_documents())
+
+    assert loader.documents == ["parsed slow.docx", "notes.txt", "parsed fast.pptx"]
+    assert max_running == 2
+
+
+def test_parse_timeout_raises_http_exception(tmp_path):
+    file_paths = create_files(tmp_path, ["large.docx"])
+
+    async def parse_to_markdown_async(_):
+        raise asyncio.TimeoutError()
+
+    loader = DocumentsLoader(file_paths)
+    with patch.object(
+        DOCLING_SERVICE, "parse_to_markdown_async", parse_to_markdown_async
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(loader.load_documents())
+
+    assert exc_info.value.status_code == 504
+
+
+def test_parsed_documents_are_cached_by_content(tmp_path):
+    file_paths = create_files(tmp_path, ["deck.pptx"])
+    copy_path = tmp_path / "copy.pptx"
+    copy_path.write_text("deck.pptx")
+    calls = []
+
+    async def parse_to_markdown_async(file_path):
+        calls.append(file_path)
+        return "parsed deck"
+
+    with patch.object(
+        DOCLING_SERVICE, "parse_to_markdown_async", parse_to_markdown_async
+    ):
+        for each in [file_paths, file_paths, [str(copy_path)]]:
+            loader = DocumentsLoader(each)
+            asyncio.run(loader.load_documents())
+            assert loader.documents == ["parsed deck"]
+
+    assert calls == file_paths
+
+
+def test_document_cache_evicts_least_recently_used(tmp_path):
+    cache = DocumentCacheService(str(tmp_path / "cache"))
+
+    async def run():
+        for key in ["first", "second"]:
+            await cache.set_markdown(key, "x" * 400 * 1024)
+            await asyncio.sleep(0.01)
+        assert await cache.get_markdown("first") is not None
+        await asyncio.sleep(0.01)
+        await cache.set_markdown("third", "x" * 400 * 1024)
+        return [
+            await cache.get_markdown(key) is not None
+            for key in ["first", "second", "third"]
+        ]
+
+    with patch.dict(os.environ, {"DOCUMENT_CACHE_MAX_SIZE_MB": "1"}):
+        assert asyncio.run(run()) == [True, False, True]
+    assert cache.evictions == 1
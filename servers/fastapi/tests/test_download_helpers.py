@@ -0,0 +1,77 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from aiohttp import web
+
+from services.http_session_service import HTTP_SESSION_SERVICE
+from utils.download_helpers import download_files
+
+
+async def start_server(handler):
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_downloads_are_limited_per_host_and_retried(tmp_path):
+    running = 0
+    max_running = 0
+    failures = {"flaky.png": 1}
+
+    async def handler(request):
+        nonlocal running, max_running
+        name = request.match_info["name"]
+        if failures.get(name):
+            failures[name] -= 1
+            return web.Response(status=503, headers={"Retry-After": "0"})
+
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return web.Response(body=name.encode(), content_type="image/png")
+
+    async def run():
+        runner, base_url = await start_server(handler)
+        try:
+            urls = [f"{base_url}/image-{i}.png" for i in range(10)]
+            urls += [f"{base_url}/flaky.png", f"{base_url}/no-extension"]
+            return await download_files(urls, str(tmp_path))
+        finally:
+            await HTTP_SESSION_SERVICE.close()
+            await runner.cleanup()
+
+    with patch.dict(os.environ, {"HTTP_MAX_CONNECTIONS_PER_HOST": "2"}):
+        results = asyncio.run(run())
+
+    assert all(results)
+    assert max_running == 2
+    with open(results[10], "rb") as f:
+        assert f.read() == b"flaky.png"
+    assert results[11].endswith(".png")
+
+
+def test_client_errors_are_not_retried(tmp_path):
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        return web.Response(status=404)
+
+    async def run():
+        runner, base_url = await start_server(handler)
+        try:
+            return await download_files([f"{base_url}/missing.png"], str(tmp_path))
+        finally:
+            await HTTP_SESSION_SERVICE.close()
+            await runner.cleanup()
+
+    assert asyncio.run(run()) == [None]
+    assert calls == 1
@@ -0,0 +1,237 @@
+import asyncio
+import os
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.sql.key_value import KeyValueSqlModel
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from services.export_cache_service import ExportCacheService
+
+
+def create_presentation_and_slides():
+    presentation = PresentationModel(content="Prompt", n_slides=2, language="English")
+    slides = [
+        SlideModel(
+            presentation=presentation.id,
+            layout_group="general",
+            layout=f"layout-{index}",
+            index=index,
+            content={"title": f"Slide {index}"},
+            html_content=None,
+            properties=None,
+        )
+        for index in range(2)
+    ]
+    return presentation, slides
+
+
+@pytest.fixture
+def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[
+                        PresentationModel.__table__,
+                        SlideModel.__table__,
+                        KeyValueSqlModel.__table__,
+                        PresentationLayoutCodeModel.__table__,
+                    ],
+                )
+            )
+
+    asyncio.run(create_tables())
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    with patch("services.export_cache_service.async_session_maker", session_maker):
+        yield session_maker
+
+
+def test_content_version_ignores_slide_ids_and_tracks_content():
+    presentation, slides = create_presentation_and_slides()
+    version = presentation.get_content_version(slides)
+
+    recreated_slides = [
+        each.get_new_slide(presentation.id) for each in reversed(slides)
+    ]
+    assert presentation.get_content_version(recreated_slides) == version
+
+    slides[1].content = {"title": "Edited"}
+    assert presentation.get_content_version(slides) != version
+
+    presentation.title = "Renamed"
+    assert presentation.get_content_version(recreated_slides) != version
+
+
+def test_export_is_reused_until_presentation_changes(session_maker, tmp_path):
+    presentation, slides = create_presentation_and_slides()
+
+    async def run():
+        async with session_maker() as sql_session:
+            sql_session.add(presentation)
+            sql_session.add_all(slides)
+            await sql_session.commit()
+
+        service = ExportCacheService()
+        exports = []
+
+        async def export():
+            export_path = str(tmp_path / "deck.pptx")
+            with open(export_path, "w") as f:
+                f.write(f"export {len(exports)}")
+            exports.append(export_path)
+            return export_path
+
+        first = await service.get_or_export(presentation.id, "pptx", export)
+        second = await service.get_or_export(presentation.id, "pptx", export)
+        assert first == second
+        assert len(exports) == 1
+
+        # Other formats are cached separately
+        await service.get_or_export(presentation.id, "pdf", export)
+        assert len(exports) == 2
+
+        async with session_maker() as sql_session:
+            slide = await sql_session.scalar(
+                select(SlideModel).where(SlideModel.index == 0)
+            )
+            slide.content = {"title": "Edited"}
+            sql_session.add(slide)
+            await sql_session.commit()
+
+        await service.get_or_export(presentation.id, "pptx", export)
+        assert len(exports) == 3
+
+        # Overwritten by the export of another presentation with the same title
+        with open(first, "w") as f:
+            f.write("another presentation")
+        await service.get_or_export(presentation.id, "pptx", export)
+        assert len(exports) == 4
+
+        return service
+
+    service = asyncio.run(run())
+    assert service.hits == 1
+    assert service.misses == 4
+
+
+def test_exports_of_custom_templates_are_redone_after_layout_edits(
+    session_maker, tmp_path
+):
+    presentation, slides = create_presentation_and_slides()
+    template_id = uuid.uuid4()
+    for slide in slides:
+        slide.layout_group = f"custom-{template_id}"
+    layout_code = PresentationLayoutCodeModel(
+        presentation=template_id,
+        layout_id="layout-0",
+        layout_name="Title",
+        layout_code="const Layout = () => <h1>Title</h1>",
+    )
+    other_layout_code = PresentationLayoutCodeModel(
+        presentation=uuid.uuid4(),
+        layout_id="layout-0",
+        layout_name="Title",
+        layout_code="const Layout = () => <h1>Title</h1>",
+    )
+
+    async def run():
+        async with session_maker() as sql_session:
+            sql_session.add(presentation)
+            sql_session.add_all(slides + [layout_code, other_layout_code])
+            await sql_session.commit()
+
+        service = ExportCacheService()
+        exports = []
+
+        async def export():
+            export_path = str(tmp_path / f"deck-{len(exports)}.pptx")
+            with open(export_path, "w") as f:
+                f.write("export")
+            exports.append(export_path)
+            return export_path
+
+        async def edit_layout_code(layout_code_id):
+            async with session_maker() as sql_session:
+                each = await sql_session.get(
+                    PresentationLayoutCodeModel, layout_code_id
+                )
+                each.layout_code = "const Layout = () => <h2>Title</h2>"
+                sql_session.add(each)
+                await sql_session.commit()
+
+        await service.get_or_export(presentation.id, "pptx", export)
+        # Layouts of other templates don't matter
+        await edit_layout_code(other_layout_code.id)
+        await service.get_or_export(presentation.id, "pptx", export)
+        assert len(exports) == 1
+
+        await edit_layout_code(layout_code.id)
+        await service.get_or_export(presentation.id, "pptx", export)
+        assert len(exports) == 2
+
+    asyncio.run(run())
+
+
+def test_concurrent_exports_of_the_same_version_are_shared(session_maker, tmp_path):
+    presentation, slides = create_presentation_and_slides()
+
+    async def run():
+        async with session_maker() as sql_session:
+            sql_session.add(presentation)
+            sql_session.add_all(slides)
+            await sql_session.commit()
+
+        service = ExportCacheService()
+        calls = []
+
+        async def export():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            export_path = str(tmp_path / "deck.pptx")
+            with open(export_path, "w") as f:
+                f.write("export")
+            return export_path
+
+        paths = await asyncio.gather(
+            *[service.get_or_export(presentation.id, "pptx", export) for _ in range(5)]
+        )
+        return calls, paths
+
+    calls, paths = asyncio.run(run())
+    assert len(calls) == 1
+    assert len(set(paths)) == 1
+
+
+def test_unknown_presentations_and_disabled_cache_always_export(session_maker):
+    service = ExportCacheService()
+    calls = []
+
+    async def export():
+        calls.append(1)
+        return "https://blobs.example.com/deck.pptx"
+
+    asyncio.run(service.get_or_export(uuid.uuid4(), "pptx", export))
+    asyncio.run(service.get_or_export(uuid.uuid4(), "pptx", export))
+    assert len(calls) == 2
+
+    presentation, slides = create_presentation_and_slides()
+
+    async def run():
+        async with session_maker() as sql_session:
+            sql_session.add(presentation)
+            await sql_session.commit()
+        with patch.dict(os.environ, {"DISABLE_EXPORT_CACHE": "true"}):
+            await service.get_or_export(presentation.id, "pptx", export)
+            await service.get_or_export(presentation.id, "pptx", export)
+
+    asyncio.run(run())
+    assert len(calls) == 4
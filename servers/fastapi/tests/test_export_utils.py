@@ -0,0 +1,115 @@
+import asyncio
+import io
+import os
+import uuid
+import zipfile
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.ppt.endpoints.presentation import PRESENTATION_ROUTER
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+from services.pptx_presentation_creator import PptxPresentationCreator
+from services.temp_file_service import TEMP_FILE_SERVICE
+from utils import export_utils
+from utils.export_utils import create_pptx, create_pptx_stream, export_presentation
+
+PPTX_MODEL = PptxPresentationModel(
+    name="Quarterly review",
+    slides=[
+        PptxSlideModel(
+            shapes=[
+                PptxAutoShapeBoxModel(
+                    type=MSO_AUTO_SHAPE_TYPE.RECTANGLE,
+                    position=PptxPositionModel(left=20, top=20, width=100, height=100),
+                )
+            ]
+        )
+    ],
+)
+
+
+@pytest.fixture
+def temp_base_dir(tmp_path):
+    temp_base_dir = tmp_path / "temp"
+    temp_base_dir.mkdir()
+    with patch.object(TEMP_FILE_SERVICE, "base_dir", str(temp_base_dir)):
+        yield temp_base_dir
+
+
+def test_pptx_is_created_in_memory_and_temp_dir_is_removed(temp_base_dir):
+    stream = asyncio.run(create_pptx_stream(PPTX_MODEL.model_copy(deep=True)))
+
+    with zipfile.ZipFile(stream) as pptx_zip:
+        assert "ppt/slides/slide1.xml" in pptx_zip.namelist()
+    assert os.listdir(temp_base_dir) == []
+
+
+def test_temp_dir_is_removed_when_export_fails(temp_base_dir, tmp_path):
+    with patch.object(
+        PptxPresentationCreator, "create_ppt", AsyncMock(side_effect=RuntimeError)
+    ):
+        with pytest.raises(RuntimeError):
+            asyncio.run(create_pptx(PPTX_MODEL, str(tmp_path / "deck.pptx")))
+
+    assert os.listdir(temp_base_dir) == []
+    assert not os.path.exists(tmp_path / "deck.pptx")
+
+
+def test_pptx_export_is_uploaded_to_blob_storage(temp_base_dir, tmp_path):
+    blob_storage = MagicMock(is_enabled=True)
+    uploaded = {}
+
+    def upload_stream(stream, file_name):
+        uploaded["data"] = stream.read()
+        uploaded["file_name"] = file_name
+        return f"https://blobs.example.com/exports/{file_name}"
+
+    blob_storage.upload_stream.side_effect = upload_stream
+    exports_dir = tmp_path / "exports"
+    exports_dir.mkdir()
+
+    with patch.dict(os.environ, {"EXPORT_TO_BLOB_STORAGE": "true"}), patch.object(
+        export_utils, "get_blob_storage_service", return_value=blob_storage
+    ), patch.object(
+        export_utils, "get_pptx_model", AsyncMock(return_value=PPTX_MODEL)
+    ), patch.object(
+        export_utils, "get_exports_directory", return_value=str(exports_dir)
+    ):
+        presentation_and_path = asyncio.run(
+            export_presentation(uuid.uuid4(), "Quarterly review", "pptx")
+        )
+
+    assert presentation_and_path.path == (
+        "https://blobs.example.com/exports/Quarterly review.pptx"
+    )
+    assert zipfile.is_zipfile(io.BytesIO(uploaded["data"]))
+    assert os.listdir(exports_dir) == []
+    assert os.listdir(temp_base_dir) == []
+
+
+def test_pptx_is_streamed_in_the_response(temp_base_dir):
+    app = FastAPI()
+    app.include_router(PRESENTATION_ROUTER)
+    client = TestClient(app)
+
+    response = client.post(
+        "/presentation/export/pptx/stream", json=PPTX_MODEL.model_dump(mode="json")
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == (
+        "attachment; filename*=UTF-8''Quarterly%20review.pptx"
+    )
+    assert int(response.headers["content-length"]) == len(response.content)
+    with zipfile.ZipFile(io.BytesIO(response.content)) as pptx_zip:
+        assert "ppt/slides/slide1.xml" in pptx_zip.namelist()
+    assert os.listdir(temp_base_dir) == []
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import os
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import SQLModel, select
+
+from models.sql.key_value import KeyValueSqlModel
+from services.font_availability_service import FontAvailabilityService
+from utils.db_utils import create_database_engine
+
+
+def create_service(fetch_results: dict, calls: list):
+    service = FontAvailabilityService()
+
+    async def fetch_availability(session, semaphore, font_name):
+        calls.append(font_name)
+        return fetch_results.get(font_name)
+
+    async def set_cached(results):
+        for font_name, available in results.items():
+            service._memory_cache[service._get_key(font_name)] = {
+                "available": available,
+                "checked_at": 1000.0,
+            }
+
+    async def get_cached(font_names):
+        return {
+            font_name: service._memory_cache[service._get_key(font_name)]
+            for font_name in font_names
+            if service._get_key(font_name) in service._memory_cache
+        }
+
+    service._fetch_availability = fetch_availability
+    service._set_cached = set_cached
+    service._get_cached = get_cached
+    return service
+
+
+def test_results_are_cached_until_expired(tmp_path):
+    calls = []
+    service = create_service({"Inter": True, "Custom Sans": False}, calls)
+
+    with patch.dict(
+        os.environ, {"GOOGLE_FONTS_LIST_PATH": str(tmp_path / "missing.json")}
+    ), patch("services.font_availability_service.time.time", return_value=1000.0):
+        first = asyncio.run(service.check_fonts(["Inter", "Custom Sans"]))
+        second = asyncio.run(service.check_fonts(["Custom Sans", "Inter"]))
+
+    assert first == {"Inter": True, "Custom Sans": False}
+    assert second == {"Custom Sans": False, "Inter": True}
+    assert calls == ["Inter", "Custom Sans"]
+
+    # Negative results expire after a day, positive ones are still fresh
+    with patch.dict(
+        os.environ, {"GOOGLE_FONTS_LIST_PATH": str(tmp_path / "missing.json")}
+    ), patch(
+        "services.font_availability_service.time.time",
+        return_value=1000.0 + 2 * 24 * 60 * 60,
+    ):
+        asyncio.run(service.check_fonts(["Inter", "Custom Sans"]))
+    assert calls == ["Inter", "Custom Sans", "Custom Sans"]
+
+
+def test_bundled_fonts_and_offline_mode_skip_network(tmp_path):
+    fonts_list_path = tmp_path / "google_fonts.json"
+    fonts_list_path.write_text(json.dumps({"items": [{"family": "Roboto"}]}))
+    calls = []
+    service = create_service({}, calls)
+
+    with patch.dict(
+        os.environ,
+        {
+            "GOOGLE_FONTS_LIST_PATH": str(fonts_list_path),
+            "GOOGLE_FONTS_OFFLINE": "true",
+        },
+    ):
+        results = asyncio.run(service.check_fonts(["roboto", "Unknown"]))
+
+    assert results == {"roboto": True, "Unknown": False}
+    assert calls == []
+
+
+def test_failed_lookups_are_not_cached(tmp_path):
+    calls = []
+    service = create_service({}, calls)
+
+    with patch.dict(
+        os.environ, {"GOOGLE_FONTS_LIST_PATH": str(tmp_path / "missing.json")}
+    ):
+        assert asyncio.run(service.check_fonts(["Lato"])) == {"Lato": False}
+        asyncio.run(service.check_fonts(["Lato"]))
+
+    assert calls == ["Lato", "Lato"]
+
+
+def test_concurrent_checks_write_one_cache_row_per_font(tmp_path):
+    engine = create_database_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", {"check_same_thread": False}
+    )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn, tables=[KeyValueSqlModel.__table__]
+                )
+            )
+        services = [FontAvailabilityService() for _ in range(5)]
+        async with session_maker() as sql_session:
+            # Written before rows had ids derived from their keys
+            sql_session.add(
+                KeyValueSqlModel(key=services[0]._get_key("Inter"), value={})
+            )
+            await sql_session.commit()
+
+        await asyncio.gather(
+            *[
+                service._set_cached({"Inter": True, "Lato": index % 2 == 0})
+                for index, service in enumerate(services)
+            ]
+        )
+        async with session_maker() as sql_session:
+            rows = list(await sql_session.scalars(select(KeyValueSqlModel)))
+        cached = await FontAvailabilityService()._get_cached(["Inter", "Lato"])
+        await engine.dispose()
+        return rows, cached
+
+    with patch("services.font_availability_service.async_session_maker", session_maker):
+        rows, cached = asyncio.run(run())
+
+    assert sorted(row.key for row in rows) == [
+        "google_font_availability:inter",
+        "google_font_availability:lato",
+    ]
+    assert cached["Inter"]["available"] is True
+    assert cached["Lato"]["available"] in (True, False)
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+from services.icon_finder_service import IconFinderService
+
+
+def test_service_is_not_initialized_on_construction():
+    with patch.object(IconFinderService, "_initialize") as initialize:
+        service = IconFinderService()
+        assert not service.is_ready
+        initialize.assert_not_called()
+
+
+def test_concurrent_searches_are_batched():
+    service = IconFinderService()
+    calls = []
+
+    def query_icons(queries, k):
+        calls.append((queries, k))
+        return [[f"{query}-{i}" for i in range(k)] for query in queries]
+
+    async def run():
+        return await asyncio.gather(
+            service.search_icons("chart", 1),
+            service.search_icons_batch(["user", "globe"], 3),
+        )
+
+    with patch.object(service, "_query_icons", side_effect=query_icons):
+        single, batch = asyncio.run(run())
+
+    assert calls == [(["chart", "user", "globe"], 3)]
+    assert single == ["chart-0"]
+    assert batch == [["user-0", "user-1", "user-2"], ["globe-0", "globe-1", "globe-2"]]
+
+
+def test_searches_after_a_cancelled_flush_are_not_stuck():
+    service = IconFinderService()
+    query_started = threading.Event()
+    release_query = threading.Event()
+
+    def query_icons(queries, k):
+        if queries == ["slow"]:
+            query_started.set()
+            release_query.wait(5)
+        return [[f"{query}-0"] for query in queries]
+
+    async def cancel_flush(query):
+        search = asyncio.create_task(service._search_icons(query, 1))
+        await asyncio.sleep(0)
+        if query == "slow":
+            await asyncio.to_thread(query_started.wait, 5)
+        service._flush_task.cancel()
+        (result,) = await asyncio.wait_for(
+            asyncio.gather(search, return_exceptions=True), timeout=5
+        )
+        assert isinstance(result, asyncio.CancelledError)
+        assert service._flush_task is None
+        assert service._pending_searches == []
+
+    async def run():
+        # Cancelled before the flush starts and while it queries
+        await cancel_flush("chart")
+        await cancel_flush("slow")
+        release_query.set()
+        return await asyncio.wait_for(service._search_icons("user", 1), timeout=5)
+
+    with patch.object(service, "_query_icons", side_effect=query_icons):
+        assert asyncio.run(run()) == ["user-0"]
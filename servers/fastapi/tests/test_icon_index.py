@@ -0,0 +1,62 @@
+import numpy as np
+
+from services.icon_index import NumpyIconIndex, load_icon_documents
+
+
+def get_embedding_function(vectors: dict):
+    def embedding_function(texts):
+        return [vectors[text] for text in texts]
+
+    return embedding_function
+
+
+def test_query_matches_brute_force_cosine_ranking(tmp_path):
+    rng = np.random.default_rng(0)
+    ids = [f"icon-{i}-bold" for i in range(200)]
+    queries = [f"query {i}" for i in range(5)]
+    vectors = {text: rng.standard_normal(16) for text in ids + queries}
+
+    index = NumpyIconIndex(
+        get_embedding_function(vectors),
+        str(tmp_path / "icons_embeddings.npy"),
+        str(tmp_path / "icons_embeddings_ids.json"),
+    )
+    index.build(ids, ids)
+    index.load()
+
+    results = index.query(queries, 5)
+
+    icons = np.array([vectors[each] for each in ids])
+    icons /= np.linalg.norm(icons, axis=1, keepdims=True)
+    for query, result in zip(queries, results):
+        scores = icons @ (vectors[query] / np.linalg.norm(vectors[query]))
+        assert result == [ids[i] for i in np.argsort(-scores)[:5]]
+
+
+def test_query_k_is_capped_by_index_size(tmp_path):
+    vectors = {"a": np.array([1.0, 0.0]), "b": np.array([0.0, 1.0])}
+    vectors["q"] = np.array([0.2, 1.0])
+
+    index = NumpyIconIndex(
+        get_embedding_function(vectors),
+        str(tmp_path / "icons_embeddings.npy"),
+        str(tmp_path / "icons_embeddings_ids.json"),
+    )
+    index.build(["a", "b"], ["a", "b"])
+    index.load()
+
+    assert index.query(["q"], 10) == [["b", "a"]]
+    assert index.query([], 1) == []
+
+
+def test_bundled_icons_are_indexed_by_name_without_icons_json(tmp_path, monkeypatch):
+    icons_directory = tmp_path / "static" / "icons" / "bold"
+    icons_directory.mkdir(parents=True)
+    for name in ["arrow-up-bold.svg", "acorn-bold.svg", "notes.txt"]:
+        (icons_directory / name).write_text("")
+    monkeypatch.chdir(tmp_path)
+
+    documents, ids = load_icon_documents()
+
+    assert ids == ["acorn-bold", "arrow-up-bold"]
+    assert documents == ["acorn-bold acorn", "arrow-up-bold arrow up"]
@@ -0,0 +1,171 @@
+import asyncio
+from datetime import datetime, timedelta
+import os
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.sql.image_asset import ImageAsset
+from models.sql.slide import SlideModel
+from services.database import add_missing_columns, add_missing_indexes
+from services.image_cache_service import ImageCacheService
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn, tables=[ImageAsset.__table__, SlideModel.__table__]
+                )
+            )
+
+    asyncio.run(create_tables())
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    with patch("services.image_cache_service.async_session_maker", session_maker):
+        yield session_maker
+    asyncio.run(engine.dispose())
+
+
+def add_images(session_maker, image_assets):
+    async def run():
+        async with session_maker() as sql_session:
+            sql_session.add_all(image_assets)
+            await sql_session.commit()
+
+    asyncio.run(run())
+
+
+def create_image(tmp_path, name: str) -> str:
+    image_path = str(tmp_path / name)
+    with open(image_path, "wb") as f:
+        f.write(b"image")
+    return image_path
+
+
+def test_cached_images_are_found_by_key(tmp_path, session_maker):
+    service = ImageCacheService()
+    created_at = datetime(2026, 1, 1)
+    add_images(
+        session_maker,
+        [
+            ImageAsset(
+                path=create_image(tmp_path, "old.png"),
+                cache_key="a",
+                size=5,
+                created_at=created_at,
+            ),
+            ImageAsset(
+                path=create_image(tmp_path, "new.png"),
+                cache_key="a",
+                size=5,
+                created_at=created_at + timedelta(minutes=1),
+            ),
+            # Deleted outside of the cache
+            ImageAsset(path=str(tmp_path / "missing.png"), cache_key="b", size=5),
+            ImageAsset(path="https://blob/image.png", cache_key="c"),
+        ],
+    )
+
+    with patch("services.image_cache_service.CONCURRENT_SERVICE") as concurrent:
+        assert asyncio.run(service.get("a")) == str(tmp_path / "new.png")
+        assert asyncio.run(service.get("c")) == "https://blob/image.png"
+        assert asyncio.run(service.get("b")) is None
+        assert asyncio.run(service.get("d")) is None
+
+    assert service.hits == 2
+    assert service.misses == 2
+    # Misses start an eviction pass at most once per interval
+    assert concurrent.run_task.call_count == 1
+
+
+def test_evicted_images_are_only_removed_from_the_index(tmp_path, session_maker):
+    created_at = datetime(2026, 1, 1)
+    image_paths = [create_image(tmp_path, f"{index}.png") for index in range(4)]
+    add_images(
+        session_maker,
+        [
+            ImageAsset(
+                path=image_path,
+                cache_key=f"key-{index}",
+                size=MB // 2,
+                created_at=created_at + timedelta(minutes=index),
+            )
+            for index, image_path in enumerate(image_paths)
+        ]
+        + [
+            ImageAsset(
+                path="https://blob/image.png", cache_key="blob", created_at=created_at
+            ),
+            # A deck still showing the oldest image
+            SlideModel(
+                presentation=uuid.uuid4(),
+                layout_group="general",
+                layout="layout-0",
+                index=0,
+                content={"image": {"__image_url__": image_paths[0]}},
+            ),
+        ],
+    )
+
+    service = ImageCacheService()
+    with patch.dict(os.environ, {"IMAGE_CACHE_MAX_SIZE_MB": "1"}), patch(
+        "services.image_cache_service.EVICTION_BATCH_SIZE", 1
+    ):
+        asyncio.run(service.evict())
+
+    async def get_images():
+        async with session_maker() as sql_session:
+            image_assets = await sql_session.scalars(select(ImageAsset))
+            slide = await sql_session.scalar(select(SlideModel))
+            return {each.path: each.cache_key for each in image_assets}, slide
+
+    images, slide = asyncio.run(get_images())
+    # The two newest images fit in the limit, rows and files are kept
+    assert images == {
+        image_paths[0]: None,
+        image_paths[1]: None,
+        image_paths[2]: "key-2",
+        image_paths[3]: "key-3",
+        "https://blob/image.png": "blob",
+    }
+    assert all(os.path.exists(each) for each in image_paths)
+    assert os.path.exists(slide.content["image"]["__image_url__"])
+    assert service.evictions == 2
+
+    with patch("services.image_cache_service.CONCURRENT_SERVICE"):
+        assert asyncio.run(service.get("key-0")) is None
+        assert asyncio.run(service.get("key-2")) == image_paths[2]
+
+
+def test_cache_columns_are_added_to_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("""
+                CREATE TABLE imageasset (
+                    id VARCHAR PRIMARY KEY,
+                    created_at DATETIME NOT NULL,
+                    is_uploaded BOOLEAN NOT NULL,
+                    path VARCHAR NOT NULL,
+                    extras JSON
+                )
+                """))
+        add_missing_columns(conn, [ImageAsset.__table__])
+        add_missing_indexes(conn, [ImageAsset.__table__])
+
+    columns = {each["name"] for each in inspect(engine).get_columns("imageasset")}
+    assert {"cache_key", "size"} <= columns
+    indexes = {
+        each["name"]: each["column_names"]
+        for each in inspect(engine).get_indexes("imageasset")
+    }
+    assert indexes["ix_imageasset_cache_key"] == ["cache_key"]
@@ -0,0 +1,91 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from PIL import Image, ImageChops
+
+from services.image_processing_service import ImageProcessingService
+from utils.image_utils import apply_picture_transforms
+
+TRANSFORMS = {
+    "width": 120,
+    "height": 80,
+    "clip": True,
+    "border_radius": [10, 10, 10, 10],
+    "object_fit": {"fit": "cover", "focus": [50.0, 50.0]},
+    "circle": False,
+    "invert": False,
+    "opacity": 0.5,
+}
+
+
+def create_image(file_path: str, color):
+    Image.new("RGB", (300, 200), color).save(file_path)
+    return file_path
+
+
+def test_repeated_images_are_processed_once(tmp_path):
+    logo = create_image(str(tmp_path / "logo.png"), (200, 20, 20))
+    logo_copy = create_image(str(tmp_path / "logo_copy.png"), (200, 20, 20))
+    background = create_image(str(tmp_path / "background.png"), (20, 20, 200))
+    jobs = [
+        (logo, TRANSFORMS),
+        (background, TRANSFORMS),
+        (logo_copy, TRANSFORMS),
+        (logo, {**TRANSFORMS, "invert": True}),
+        (str(tmp_path / "missing.png"), TRANSFORMS),
+    ]
+
+    service = ImageProcessingService()
+    with patch.dict(
+        os.environ,
+        {"TEMP_DIRECTORY": str(tmp_path / "temp"), "IMAGE_PROCESSING_WORKERS": "2"},
+    ):
+        try:
+            results = asyncio.run(service.process_images(jobs))
+            asyncio.run(service.process_images(jobs[:1]))
+        finally:
+            service.shutdown()
+
+    assert results[0] == results[2]
+    assert len({results[0], results[1], results[3]}) == 3
+    assert results[4] is None
+    assert service.misses == 3
+    assert service.hits == 2
+
+    expected_path = apply_picture_transforms(
+        logo, TRANSFORMS, str(tmp_path / "expected.png")
+    )
+    with Image.open(results[0]) as processed, Image.open(expected_path) as expected:
+        assert processed.size == (120, 80)
+        assert ImageChops.difference(processed, expected).getbbox() is None
+
+
+def test_images_in_use_are_not_evicted(tmp_path):
+    images = [
+        create_image(str(tmp_path / f"image_{index}.png"), (index * 50, 20, 20))
+        for index in range(3)
+    ]
+
+    service = ImageProcessingService()
+    with patch.dict(
+        os.environ,
+        {"TEMP_DIRECTORY": str(tmp_path / "temp"), "IMAGE_PROCESSING_WORKERS": "1"},
+    ), patch("services.image_processing_service.MAX_CACHED_IMAGES", 1):
+        try:
+            first = asyncio.run(
+                service.process_images([(image, TRANSFORMS) for image in images[:2]])
+            )
+            # Another export while the first one still uses its images
+            second = asyncio.run(service.process_images([(images[2], TRANSFORMS)]))
+            assert all(os.path.exists(each) for each in first + second)
+
+            service.release_images(first + first)
+            assert not any(os.path.exists(each) for each in first)
+            assert os.path.exists(second[0])
+
+            service.release_images(second)
+            assert os.path.exists(second[0])
+            assert service.get_stats()["images_in_use"] == 0
+        finally:
+            service.shutdown()
@@ -0,0 +1,204 @@
+import os
+import time
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from utils.image_utils import (
+    create_circle_image,
+    invert_image,
+    round_image_corners,
+    set_image_opacity,
+)
+
+# The 4K benchmark runs the per pixel legacy invert, which takes a while
+SIZES = [
+    (1280, 720),
+    pytest.param(
+        (3840, 2160),
+        marks=pytest.mark.skipif(
+            not os.getenv("RUN_IMAGE_BENCHMARKS"),
+            reason="Set RUN_IMAGE_BENCHMARKS to benchmark 4K images",
+        ),
+    ),
+]
+
+
+def legacy_round_image_corners(image: Image.Image, radii):
+    w, h = image.size
+    max_radius = min(w // 2, h // 2)
+    clamped_radii = [min(radius, max_radius) for radius in radii]
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    rounded_mask = Image.new("L", image.size, 0)
+    rectangular_mask = Image.new("L", image.size, 255)
+    for i, radius in enumerate(clamped_radii):
+        if radius > 0:
+            circle = Image.new("L", (radius * 2, radius * 2), 0)
+            draw = ImageDraw.Draw(circle)
+            draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+            if i == 0:
+                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+                rectangular_mask.paste(0, (0, 0, radius, radius))
+            elif i == 1:
+                rounded_mask.paste(
+                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
+                )
+                rectangular_mask.paste(0, (w - radius, 0, w, radius))
+            elif i == 2:
+                rounded_mask.paste(
+                    circle.crop((radius, radius, radius * 2, radius * 2)),
+                    (w - radius, h - radius),
+                )
+                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
+            else:
+                rounded_mask.paste(
+                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
+                )
+                rectangular_mask.paste(0, (0, h - radius, radius, h))
+
+    original_alpha = image.getchannel("A")
+    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
+    final_alpha = Image.composite(
+        original_alpha, Image.new("L", image.size, 0), corner_mask
+    )
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(final_alpha)
+    return result
+
+
+def legacy_invert_image(img: Image.Image):
+    new_data = []
+    for r, g, b, a in np.asarray(img).reshape(-1, 4).tolist():
+        if a != 0:
+            new_data.append((255 - r, 255 - g, 255 - b, a))
+        else:
+            new_data.append((0, 0, 0, 0))
+    new_img = Image.new("RGBA", img.size)
+    new_img.putdata(new_data)
+    return new_img
+
+
+def legacy_create_circle_image(image: Image.Image):
+    img = image.convert("RGBA")
+    size = img.size
+    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
+    draw = ImageDraw.Draw(mask)
+    center_x = size[0] // 2
+    center_y = size[1] // 2
+    radius = min(size) // 2
+    draw.ellipse(
+        (
+            center_x - radius,
+            center_y - radius,
+            center_x + radius,
+            center_y + radius,
+        ),
+        fill=(255, 255, 255, 255),
+    )
+    return Image.composite(img, mask, mask)
+
+
+def legacy_set_image_opacity(image: Image.Image, opacity: float):
+    opacity = max(0.0, min(1.0, opacity))
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    new_alpha = image.getchannel("A").point(lambda x: int(x * opacity))
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(new_alpha)
+    return result
+
+
+def create_noise_image(size, seed=0) -> Image.Image:
+    data = np.random.default_rng(seed).integers(
+        0, 256, (size[1], size[0], 4), dtype=np.uint8
+    )
+    # Some fully transparent pixels, which invert treats differently
+    data[::7, ::5, 3] = 0
+    return Image.fromarray(data, "RGBA")
+
+
+def assert_same_pixels(first: Image.Image, second: Image.Image):
+    assert first.mode == second.mode
+    assert first.size == second.size
+    assert np.array_equal(np.asarray(first), np.asarray(second))
+
+
+def measure(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+TRANSFORMS = [
+    (
+        "round_image_corners",
+        legacy_round_image_corners,
+        round_image_corners,
+        ([40, 0, 120, 5],),
+    ),
+    ("invert_image", legacy_invert_image, invert_image, ()),
+    ("create_circle_image", legacy_create_circle_image, create_circle_image, ()),
+    ("set_image_opacity", legacy_set_image_opacity, set_image_opacity, (0.35,)),
+]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_transforms_match_legacy_output_and_throughput(size):
+    image = create_noise_image(size)
+    megapixels = size[0] * size[1] / 1_000_000
+
+    for name, legacy, current, args in TRANSFORMS:
+        assert_same_pixels(current(image, *args), legacy(image, *args))
+
+        legacy_time = measure(legacy, image, *args)
+        current_time = measure(current, image, *args)
+        print(
+            f"{name} {size[0]}x{size[1]}: "
+            f"legacy {megapixels / legacy_time:.1f} MP/s, "
+            f"current {megapixels / current_time:.1f} MP/s"
+        )
+
+
+@pytest.mark.parametrize(
+    "size", [(1, 1), (2, 2), (3, 5), (64, 64), (101, 37), (37, 101), (100, 100)]
+)
+def test_odd_and_tiny_sizes_match_legacy_output(size):
+    image = create_noise_image(size, seed=1)
+
+    for radii in ([0, 0, 0, 0], [1, 2, 3, 4], [1000, 1000, 1000, 1000]):
+        assert_same_pixels(
+            round_image_corners(image, radii),
+            legacy_round_image_corners(image, radii),
+        )
+    assert_same_pixels(create_circle_image(image), legacy_create_circle_image(image))
+    assert_same_pixels(invert_image(image), legacy_invert_image(image))
+    for opacity in (0.0, 0.5, 1.0, 2.0):
+        assert_same_pixels(
+            set_image_opacity(image, opacity),
+            legacy_set_image_opacity(image, opacity),
+        )
+
+
+def test_non_rgba_images_match_legacy_output():
+    image = Image.new("RGB", (90, 60), (10, 200, 30))
+
+    assert_same_pixels(
+        round_image_corners(image, [0, 0, 0, 0]),
+        legacy_round_image_corners(image, [0, 0, 0, 0]),
+    )
+    assert_same_pixels(
+        round_image_corners(image, [20, 20, 20, 20]),
+        legacy_round_image_corners(image, [20, 20, 20, 20]),
+    )
+    assert_same_pixels(set_image_opacity(image, 1), legacy_set_image_opacity(image, 1))
+    assert_same_pixels(create_circle_image(image), legacy_create_circle_image(image))
+
+
+def test_round_image_corners_requires_four_radii():
+    with pytest.raises(ValueError):
+        round_image_corners(Image.new("RGBA", (10, 10)), [1, 2, 3])
@@ -0,0 +1,86 @@
+import asyncio
+import socket
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.v1.ppt.endpoints.pptx_slides import _create_font_alias_config
+from services.libreoffice_service import (
+    LibreOfficeService,
+    LibreOfficeWorker,
+    get_free_port,
+)
+
+
+def test_font_config_is_only_created_when_needed(tmp_path):
+    assert _create_font_alias_config(["Arial"], str(tmp_path)) is None
+
+    fonts_dir = str(tmp_path / "fonts")
+    fonts_conf_path = _create_font_alias_config(["Arial"], str(tmp_path), fonts_dir)
+    with open(fonts_conf_path) as f:
+        assert f"<dir>{fonts_dir}</dir>" in f.read()
+
+
+def test_jobs_with_custom_fontconfig_use_one_off_process(tmp_path):
+    service = LibreOfficeService()
+    service._uno_available = True
+
+    async def run():
+        with patch.object(
+            service, "_convert_with_worker", AsyncMock()
+        ) as convert_with_worker, patch.object(
+            service, "_convert_with_process", AsyncMock()
+        ) as convert_with_process:
+            pdf_path = await service.convert_to_pdf("/uploads/deck.pptx", str(tmp_path))
+            await service.convert_to_pdf(
+                "/uploads/deck.pptx", str(tmp_path), "/tmp/fonts.conf"
+            )
+        return pdf_path, convert_with_worker, convert_with_process
+
+    pdf_path, convert_with_worker, convert_with_process = asyncio.run(run())
+    assert pdf_path == str(tmp_path / "deck.pdf")
+    convert_with_worker.assert_awaited_once_with("/uploads/deck.pptx", pdf_path)
+    convert_with_process.assert_awaited_once_with(
+        "/uploads/deck.pptx", str(tmp_path), "/tmp/fonts.conf"
+    )
+    assert service.conversions == 2
+
+
+def test_worker_is_recycled_after_max_jobs():
+    service = LibreOfficeService()
+    worker = AsyncMock()
+    worker.jobs = 50
+    worker.process = None
+    worker.is_healthy.return_value = False
+
+    asyncio.run(service._prepare_worker(worker))
+
+    worker.stop.assert_awaited()
+    worker.start.assert_awaited_once()
+    assert service.recycles == 1
+
+
+def test_workers_listen_on_a_free_port_on_every_start(tmp_path):
+    port = get_free_port()
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", port))
+
+    worker = LibreOfficeWorker(str(tmp_path / "worker"))
+    process = MagicMock(returncode=None)
+
+    async def run():
+        with patch(
+            "services.libreoffice_service.get_free_port", side_effect=[3001, 3002]
+        ), patch(
+            "asyncio.create_subprocess_exec", AsyncMock(return_value=process)
+        ) as create_subprocess_exec, patch.object(
+            worker, "is_healthy", AsyncMock(return_value=True)
+        ):
+            await worker.start()
+            first_port = worker.port
+            await worker.start()
+        return first_port, create_subprocess_exec
+
+    first_port, create_subprocess_exec = asyncio.run(run())
+    assert (first_port, worker.port) == (3001, 3002)
+    assert any(
+        "port=3002;" in str(arg) for arg in create_subprocess_exec.call_args.args
+    )
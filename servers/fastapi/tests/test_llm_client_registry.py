@@ -0,0 +1,33 @@
+from services.llm_client_registry import LLMClientRegistry
+
+
+def test_same_credentials_reuse_client():
+    registry = LLMClientRegistry()
+    first = registry.get_openai_client("sk-test", "http://localhost:11434/v1")
+    second = registry.get_openai_client("sk-test", "http://localhost:11434/v1")
+
+    assert first is second
+    stats = registry.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert len(stats["clients"]) == 1
+
+
+def test_changed_credentials_replace_client():
+    registry = LLMClientRegistry()
+    first = registry.get_openai_client("sk-old")
+    second = registry.get_openai_client("sk-new")
+
+    assert first is not second
+    stats = registry.get_stats()
+    assert stats["replaced"] == 1
+    assert len(stats["clients"]) == 1
+
+
+def test_different_base_urls_keep_separate_clients():
+    registry = LLMClientRegistry()
+    registry.get_openai_client("sk-test", "http://one/v1")
+    registry.get_openai_client("sk-test", "http://two/v1")
+
+    assert len(registry.get_stats()["clients"]) == 2
+    assert registry.get_stats()["replaced"] == 0
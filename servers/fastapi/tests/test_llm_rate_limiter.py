@@ -0,0 +1,224 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from services.llm_client_registry import LLMClientRegistry
+from services.llm_rate_limiter import (
+    LLMRateLimiter,
+    ProviderRateLimiter,
+    parse_reset_seconds,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("Rate limited")
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = httpx.Response(429, headers=headers)
+
+
+def test_reset_headers_are_parsed():
+    assert parse_reset_seconds("1.5") == 1.5
+    assert parse_reset_seconds("6m0s") == 360
+    assert parse_reset_seconds("20ms") == pytest.approx(0.02)
+    assert parse_reset_seconds("1h2m3.5s") == pytest.approx(3723.5)
+    assert parse_reset_seconds("2000-01-01T00:00:00Z") == 0
+    assert parse_reset_seconds("soon") is None
+    assert parse_reset_seconds(None) is None
+
+
+def test_concurrency_is_limited_per_provider_and_model():
+    limiter = LLMRateLimiter()
+    in_flight = {"a": 0, "b": 0}
+    peaks = {"a": 0, "b": 0}
+
+    async def call(model):
+        in_flight[model] += 1
+        peaks[model] = max(peaks[model], in_flight[model])
+        await asyncio.sleep(0.01)
+        in_flight[model] -= 1
+        return model
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                limiter.run("openai", model, lambda model=model: call(model))
+                for model in ["a", "b"] * 10
+            ]
+        )
+
+    with patch.dict("os.environ", {"LLM_MAX_CONCURRENCY": "2"}):
+        results = asyncio.run(run())
+    assert results == ["a", "b"] * 10
+    assert peaks == {"a": 2, "b": 2}
+
+
+def test_rate_limited_calls_are_retried_with_lower_concurrency():
+    limiter = LLMRateLimiter()
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError(retry_after="0.01")
+        return "done"
+
+    with patch.dict("os.environ", {"LLM_MAX_CONCURRENCY": "8"}):
+        assert asyncio.run(limiter.run("anthropic", "claude", call)) == "done"
+
+    provider_limiter = limiter.get_limiter("anthropic", "claude")
+    assert len(attempts) == 3
+    # Rate limits within the same second lower concurrency once
+    assert provider_limiter.limit == 4
+    assert provider_limiter.rate_limited == 2
+    assert provider_limiter.in_flight == 0
+
+
+def test_calls_fail_once_out_of_retries_and_other_errors_are_not_retried():
+    limiter = LLMRateLimiter()
+    attempts = []
+
+    async def rate_limited():
+        attempts.append(1)
+        raise RateLimitError(retry_after="0")
+
+    async def failing():
+        attempts.append(1)
+        raise ValueError("Invalid request")
+
+    with patch.dict("os.environ", {"LLM_RATE_LIMIT_RETRIES": "2"}):
+        with pytest.raises(RateLimitError):
+            asyncio.run(limiter.run("openai", "gpt", rate_limited))
+        assert len(attempts) == 3
+
+        with pytest.raises(ValueError):
+            asyncio.run(limiter.run("openai", "gpt", failing))
+        assert len(attempts) == 4
+
+
+def test_concurrency_recovers_after_successful_calls():
+    limiter = ProviderRateLimiter(max_concurrency=4, requests_per_minute=None)
+    limiter.on_rate_limited(retry_after=0)
+    assert limiter.limit == 2
+
+    for _ in range(2):
+        limiter.on_success()
+    assert limiter.limit == 3
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.limit == 4
+
+
+def test_requests_wait_for_the_provider_reset():
+    limiter = ProviderRateLimiter(max_concurrency=4, requests_per_minute=None)
+    limiter.on_headers(
+        httpx.Headers(
+            {
+                "x-ratelimit-limit-requests": "600",
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": "100ms",
+            }
+        )
+    )
+    assert limiter.requests_per_minute == 600
+
+    async def run():
+        started_at = time.monotonic()
+        await limiter.acquire()
+        await limiter.release()
+        return time.monotonic() - started_at
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_response_headers_update_the_limiter_of_the_current_call():
+    limiter = LLMRateLimiter()
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200,
+            headers={
+                "anthropic-ratelimit-requests-limit": "50",
+                "anthropic-ratelimit-requests-remaining": "49",
+            },
+        )
+    )
+
+    async def call():
+        async with httpx.AsyncClient(
+            transport=transport, event_hooks={"response": [limiter.on_response]}
+        ) as client:
+            await client.get("https://api.anthropic.com/v1/messages")
+
+    asyncio.run(limiter.run("anthropic", "claude", call))
+    stats = limiter.get_stats()
+    assert stats["limiters"][0]["requests_per_minute"] == 50
+    assert stats["waiting"] == 0
+
+
+def test_streams_are_retried_only_before_the_first_chunk():
+    limiter = LLMRateLimiter()
+    attempts = []
+
+    def get_stream(fail_after):
+        async def stream():
+            attempts.append(1)
+            for index in range(3):
+                if index == fail_after and len(attempts) == 1:
+                    raise RateLimitError(retry_after="0")
+                yield index
+
+        return stream()
+
+    async def collect(fail_after):
+        return [
+            chunk
+            async for chunk in limiter.stream(
+                "openai", "gpt", lambda: get_stream(fail_after)
+            )
+        ]
+
+    assert asyncio.run(collect(fail_after=0)) == [0, 1, 2]
+    assert len(attempts) == 2
+
+    attempts.clear()
+    with pytest.raises(RateLimitError):
+        asyncio.run(collect(fail_after=1))
+    assert len(attempts) == 1
+
+
+def test_transient_provider_errors_are_retried_with_backoff():
+    limiter = LLMRateLimiter()
+    attempts = []
+
+    class ServerError(Exception):
+        status_code = 503
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ServerError()
+        return "done"
+
+    with patch("services.llm_rate_limiter.get_backoff_seconds", return_value=0):
+        assert asyncio.run(limiter.run("openai", "gpt", call)) == "done"
+    assert len(attempts) == 2
+    # Server errors don't lower concurrency
+    assert limiter.get_limiter("openai", "gpt").rate_limited == 0
+
+
+def test_registry_clients_leave_retries_to_the_limiter():
+    registry = LLMClientRegistry()
+    assert registry.get_openai_client("test").max_retries == 0
+    assert registry.get_anthropic_client("test").max_retries == 0
+
+
+def test_image_clients_keep_sdk_retries_and_share_the_connection_pool():
+    registry = LLMClientRegistry()
+    image_client = registry.get_openai_image_client("test")
+    assert image_client.max_retries > 0
+    assert image_client._client is registry.get_openai_client("test")._client
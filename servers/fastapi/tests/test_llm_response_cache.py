@@ -0,0 +1,82 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services.llm_response_cache import LLMResponseCache
+
+
+def get_messages(timestamp: str):
+    return [
+        LLMSystemMessage(content="Generate structured slide"),
+        LLMUserMessage(
+            content=f"## Current Date and Time\n{timestamp}\n\n## Slide Outline\nAI"
+        ),
+    ]
+
+
+def test_cache_key_ignores_prompt_timestamp():
+    cache = LLMResponseCache()
+    first = cache.get_key(
+        "openai", "gpt-4.1", get_messages("2025-01-01 10:00:00"), {}, False
+    )
+    second = cache.get_key(
+        "openai", "gpt-4.1", get_messages("2025-06-30 23:59:59"), {}, False
+    )
+    assert first == second
+
+
+def test_cache_key_keeps_timestamps_of_user_content():
+    cache = LLMResponseCache()
+
+    def get_key(content: str, timestamp: str):
+        messages = [
+            LLMUserMessage(
+                content=f"- User provided content: {content}\n"
+                f"- Current Date and Time: {timestamp}\n"
+            )
+        ]
+        return cache.get_key("openai", "gpt-4.1", messages, {}, False)
+
+    key = get_key("Outage on 2025-01-01 10:00:00", "2025-01-01 10:00:00")
+    assert key == get_key("Outage on 2025-01-01 10:00:00", "2025-06-30 23:59:59")
+    assert key != get_key("Outage on 2025-02-01 10:00:00", "2025-01-01 10:00:00")
+
+
+def test_cache_key_depends_on_model_and_schema():
+    cache = LLMResponseCache()
+    messages = get_messages("2025-01-01 10:00:00")
+    key = cache.get_key("openai", "gpt-4.1", messages, {"type": "object"}, False)
+    assert key != cache.get_key("openai", "gpt-4o", messages, {"type": "object"}, False)
+    assert key != cache.get_key("openai", "gpt-4.1", messages, {}, False)
+
+
+def test_cache_hit_miss_and_lru_eviction(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+
+    async def run():
+        with patch.dict(os.environ, {"LLM_RESPONSE_CACHE_MAX_ENTRIES": "2"}):
+            await cache.set("a", {"title": "A"})
+            await cache.set("b", {"title": "B"})
+            assert await cache.get("a") == {"title": "A"}
+            await cache.set("c", {"title": "C"})
+
+            assert await cache.get("b") is None
+            assert await cache.get("a") == {"title": "A"}
+            assert await cache.get("c") == {"title": "C"}
+
+    asyncio.run(run())
+    assert cache.hits == 3
+    assert cache.misses == 1
+    assert cache.evictions == 1
+
+
+def test_cache_entries_expire(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+
+    async def run():
+        await cache.set("a", {"title": "A"})
+        with patch.dict(os.environ, {"LLM_RESPONSE_CACHE_TTL": "-1"}):
+            assert await cache.get("a") is None
+
+    asyncio.run(run())
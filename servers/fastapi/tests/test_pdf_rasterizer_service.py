@@ -0,0 +1,51 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from PIL import Image
+
+from services.pdf_rasterizer_service import PdfRasterizerService
+
+
+def create_pdf(file_path: str, page_count: int):
+    pages = [
+        Image.new("RGB", (200, 150), (i * 20 % 256, 100, 150))
+        for i in range(page_count)
+    ]
+    pages[0].save(file_path, save_all=True, append_images=pages[1:])
+
+
+def test_pages_are_rendered_in_order_into_output_dir(tmp_path):
+    pdf_path = str(tmp_path / "deck.pdf")
+    create_pdf(pdf_path, 10)
+    output_dir = str(tmp_path / "images" / "deck")
+
+    service = PdfRasterizerService()
+    with patch.dict(
+        os.environ,
+        {
+            "PDF_RASTERIZER_WORKERS": "2",
+            "PDF_PAGE_IMAGE_DPI": "36",
+            "PDF_PAGE_IMAGE_FORMAT": "webp",
+        },
+    ):
+        try:
+            image_paths = asyncio.run(
+                service.render_pages(pdf_path, output_dir, "slide_")
+            )
+        finally:
+            service.shutdown()
+
+    assert image_paths == [
+        os.path.join(output_dir, f"slide_{i}.webp") for i in range(1, 11)
+    ]
+    assert sorted(os.listdir(output_dir)) == sorted(
+        os.path.basename(each) for each in image_paths
+    )
+    with Image.open(image_paths[0]) as image:
+        assert image.format == "WEBP"
+
+
+def test_unknown_image_format_falls_back_to_png():
+    with patch.dict(os.environ, {"PDF_PAGE_IMAGE_FORMAT": "tiff"}):
+        assert PdfRasterizerService().get_image_format() == "png"
@@ -1,14 +1,22 @@
 import asyncio
+import os
+from unittest.mock import patch
+import zipfile
+
+from PIL import Image
+from pptx import Presentation
 from models.pptx_models import (
     PptxAutoShapeBoxModel,
     PptxFillModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
     PptxPositionModel,
     PptxPresentationModel,
     PptxSlideModel,
 )
+from services.image_processing_service import IMAGE_PROCESSING_SERVICE
 from services.pptx_presentation_creator import PptxPresentationCreator
-from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
-
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE, MSO_SHAPE_TYPE
 
 pptx_model = PptxPresentationModel(
     slides=[
@@ -38,3 +46,71 @@ def test_pptx_creator():
     pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
     asyncio.run(pptx_creator.create_ppt())
     pptx_creator.save("debug/test.pptx")
+
+
+def create_picture(path: str, **kwargs) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=20, top=20, width=100, height=60),
+        picture=PptxPictureModel(is_network=False, path=path),
+        **kwargs,
+    )
+
+
+def test_repeated_images_share_one_media_part(tmp_path):
+    logo = Image.new("RGB", (200, 120), (200, 20, 20))
+    logo_paths = []
+    for index in range(5):
+        logo_path = str(tmp_path / f"logo_{index}.png")
+        logo.save(logo_path)
+        logo_paths.append(logo_path)
+    background_path = str(tmp_path / "background.png")
+    Image.new("RGB", (200, 120), (20, 20, 200)).save(background_path)
+
+    model = PptxPresentationModel(
+        shapes=[create_picture(logo_paths[0], clip=False)],
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    create_picture(logo_path, clip=False),
+                    create_picture(background_path, clip=False),
+                ]
+            )
+            for logo_path in logo_paths
+        ],
+    )
+
+    pptx_creator = PptxPresentationCreator(model, str(tmp_path))
+    asyncio.run(pptx_creator.create_ppt())
+    pptx_path = str(tmp_path / "deck.pptx")
+    pptx_creator.save(pptx_path)
+
+    with zipfile.ZipFile(pptx_path) as pptx_zip:
+        media = [name for name in pptx_zip.namelist() if name.startswith("ppt/media/")]
+    assert len(media) == 2
+
+    presentation = Presentation(pptx_path)
+    for slide in presentation.slides:
+        pictures = [
+            shape
+            for shape in slide.shapes
+            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE
+        ]
+        # Two pictures of the slide and the global logo
+        assert len(pictures) == 3
+        assert pictures[0].image.blob == pictures[2].image.blob
+
+
+def test_global_pictures_are_processed_ahead_of_time(tmp_path):
+    logo_path = str(tmp_path / "logo.png")
+    Image.new("RGB", (200, 120), (200, 20, 20)).save(logo_path)
+    logo = create_picture(logo_path, clip=True)
+    model = PptxPresentationModel(
+        shapes=[logo], slides=[PptxSlideModel(shapes=[]) for _ in range(3)]
+    )
+
+    pptx_creator = PptxPresentationCreator(model, str(tmp_path))
+    with patch.dict(os.environ, {"TEMP_DIRECTORY": str(tmp_path / "temp")}):
+        asyncio.run(pptx_creator.create_ppt())
+
+    assert pptx_creator._processed_pictures[id(logo)]
+    assert IMAGE_PROCESSING_SERVICE.get_stats()["images_in_use"] == 0
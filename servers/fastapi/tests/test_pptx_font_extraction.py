@@ -0,0 +1,56 @@
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+from api.v1.ppt.endpoints.pptx_slides import (
+    _extract_slide_xmls,
+    extract_fonts_from_oxml,
+)
+
+
+def create_pptx(file_path: str, fonts):
+    presentation = Presentation()
+    for font in fonts:
+        slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+        run = slide.shapes.title.text_frame.paragraphs[0].add_run()
+        run.text = font
+        run.font.name = font
+    presentation.save(file_path)
+
+
+def test_slide_xmls_are_read_in_slide_order(tmp_path):
+    pptx_path = str(tmp_path / "deck.pptx")
+    fonts = [f"Font {i}" for i in range(12)]
+    create_pptx(pptx_path, fonts)
+
+    slide_xmls = _extract_slide_xmls(pptx_path)
+
+    assert len(slide_xmls) == 12
+    for font, slide_xml in zip(fonts, slide_xmls):
+        assert extract_fonts_from_oxml(slide_xml) == [font]
+    assert not (tmp_path / "pptx_extract").exists()
+
+
+def test_extract_fonts_skips_theme_references():
+    xml_content = (
+        '<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+        '<a:rPr><a:latin typeface="Montserrat SemiBold"/><a:ea typeface="+mn-ea"/>'
+        '<a:cs typeface="Noto Sans"/></a:rPr></p:sld>'
+    )
+
+    assert sorted(extract_fonts_from_oxml(xml_content)) == [
+        "Montserrat SemiBold",
+        "Noto Sans",
+    ]
+    assert extract_fonts_from_oxml("<p:sld") == []
+
+
+def test_missing_slides_raise(tmp_path):
+    pptx_path = str(tmp_path / "empty.pptx")
+    with zipfile.ZipFile(pptx_path, "w") as zip_ref:
+        zip_ref.writestr("ppt/presentation.xml", "<p:presentation/>")
+
+    with pytest.raises(Exception, match="No slides directory found"):
+        _extract_slide_xmls(pptx_path)
@@ -0,0 +1,326 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from enums.webhook_event import WebhookEvent
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from services.database import add_missing_columns
+from services.presentation_job_queue import PresentationJobQueue, is_transient_error
+
+REQUEST = GeneratePresentationRequest(content="Quarterly review", n_slides=3)
+
+
+@pytest.fixture
+def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn, tables=[AsyncPresentationGenerationTaskModel.__table__]
+                )
+            )
+
+    asyncio.run(create_tables())
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    with patch("services.presentation_job_queue.async_session_maker", session_maker):
+        yield session_maker
+
+
+def create_queue(generate) -> PresentationJobQueue:
+    queue = PresentationJobQueue()
+
+    async def fake_generate(async_status, sql_session):
+        await generate(queue, async_status, sql_session)
+
+    queue._generate = fake_generate
+    return queue
+
+
+async def complete(queue, async_status, sql_session):
+    async_status.status = "completed"
+    sql_session.add(async_status)
+    await sql_session.commit()
+
+
+async def get_status(session_maker, task_id) -> AsyncPresentationGenerationTaskModel:
+    async with session_maker() as sql_session:
+        return await sql_session.get(AsyncPresentationGenerationTaskModel, task_id)
+
+
+def test_each_job_is_claimed_by_one_worker(session_maker):
+    async def run():
+        first, second = create_queue(complete), create_queue(complete)
+        tasks = [await first.enqueue(REQUEST, None) for _ in range(6)]
+        claimed = await asyncio.gather(first._claim_jobs(6), second._claim_jobs(6))
+        return tasks, claimed
+
+    tasks, (first_claimed, second_claimed) = asyncio.run(run())
+    assert sorted(first_claimed + second_claimed) == sorted(each.id for each in tasks)
+
+
+def test_claimed_job_runs_to_completion(session_maker):
+    async def run():
+        queue = create_queue(complete)
+        async_status = await queue.enqueue(REQUEST, None)
+        assert await queue._claim_jobs(1) == [async_status.id]
+        # Leased jobs aren't claimed twice
+        assert await queue._claim_jobs(1) == []
+        await queue._run_job(async_status.id)
+        return queue, await get_status(session_maker, async_status.id)
+
+    queue, async_status = asyncio.run(run())
+    assert async_status.status == "completed"
+    assert async_status.attempts == 1
+    assert async_status.lease_expires_at is None
+    assert queue.completed == 1
+
+
+def test_failed_jobs_are_retried_until_the_last_attempt(session_maker):
+    attempts = []
+
+    async def fail(queue, async_status, sql_session):
+        attempts.append(async_status.attempts)
+        if async_status.attempts < queue.get_max_attempts():
+            raise ConnectionError("Provider unavailable")
+        # The handler records the error on the last attempt
+        async_status.status = "error"
+        sql_session.add(async_status)
+        await sql_session.commit()
+
+    async def run():
+        queue = create_queue(fail)
+        async_status = await queue.enqueue(REQUEST, None)
+        for _ in range(3):
+            assert await queue._claim_jobs(1) == [async_status.id]
+            await queue._run_job(async_status.id)
+
+            # Retries wait for their delay before being claimed again
+            assert await queue._claim_jobs(1) == []
+            async with session_maker() as sql_session:
+                row = await sql_session.get(
+                    AsyncPresentationGenerationTaskModel, async_status.id
+                )
+                row.lease_expires_at = datetime.now() - timedelta(seconds=1)
+                sql_session.add(row)
+                await sql_session.commit()
+
+        return queue, await get_status(session_maker, async_status.id)
+
+    with patch.dict("os.environ", {"JOB_MAX_ATTEMPTS": "3"}):
+        queue, async_status = asyncio.run(run())
+    assert attempts == [1, 2, 3]
+    assert async_status.status == "error"
+    assert queue.retried == 2
+    assert queue.failed == 1
+
+
+def test_only_transient_errors_are_retried():
+    def wrapped(original):
+        # Like the llm calls, which wrap provider errors in HTTPException 500
+        try:
+            try:
+                raise original
+            except Exception:
+                raise HTTPException(status_code=500, detail="LLM API error")
+        except HTTPException as e:
+            return e
+
+    assert is_transient_error(wrapped(ConnectionError()))
+    assert is_transient_error(wrapped(asyncio.TimeoutError()))
+    assert is_transient_error(HTTPException(status_code=503))
+    assert is_transient_error(wrapped(HTTPException(status_code=429)))
+    assert not is_transient_error(wrapped(HTTPException(status_code=401)))
+    assert not is_transient_error(HTTPException(status_code=400))
+    assert not is_transient_error(wrapped(ValueError("Invalid JSON")))
+
+
+def test_failed_jobs_are_not_retried_on_errors_that_cant_succeed(session_maker):
+    attempts = []
+
+    async def fail(queue, async_status, sql_session):
+        attempts.append(async_status.attempts)
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+    async def run():
+        queue = create_queue(fail)
+        async_status = await queue.enqueue(REQUEST, None)
+        assert await queue._claim_jobs(1) == [async_status.id]
+        await queue._run_job(async_status.id)
+        return queue, await get_status(session_maker, async_status.id)
+
+    with patch("services.presentation_job_queue.CONCURRENT_SERVICE") as service:
+        queue, async_status = asyncio.run(run())
+
+    assert attempts == [1]
+    assert async_status.status == "error"
+    assert async_status.error["detail"] == "Invalid API key"
+    assert async_status.lease_expires_at is None
+    assert queue.retried == 0
+    assert queue.failed == 1
+    assert service.run_task.call_args.args[2] == (
+        WebhookEvent.PRESENTATION_GENERATION_FAILED
+    )
+
+
+def test_jobs_of_dead_workers_are_claimed_again(session_maker):
+    async def run():
+        queue = create_queue(complete)
+        async_status = await queue.enqueue(REQUEST, None)
+        async with session_maker() as sql_session:
+            row = await sql_session.get(
+                AsyncPresentationGenerationTaskModel, async_status.id
+            )
+            row.worker_id = "dead-worker"
+            row.attempts = 1
+            row.lease_expires_at = datetime.now() - timedelta(seconds=1)
+            sql_session.add(row)
+            await sql_session.commit()
+
+        assert await queue._claim_jobs(1) == [async_status.id]
+        await queue._run_job(async_status.id)
+        return await get_status(session_maker, async_status.id)
+
+    async_status = asyncio.run(run())
+    assert async_status.status == "completed"
+    assert async_status.attempts == 2
+
+
+def test_jobs_interrupted_too_many_times_fail_with_webhook(session_maker):
+    async def run():
+        queue = create_queue(complete)
+        async_status = await queue.enqueue(REQUEST, None)
+        async with session_maker() as sql_session:
+            row = await sql_session.get(
+                AsyncPresentationGenerationTaskModel, async_status.id
+            )
+            row.worker_id = "dead-worker"
+            row.attempts = queue.get_max_attempts()
+            row.lease_expires_at = datetime.now() - timedelta(seconds=1)
+            sql_session.add(row)
+            await sql_session.commit()
+
+        assert await queue._claim_jobs(1) == [async_status.id]
+        await queue._run_job(async_status.id)
+        return await get_status(session_maker, async_status.id)
+
+    with patch("services.presentation_job_queue.CONCURRENT_SERVICE") as service:
+        async_status = asyncio.run(run())
+
+    assert async_status.status == "error"
+    assert service.run_task.call_args.args[2] == (
+        WebhookEvent.PRESENTATION_GENERATION_FAILED
+    )
+
+
+def test_pending_and_running_jobs_can_be_cancelled(session_maker):
+    started = asyncio.Event
+
+    async def run():
+        running = started()
+
+        async def wait_forever(queue, async_status, sql_session):
+            running.set()
+            await asyncio.sleep(60)
+
+        queue = create_queue(wait_forever)
+        pending = await queue.enqueue(REQUEST, None)
+        assert (await queue.cancel(pending.id)).status == "cancelled"
+
+        job = await queue.enqueue(REQUEST, None)
+        queue.start()
+        await asyncio.wait_for(running.wait(), 5)
+        await queue.cancel(job.id)
+        await asyncio.wait_for(
+            asyncio.gather(*queue._running.values(), return_exceptions=True), 5
+        )
+        await queue.stop()
+        return queue, await get_status(session_maker, job.id)
+
+    with patch.dict("os.environ", {"JOB_POLL_INTERVAL": "0.01"}):
+        queue, async_status = asyncio.run(run())
+    assert async_status.status == "cancelled"
+    assert async_status.lease_expires_at is None
+    assert queue.cancelled == 1
+
+
+def test_shutdown_releases_running_jobs(session_maker):
+    async def run():
+        running = asyncio.Event()
+
+        async def wait_forever(queue, async_status, sql_session):
+            running.set()
+            await asyncio.sleep(60)
+
+        queue = create_queue(wait_forever)
+        job = await queue.enqueue(REQUEST, None)
+        queue.start()
+        await asyncio.wait_for(running.wait(), 5)
+        await queue.stop()
+
+        # Another worker takes over at once, without losing an attempt
+        other_queue = create_queue(complete)
+        assert await other_queue._claim_jobs(1) == [job.id]
+        await other_queue._run_job(job.id)
+        return await get_status(session_maker, job.id)
+
+    with patch.dict("os.environ", {"JOB_POLL_INTERVAL": "0.01"}):
+        async_status = asyncio.run(run())
+    assert async_status.status == "completed"
+    assert async_status.attempts == 1
+
+
+def test_queue_columns_are_added_to_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("""
+                CREATE TABLE async_presentation_generation_tasks (
+                    id VARCHAR PRIMARY KEY,
+                    status VARCHAR NOT NULL,
+                    message VARCHAR,
+                    error JSON,
+                    created_at DATETIME NOT NULL,
+                    updated_at DATETIME NOT NULL,
+                    data JSON
+                )
+                """))
+        add_missing_columns(conn, [AsyncPresentationGenerationTaskModel.__table__])
+
+    columns = {
+        each["name"]
+        for each in inspect(engine).get_columns("async_presentation_generation_tasks")
+    }
+    assert {
+        "presentation_id",
+        "request",
+        "attempts",
+        "worker_id",
+        "lease_expires_at",
+        "cancel_requested",
+    } <= columns
+
+
+def test_queue_state_is_not_returned_to_clients():
+    async_status = AsyncPresentationGenerationTaskModel(
+        status="pending", request=REQUEST.model_dump(mode="json"), worker_id="worker"
+    )
+
+    assert set(async_status.model_dump()) == {
+        "id",
+        "status",
+        "message",
+        "error",
+        "created_at",
+        "updated_at",
+        "data",
+    }
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from api.v1.ppt.endpoints.presentation import list_presentations
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.database import add_missing_indexes
+
+
+@pytest.fixture
+def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async def create_presentations():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[PresentationModel.__table__, SlideModel.__table__],
+                )
+            )
+
+        created_at = datetime(2026, 1, 1)
+        async with async_sessionmaker(engine)() as sql_session:
+            for index in range(7):
+                # Pairs of presentations created at the same time
+                presentation = PresentationModel(
+                    content="Prompt",
+                    n_slides=2,
+                    language="English",
+                    title=f"Deck {index}",
+                    outlines={"slides": [{"content": "x" * 1000}]},
+                    created_at=created_at + timedelta(minutes=index // 2),
+                )
+                sql_session.add(presentation)
+                sql_session.add_all(
+                    SlideModel(
+                        presentation=presentation.id,
+                        layout_group="general",
+                        layout=f"layout-{slide_index}",
+                        index=slide_index,
+                        content={"title": f"Deck {index} slide {slide_index}"},
+                        html_content=None,
+                        properties=None,
+                    )
+                    for slide_index in range(2)
+                )
+            # Still generating, without slides
+            sql_session.add(
+                PresentationModel(content="Prompt", n_slides=2, language="English")
+            )
+            await sql_session.commit()
+
+    asyncio.run(create_presentations())
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_presentations_are_listed_newest_first_in_pages(session_maker):
+    async def list_all():
+        pages = []
+        cursor = None
+        while True:
+            async with session_maker() as sql_session:
+                page = await list_presentations(
+                    limit=3, cursor=cursor, sql_session=sql_session
+                )
+            pages.append(page)
+            cursor = page.next_cursor
+            if not cursor:
+                return pages
+
+    pages = asyncio.run(list_all())
+    assert [len(page.presentations) for page in pages] == [3, 3, 1]
+
+    presentations = [each for page in pages for each in page.presentations]
+    assert len({each.id for each in presentations}) == 7
+    keys = [(each.created_at, each.id) for each in presentations]
+    assert keys == sorted(keys, reverse=True)
+
+    # Only the first slide is returned, for the thumbnail
+    assert all(len(each.slides) == 1 for each in presentations)
+    assert all(each.slides[0].index == 0 for each in presentations)
+    # Decks 0 and 1 share created_at, their order is decided by their ids
+    oldest = presentations[-1]
+    assert oldest.title in {"Deck 0", "Deck 1"}
+    assert oldest.slides[0].content == {"title": f"{oldest.title} slide 0"}
+
+
+def test_invalid_cursors_are_rejected(session_maker):
+    async def run():
+        async with session_maker() as sql_session:
+            await list_presentations(
+                limit=3, cursor="not-a-cursor", sql_session=sql_session
+            )
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(run())
+    assert exc_info.value.status_code == 400
+
+
+def test_listing_index_is_added_to_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("""
+                CREATE TABLE presentations (
+                    id VARCHAR PRIMARY KEY,
+                    created_at DATETIME NOT NULL
+                )
+                """))
+        add_missing_indexes(conn, [PresentationModel.__table__])
+
+    indexes = {
+        each["name"]: each["column_names"]
+        for each in inspect(engine).get_indexes("presentations")
+    }
+    assert indexes["ix_presentations_created_at_id"] == ["created_at", "id"]
@@ -0,0 +1,178 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+
+from models.image_prompt import ImagePrompt
+from models.llm_message import LLMUserMessage
+from models.sql.image_asset import ImageAsset
+from services.image_generation_service import ImageGenerationService
+from services.llm_client import LLMClient
+from services.single_flight_service import SingleFlightService
+
+RESPONSE_FORMAT = {"type": "object", "properties": {"title": {"type": "string"}}}
+
+
+def test_identical_concurrent_calls_share_one_call():
+    service = SingleFlightService()
+    calls = []
+
+    async def call(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return {"value": value}
+
+    async def run():
+        results = await asyncio.gather(
+            *[
+                service.run(
+                    "test",
+                    service.get_key(value),
+                    lambda value=value: call(value),
+                    share=dict,
+                )
+                for value in ["a", "a", "b", "a"]
+            ]
+        )
+        # Finished calls are made again
+        results.append(
+            await service.run("test", service.get_key("a"), lambda: call("a"))
+        )
+        return results
+
+    results = asyncio.run(run())
+    assert calls == ["a", "b", "a"]
+    assert [each["value"] for each in results] == ["a", "a", "b", "a", "a"]
+    # Callers get their own copy of the result
+    assert results[0] is not results[1]
+    assert service.get_stats()["shared"] == {"test": 2}
+
+
+def test_errors_are_shared_and_calls_survive_cancelled_callers():
+    service = SingleFlightService()
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("Provider error")
+
+    async def succeed():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        failures = await asyncio.gather(
+            service.run("test", "fail", fail),
+            service.run("test", "fail", fail),
+            return_exceptions=True,
+        )
+
+        first = asyncio.create_task(service.run("test", "succeed", succeed))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(service.run("test", "succeed", succeed))
+        await asyncio.sleep(0)
+        first.cancel()
+        return failures, await second
+
+    failures, result = asyncio.run(run())
+    assert all(isinstance(each, ValueError) for each in failures)
+    assert result == "done"
+    assert len(calls) == 2
+
+
+def test_single_flight_can_be_disabled():
+    service = SingleFlightService()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*[service.run("test", "key", call) for _ in range(3)])
+
+    with patch.dict(os.environ, {"DISABLE_SINGLE_FLIGHT": "true"}):
+        asyncio.run(run())
+    assert len(calls) == 3
+
+
+def test_identical_structured_generations_share_one_llm_call():
+    with patch.dict(
+        os.environ,
+        {
+            "LLM": "openai",
+            "OPENAI_API_KEY": "test",
+            "LLM_RESPONSE_CACHE": "false",
+        },
+    ):
+        client = LLMClient()
+    calls = []
+
+    async def generate(*args):
+        calls.append(args[1][0].content)
+        await asyncio.sleep(0.01)
+        return {"title": "Quarterly review"}
+
+    async def run(prompts):
+        return await asyncio.gather(
+            *[
+                client.generate_structured(
+                    "gpt-4.1", [LLMUserMessage(content=prompt)], RESPONSE_FORMAT
+                )
+                for prompt in prompts
+            ]
+        )
+
+    with patch.object(client, "_generate_structured_with_provider", generate):
+        results = asyncio.run(run(["Outline", "Outline", "Summary"]))
+
+    assert sorted(calls) == ["Outline", "Summary"]
+    assert results[0] == results[1] == {"title": "Quarterly review"}
+    assert results[0] is not results[1]
+
+
+@pytest.mark.parametrize("stock_provider", [True, False])
+def test_duplicate_image_prompts_generate_one_image(tmp_path, stock_provider):
+    with patch.dict(os.environ, {"DISABLE_IMAGE_CACHE": "true"}):
+        service = ImageGenerationService(str(tmp_path))
+    calls = []
+
+    async def generate(image_prompt, *args):
+        calls.append(image_prompt)
+        await asyncio.sleep(0.01)
+        if stock_provider:
+            return f"https://images.example.com/{len(calls)}.jpg"
+        image_path = tmp_path / f"{len(calls)}.png"
+        image_path.write_bytes(b"image")
+        return str(image_path)
+
+    service.is_image_generation_disabled = False
+    service.image_gen_func = generate
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                service.generate_image(ImagePrompt(prompt=prompt))
+                for prompt in ["Mountains", "Mountains", "City"]
+            ]
+        )
+
+    with (
+        patch.object(
+            service, "is_stock_provider_selected", return_value=stock_provider
+        ),
+        patch.dict(os.environ, {"DISABLE_IMAGE_CACHE": "true"}),
+    ):
+        first, second, third = asyncio.run(run())
+
+    assert [each.split(",")[0] for each in sorted(calls)] == ["City", "Mountains"]
+    if stock_provider:
+        assert first == second
+    else:
+        # Only the first caller tracks the generated image
+        assert isinstance(first, ImageAsset)
+        assert second == first.path
+        assert isinstance(third, ImageAsset)
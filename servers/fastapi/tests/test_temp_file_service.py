@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from services.temp_file_service import TempFileService
+
+
+def test_starting_a_process_keeps_files_of_other_processes(tmp_path):
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+
+    processed_image = tmp_path / "processed_images" / "image.png"
+    processed_image.parent.mkdir()
+    processed_image.write_bytes(b"image")
+    running_dir = tmp_path / "processes" / str(os.getppid()) / "export"
+    running_dir.mkdir(parents=True)
+    exited_dir = tmp_path / "processes" / str(exited.pid) / "export"
+    exited_dir.mkdir(parents=True)
+
+    with patch.dict(os.environ, {"TEMP_DIRECTORY": str(tmp_path)}):
+        service = TempFileService()
+
+    assert service.base_dir == str(tmp_path / "processes" / str(os.getpid()))
+    assert os.path.isdir(service.base_dir)
+    assert processed_image.exists()
+    assert running_dir.exists()
+    assert not exited_dir.parent.exists()
@@ -1,8 +1,26 @@
 import os
-from utils.get_env import get_app_data_directory_env, get_database_url_env
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_database_max_overflow_env,
+    get_database_pool_pre_ping_env,
+    get_database_pool_recycle_env,
+    get_database_pool_size_env,
+    get_database_url_env,
+    get_sqlite_busy_timeout_env,
+)
+from utils.parsers import parse_bool_or_none
 from urllib.parse import urlsplit, urlunsplit, parse_qsl
 import ssl
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+# Seconds before a pooled connection is replaced, below common server timeouts
+DEFAULT_POOL_RECYCLE = 1800
+# Milliseconds a SQLite connection waits for a lock before failing
+DEFAULT_SQLITE_BUSY_TIMEOUT = 30000
+
 
 def get_database_url_and_connect_args() -> tuple[str, dict]:
     database_url = get_database_url_env() or "sqlite:///" + os.path.join(
@@ -46,3 +64,43 @@ def get_database_url_and_connect_args() -> tuple[str, dict]:
         pass
 
     return database_url, connect_args
+
+
+def get_engine_kwargs(database_url: str) -> dict:
+    """Pool settings for server databases, SQLite keeps its default pool"""
+    if "sqlite" in database_url:
+        return {}
+
+    pool_size = get_database_pool_size_env()
+    max_overflow = get_database_max_overflow_env()
+    pool_recycle = get_database_pool_recycle_env()
+    pool_pre_ping = parse_bool_or_none(get_database_pool_pre_ping_env())
+    return {
+        "pool_size": int(pool_size) if pool_size else DEFAULT_POOL_SIZE,
+        "max_overflow": int(max_overflow) if max_overflow else DEFAULT_MAX_OVERFLOW,
+        "pool_recycle": int(pool_recycle) if pool_recycle else DEFAULT_POOL_RECYCLE,
+        "pool_pre_ping": pool_pre_ping if pool_pre_ping is not None else True,
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run while slides are written, and writers wait for
+    # each other for busy_timeout instead of failing with database is locked
+    busy_timeout = get_sqlite_busy_timeout_env()
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(
+        f"PRAGMA busy_timeout={int(busy_timeout or DEFAULT_SQLITE_BUSY_TIMEOUT)}"
+    )
+    # Safe with WAL, only the last transactions can be lost on power loss
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def create_database_engine(database_url: str, connect_args: dict) -> AsyncEngine:
+    engine = create_async_engine(
+        database_url, connect_args=connect_args, **get_engine_kwargs(database_url)
+    )
+    if "sqlite" in database_url:
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    return engine
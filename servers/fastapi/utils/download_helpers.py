@@ -1,6 +1,7 @@
 import asyncio
 import os
 import mimetypes
+import random
 from typing import List, Optional
 from urllib.parse import urlparse
 
@@ -8,54 +9,94 @@ import aiohttp
 
 import uuid
 
+from services.http_session_service import HTTP_SESSION_SERVICE
+from utils.get_env import get_download_max_retries_env
+
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+MAX_RETRY_DELAY_SECONDS = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CHUNK_SIZE = 64 * 1024
+
+
+def get_max_retries() -> int:
+    max_retries = get_download_max_retries_env()
+    return int(max_retries) if max_retries else DEFAULT_MAX_RETRIES
+
+
+def get_retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), MAX_RETRY_DELAY_SECONDS)
+    delay = RETRY_BACKOFF_SECONDS * (2**attempt) * (1 + random.random())
+    return min(delay, MAX_RETRY_DELAY_SECONDS)
+
+
+def get_filename(url: str, response: aiohttp.ClientResponse) -> str:
+    parsed_url = urlparse(url)
+    filename = os.path.basename(parsed_url.path)
+
+    if not filename or "." not in filename:
+        content_disposition = response.headers.get("Content-Disposition", "")
+        if "filename=" in content_disposition:
+            filename = content_disposition.split("filename=")[1].strip("\"'")
+        else:
+            content_type = response.headers.get("Content-Type", "")
+            if content_type:
+                extension = mimetypes.guess_extension(content_type.split(";")[0])
+                if extension:
+                    filename = f"{uuid.uuid4()}{extension}"
+
+    return filename or str(uuid.uuid4())
+
+
+async def save_response(response: aiohttp.ClientResponse, save_path: str):
+    # Disk writes run in a thread so they never block the event loop
+    file = await asyncio.to_thread(open, save_path, "wb")
+    try:
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            await asyncio.to_thread(file.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(file.close)
+        os.remove(save_path)
+        raise
+    await asyncio.to_thread(file.close)
+
 
 async def download_file(
     url: str, save_directory: str, headers: Optional[dict] = None
 ) -> Optional[str]:
-    try:
-        os.makedirs(save_directory, exist_ok=True)
+    max_retries = get_max_retries()
+    for attempt in range(max_retries + 1):
+        retry_after = None
+        try:
+            os.makedirs(save_directory, exist_ok=True)
 
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
-
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
+            async with HTTP_SESSION_SERVICE.limit_host(url):
+                session = HTTP_SESSION_SERVICE.get_session()
+                async with session.get(url, headers=headers) as response:
                     if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
+                        save_path = os.path.join(
+                            save_directory, get_filename(url, response)
                         )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
-
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
-
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
+                        await save_response(response, save_path)
+                        print(f"File downloaded successfully: {save_path}")
+                        return save_path
+
                     print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+                    if response.status not in RETRY_STATUSES:
+                        return None
+                    retry_after = response.headers.get("Retry-After")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error downloading file from {url}: {e}")
+        except Exception as e:
+            print(f"Error downloading file from {url}: {e}")
+            return None
+
+        if attempt < max_retries:
+            await asyncio.sleep(get_retry_delay(attempt, retry_after))
 
-    except Exception as e:
-        print(f"Error downloading file from {url}: {e}")
-        return None
+    return None
 
 
 async def download_files(
@@ -1,55 +1,114 @@
+import asyncio
+import io
 import json
 import os
 import aiohttp
-from typing import Literal
+from typing import IO, Iterator, Literal, Union
 import uuid
 from fastapi import HTTPException
 from pathvalidate import sanitize_filename
 
 from models.pptx_models import PptxPresentationModel
 from models.presentation_and_path import PresentationAndPath
+from services.blob_storage_service import get_blob_storage_service
+from services.export_cache_service import EXPORT_CACHE_SERVICE
 from services.pptx_presentation_creator import PptxPresentationCreator
 from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_exports_directory
-import uuid
+from utils.get_env import get_export_to_blob_storage_env
+from utils.parsers import parse_bool_or_none
+
+# Size of the chunks an exported file is streamed in
+EXPORT_CHUNK_SIZE = 1024 * 1024
+
+
+async def get_pptx_model(presentation_id: uuid.UUID) -> PptxPresentationModel:
+    # Get the converted PPTX model from the Next.js service
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to get PPTX model: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to convert presentation to PPTX model",
+                )
+            pptx_model_data = await response.json()
+
+    return PptxPresentationModel(**pptx_model_data)
+
+
+async def create_pptx(pptx_model: PptxPresentationModel, destination: Union[str, IO]):
+    """
+    Creates the PPTX file of the model at a path or in a writable stream.
+    Downloaded and processed images are removed once the file is written.
+    """
+    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+    try:
+        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+        await pptx_creator.create_ppt()
+        await asyncio.to_thread(pptx_creator.save, destination)
+    finally:
+        await asyncio.to_thread(TEMP_FILE_SERVICE.cleanup_temp_dir, temp_dir)
+
+
+async def create_pptx_stream(pptx_model: PptxPresentationModel) -> io.BytesIO:
+    """Creates the PPTX file in memory, without writing it to disk"""
+    stream = io.BytesIO()
+    await create_pptx(pptx_model, stream)
+    stream.seek(0)
+    return stream
+
+
+def iter_stream_chunks(
+    stream: IO[bytes], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    while chunk := stream.read(chunk_size):
+        yield chunk
+
+
+def get_export_file_name(title: str, extension: str) -> str:
+    return f"{sanitize_filename(title or str(uuid.uuid4()))}.{extension}"
+
+
+def should_export_to_blob_storage() -> bool:
+    return get_blob_storage_service().is_enabled and (
+        parse_bool_or_none(get_export_to_blob_storage_env()) or False
+    )
 
 
 async def export_presentation(
     presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
 ) -> PresentationAndPath:
+    # Unchanged presentations return their last export
+    path = await EXPORT_CACHE_SERVICE.get_or_export(
+        presentation_id,
+        export_as,
+        lambda: export_presentation_file(presentation_id, title, export_as),
+    )
+    return PresentationAndPath(presentation_id=presentation_id, path=path)
+
+
+async def export_presentation_file(
+    presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
+) -> str:
     if export_as == "pptx":
+        pptx_model = await get_pptx_model(presentation_id)
+        file_name = get_export_file_name(title, "pptx")
 
-        # Get the converted PPTX model from the Next.js service
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to get PPTX model: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to convert presentation to PPTX model",
-                    )
-                pptx_model_data = await response.json()
-
-        # Create PPTX file using the converted model
-        pptx_model = PptxPresentationModel(**pptx_model_data)
-        temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
+        # Uploaded from memory, so the file never touches the local disk
+        if should_export_to_blob_storage():
+            stream = await create_pptx_stream(pptx_model)
+            pptx_path = await asyncio.to_thread(
+                get_blob_storage_service().upload_stream, stream, file_name
+            )
+        else:
+            pptx_path = os.path.join(get_exports_directory(), file_name)
+            await create_pptx(pptx_model, pptx_path)
 
-        export_directory = get_exports_directory()
-        pptx_path = os.path.join(
-            export_directory,
-            f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
-        )
-        pptx_creator.save(pptx_path)
-
-        return PresentationAndPath(
-            presentation_id=presentation_id,
-            path=pptx_path,
-        )
+        return pptx_path
     else:
         async with aiohttp.ClientSession() as session:
             async with session.post(
@@ -61,7 +120,4 @@ async def export_presentation(
             ) as response:
                 response_json = await response.json()
 
-        return PresentationAndPath(
-            presentation_id=presentation_id,
-            path=response_json["path"],
-        )
+        return response_json["path"]
@@ -9,6 +9,26 @@ def get_database_url_env():
     return os.getenv("DATABASE_URL")
 
 
+def get_database_pool_size_env():
+    return os.getenv("DATABASE_POOL_SIZE")
+
+
+def get_database_max_overflow_env():
+    return os.getenv("DATABASE_MAX_OVERFLOW")
+
+
+def get_database_pool_pre_ping_env():
+    return os.getenv("DATABASE_POOL_PRE_PING")
+
+
+def get_database_pool_recycle_env():
+    return os.getenv("DATABASE_POOL_RECYCLE")
+
+
+def get_sqlite_busy_timeout_env():
+    return os.getenv("SQLITE_BUSY_TIMEOUT")
+
+
 def get_app_data_directory_env():
     return os.getenv("APP_DATA_DIRECTORY")
 
@@ -126,3 +146,157 @@ def get_azure_storage_connection_string_env():
 
 def get_azure_storage_container_env():
     return os.getenv("AZURE_STORAGE_CONTAINER", "images")
+
+
+# Slide generation
+def get_slide_generation_concurrency_env():
+    return os.getenv("SLIDE_GENERATION_CONCURRENCY")
+
+
+# LLM response cache
+def get_llm_response_cache_env():
+    return os.getenv("LLM_RESPONSE_CACHE")
+
+
+def get_llm_response_cache_ttl_env():
+    return os.getenv("LLM_RESPONSE_CACHE_TTL")
+
+
+def get_llm_response_cache_max_entries_env():
+    return os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES")
+
+
+# Image cache
+def get_disable_image_cache_env():
+    return os.getenv("DISABLE_IMAGE_CACHE")
+
+
+def get_image_cache_max_size_mb_env():
+    return os.getenv("IMAGE_CACHE_MAX_SIZE_MB")
+
+
+# Icon search
+def get_icon_search_backend_env():
+    return os.getenv("ICON_SEARCH_BACKEND")
+
+
+# Document parsing
+def get_document_parser_workers_env():
+    return os.getenv("DOCUMENT_PARSER_WORKERS")
+
+
+def get_document_parse_timeout_env():
+    return os.getenv("DOCUMENT_PARSE_TIMEOUT")
+
+
+# Document cache
+def get_disable_document_cache_env():
+    return os.getenv("DISABLE_DOCUMENT_CACHE")
+
+
+def get_document_cache_max_size_mb_env():
+    return os.getenv("DOCUMENT_CACHE_MAX_SIZE_MB")
+
+
+# PDF rasterization
+def get_pdf_rasterizer_workers_env():
+    return os.getenv("PDF_RASTERIZER_WORKERS")
+
+
+def get_pdf_page_image_dpi_env():
+    return os.getenv("PDF_PAGE_IMAGE_DPI")
+
+
+def get_pdf_page_image_format_env():
+    return os.getenv("PDF_PAGE_IMAGE_FORMAT")
+
+
+# LibreOffice
+def get_libreoffice_workers_env():
+    return os.getenv("LIBREOFFICE_WORKERS")
+
+
+def get_libreoffice_max_jobs_per_worker_env():
+    return os.getenv("LIBREOFFICE_MAX_JOBS_PER_WORKER")
+
+
+def get_libreoffice_uno_python_env():
+    return os.getenv("LIBREOFFICE_UNO_PYTHON")
+
+
+# Google Fonts availability
+def get_google_fonts_cache_ttl_env():
+    return os.getenv("GOOGLE_FONTS_CACHE_TTL")
+
+
+def get_google_fonts_concurrency_env():
+    return os.getenv("GOOGLE_FONTS_CONCURRENCY")
+
+
+def get_google_fonts_list_path_env():
+    return os.getenv("GOOGLE_FONTS_LIST_PATH")
+
+
+def get_google_fonts_offline_env():
+    return os.getenv("GOOGLE_FONTS_OFFLINE")
+
+
+# Downloads
+def get_http_max_connections_per_host_env():
+    return os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST")
+
+
+def get_download_max_retries_env():
+    return os.getenv("DOWNLOAD_MAX_RETRIES")
+
+
+# Image processing
+def get_image_processing_workers_env():
+    return os.getenv("IMAGE_PROCESSING_WORKERS")
+
+
+# Exports
+def get_export_to_blob_storage_env():
+    return os.getenv("EXPORT_TO_BLOB_STORAGE")
+
+
+def get_disable_export_cache_env():
+    return os.getenv("DISABLE_EXPORT_CACHE")
+
+
+# Presentation generation jobs
+def get_job_worker_concurrency_env():
+    return os.getenv("JOB_WORKER_CONCURRENCY")
+
+
+def get_job_lease_seconds_env():
+    return os.getenv("JOB_LEASE_SECONDS")
+
+
+def get_job_poll_interval_env():
+    return os.getenv("JOB_POLL_INTERVAL")
+
+
+def get_job_max_attempts_env():
+    return os.getenv("JOB_MAX_ATTEMPTS")
+
+
+def get_disable_api_job_worker_env():
+    return os.getenv("DISABLE_API_JOB_WORKER")
+
+
+# LLM rate limits
+def get_llm_max_concurrency_env():
+    return os.getenv("LLM_MAX_CONCURRENCY")
+
+
+def get_llm_requests_per_minute_env():
+    return os.getenv("LLM_REQUESTS_PER_MINUTE")
+
+
+def get_llm_rate_limit_retries_env():
+    return os.getenv("LLM_RATE_LIMIT_RETRIES")
+
+
+def get_disable_single_flight_env():
+    return os.getenv("DISABLE_SINGLE_FLIGHT")
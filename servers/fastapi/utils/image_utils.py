@@ -1,6 +1,8 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
-from PIL import Image, ImageDraw
+import numpy as np
+from PIL import Image, ImageChops, ImageDraw
 
 from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
 
@@ -46,6 +48,14 @@ def clip_image(
     return clipped_image
 
 
+@lru_cache(maxsize=64)
+def _get_corner_circle(radius: int) -> Image.Image:
+    circle = Image.new("L", (radius * 2, radius * 2), 0)
+    draw = ImageDraw.Draw(circle)
+    draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+    return circle
+
+
 def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
     if len(radii) != 4:
         raise ValueError(
@@ -62,80 +72,48 @@ def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Create a mask for the rounded corners (start with fully transparent)
-    rounded_mask = Image.new("L", image.size, 0)
-
-    # Create a rectangular mask (fully opaque)
-    rectangular_mask = Image.new("L", image.size, 255)
+    if not any(radius > 0 for radius in clamped_radii):
+        return image
 
-    # Process each corner
+    # Single opaque mask with a quarter circle pasted over each rounded corner
+    corner_mask = Image.new("L", image.size, 255)
     for i, radius in enumerate(clamped_radii):
-        if radius > 0:  # Only process if radius is positive
-            # Create a circle for this radius
-            circle = Image.new("L", (radius * 2, radius * 2), 0)
-            draw = ImageDraw.Draw(circle)
-            draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
-
-            # Calculate position based on corner index
-            if i == 0:  # top-left
-                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
-                rectangular_mask.paste(0, (0, 0, radius, radius))
-            elif i == 1:  # top-right
-                rounded_mask.paste(
-                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
-                )
-                rectangular_mask.paste(0, (w - radius, 0, w, radius))
-            elif i == 2:  # bottom-right
-                rounded_mask.paste(
-                    circle.crop((radius, radius, radius * 2, radius * 2)),
-                    (w - radius, h - radius),
-                )
-                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
-            else:  # bottom-left
-                rounded_mask.paste(
-                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
-                )
-                rectangular_mask.paste(0, (0, h - radius, radius, h))
-
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
-
-    # Combine the rectangular mask with the rounded corners
-    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
-
-    # Combine the corner mask with the original alpha channel
-    final_alpha = Image.composite(
-        original_alpha, Image.new("L", image.size, 0), corner_mask
-    )
-
-    # Create a new image with the modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
-    result.putalpha(final_alpha)
-
+        if radius <= 0:
+            continue
+
+        circle = _get_corner_circle(radius)
+        if i == 0:  # top-left
+            corner_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+        elif i == 1:  # top-right
+            corner_mask.paste(
+                circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
+            )
+        elif i == 2:  # bottom-right
+            corner_mask.paste(
+                circle.crop((radius, radius, radius * 2, radius * 2)),
+                (w - radius, h - radius),
+            )
+        else:  # bottom-left
+            corner_mask.paste(
+                circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
+            )
+
+    # The mask is either 0 or 255, so this keeps or clears the original alpha
+    result = image.copy()
+    result.putalpha(ImageChops.darker(image.getchannel("A"), corner_mask))
     return result
 
 
 def invert_image(img: Image.Image) -> Image.Image:
-    # Get image data
-    data = img.getdata()
-
-    # Process each pixel
-    new_data = []
-    for item in data:
-        # Get current pixel values
-        r, g, b, a = item
-
-        # Invert RGB values while preserving transparency
-        if a != 0:  # Skip fully transparent pixels
-            new_data.append((255 - r, 255 - g, 255 - b, a))
-        else:
-            new_data.append((0, 0, 0, 0))
+    data = np.asarray(img.convert("RGBA"))
 
-    # Create new image with modified data
-    new_img = Image.new("RGBA", img.size)
-    new_img.putdata(new_data)
-    return new_img
+    # Invert RGB values while preserving transparency
+    inverted = data ^ np.array([255, 255, 255, 0], dtype=np.uint8)
+
+    # Fully transparent pixels are cleared
+    inverted *= data[..., 3:] != 0
+
+    return Image.fromarray(inverted, "RGBA")
 
 
 def create_circle_image(
@@ -147,28 +125,25 @@ def create_circle_image(
     size = img.size
     # Use the smaller dimension for the circle
     circle_size = min(size)
-    # Create a transparent image of the same size as original
-    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
-    draw = ImageDraw.Draw(mask)
 
     # Calculate center position
     center_x = size[0] // 2
     center_y = size[1] // 2
     radius = circle_size // 2
 
-    # Create a circular mask
-    draw.ellipse(
-        (
-            center_x - radius,
-            center_y - radius,
-            center_x + radius,
-            center_y + radius,
-        ),
-        fill=(255, 255, 255, 255),
+    # Circular mask only as large as the circle's bounding box
+    box = (
+        center_x - radius,
+        center_y - radius,
+        center_x + radius + 1,
+        center_y + radius + 1,
     )
+    mask = Image.new("L", (box[2] - box[0], box[3] - box[1]), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, radius * 2, radius * 2), fill=255)
 
-    # Apply the circular mask
-    result = Image.composite(img, mask, mask)
+    # Copy the pixels inside the circle onto a transparent image
+    result = Image.new("RGBA", size, (0, 0, 0, 0))
+    result.paste(img.crop(box), box[:2], mask)
     return result
 
 
@@ -180,17 +155,13 @@ def set_image_opacity(image: Image.Image, opacity: float) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
-
-    # Create new alpha channel with adjusted opacity
-    new_alpha = original_alpha.point(lambda x: int(x * opacity))
-
-    # Create new image with modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
-    result.putalpha(new_alpha)
+    if opacity == 1.0:
+        return image
 
+    # Scale the alpha channel through a lookup table
+    alpha_table = [int(x * opacity) for x in range(256)]
+    result = image.copy()
+    result.putalpha(image.getchannel("A").point(alpha_table))
     return result
 
 
@@ -256,3 +227,42 @@ def fit_image(
         return image.resize((width, height), Image.LANCZOS)
 
     return image
+
+
+def apply_picture_transforms(
+    image_path: str, transforms: dict, output_path: str
+) -> Optional[str]:
+    """
+    Applies the transforms of a picture box to an image and saves it as png.
+    Returns None if the image can't be opened.
+    """
+    try:
+        image = Image.open(image_path)
+    except Exception:
+        print(f"Could not open image: {image_path}")
+        return None
+
+    width = transforms["width"]
+    height = transforms["height"]
+    border_radius = transforms["border_radius"]
+
+    image = image.convert("RGBA")
+    # ? Applying border radius twice to support both clip and object fit
+    if border_radius:
+        image = round_image_corners(image, border_radius)
+    if transforms["object_fit"]:
+        image = fit_image(
+            image, width, height, PptxObjectFitModel(**transforms["object_fit"])
+        )
+    elif transforms["clip"]:
+        image = clip_image(image, width, height)
+    if border_radius:
+        image = round_image_corners(image, border_radius)
+    if transforms["circle"]:
+        image = create_circle_image(image)
+    if transforms["invert"]:
+        image = invert_image(image)
+    if transforms["opacity"]:
+        image = set_image_opacity(image, transforms["opacity"])
+    image.save(output_path, "PNG")
+    return output_path
@@ -4,6 +4,7 @@ from constants.llm import (
     DEFAULT_ANTHROPIC_MODEL,
     DEFAULT_GOOGLE_MODEL,
     DEFAULT_OPENAI_MODEL,
+    DEFAULT_SLIDE_GENERATION_CONCURRENCY,
 )
 from enums.llm_provider import LLMProvider
 from utils.get_env import (
@@ -13,6 +14,7 @@ from utils.get_env import (
     get_llm_provider_env,
     get_ollama_model_env,
     get_openai_model_env,
+    get_slide_generation_concurrency_env,
 )
 
 
@@ -63,3 +65,13 @@ def get_model():
             status_code=500,
             detail=f"Invalid LLM provider. Please select one of: openai, google, anthropic, ollama, custom",
         )
+
+
+def get_slide_generation_concurrency() -> int:
+    concurrency = get_slide_generation_concurrency_env()
+    if concurrency:
+        try:
+            return max(1, int(concurrency))
+        except ValueError:
+            pass
+    return DEFAULT_SLIDE_GENERATION_CONCURRENCY.get(get_llm_provider().value, 4)
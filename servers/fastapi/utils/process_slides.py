@@ -29,13 +29,15 @@ async def process_slide_and_fetch_assets(
             )
         )
 
-    for icon_path in icon_paths:
-        __icon_query__parent = get_dict_at_path(slide.content, icon_path)
-        async_tasks.append(
-            ICON_FINDER_SERVICE.search_icons(__icon_query__parent["__icon_query__"])
-        )
+    # All icon queries of the slide are searched in one batch
+    icon_queries = [
+        get_dict_at_path(slide.content, icon_path)["__icon_query__"]
+        for icon_path in icon_paths
+    ]
+    async_tasks.append(ICON_FINDER_SERVICE.search_icons_batch(icon_queries))
 
-    results = await asyncio.gather(*async_tasks)
+    *results, icon_results = await asyncio.gather(*async_tasks)
+    results.extend(icon_results)
     results.reverse()
 
     return_assets = []
@@ -105,8 +107,8 @@ async def process_old_and_new_slides_and_fetch_assets(
     async_image_fetch_tasks = []
     new_images_fetch_status = []
 
-    # Creates async tasks for fetching new icons
-    async_icon_fetch_tasks = []
+    # Collects new icon queries to search in one batch
+    icon_queries_to_fetch = []
     new_icons_fetch_status = []
 
     # Creates async tasks for fetching new images
@@ -140,13 +142,11 @@ async def process_old_and_new_slides_and_fetch_assets(
             new_icons_fetch_status.append(False)
             continue
 
-        async_icon_fetch_tasks.append(
-            ICON_FINDER_SERVICE.search_icons(new_icon["__icon_query__"])
-        )
+        icon_queries_to_fetch.append(new_icon["__icon_query__"])
         new_icons_fetch_status.append(True)
 
     new_images = await asyncio.gather(*async_image_fetch_tasks)
-    new_icons = await asyncio.gather(*async_icon_fetch_tasks)
+    new_icons = await ICON_FINDER_SERVICE.search_icons_batch(icon_queries_to_fetch)
 
     # list of new assets
     new_assets = []
@@ -0,0 +1,51 @@
+"""
+Converts a document to PDF through a running LibreOffice listener.
+
+Runs under the Python interpreter shipped with LibreOffice's UNO bindings,
+not the server's, so it only depends on the uno module:
+
+    python3 uno_convert.py <port> <input_path> <output_path>
+"""
+
+import sys
+
+import uno
+from com.sun.star.beans import PropertyValue
+
+
+def get_property(name, value):
+    property = PropertyValue()
+    property.Name = name
+    property.Value = value
+    return property
+
+
+def convert(port: int, input_path: str, output_path: str):
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local_context
+    )
+    context = resolver.resolve(
+        f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+    )
+    desktop = context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+
+    document = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(input_path),
+        "_blank",
+        0,
+        (get_property("Hidden", True), get_property("ReadOnly", True)),
+    )
+    try:
+        document.storeToURL(
+            uno.systemPathToFileUrl(output_path),
+            (get_property("FilterName", "impress_pdf_Export"),),
+        )
+    finally:
+        document.close(True)
+
+
+if __name__ == "__main__":
+    convert(int(sys.argv[1]), sys.argv[2], sys.argv[3])
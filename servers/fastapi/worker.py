@@ -0,0 +1,47 @@
+# Standalone worker for queued presentation generations, run next to the API
+# with the same environment: python worker.py [--concurrency N]. Set
+# DISABLE_API_JOB_WORKER=true to leave every job to these workers.
+import argparse
+import asyncio
+import os
+import signal
+
+from services.database import create_db_and_tables
+from services.http_session_service import HTTP_SESSION_SERVICE
+from services.presentation_job_queue import PRESENTATION_JOB_QUEUE
+from utils.get_env import get_app_data_directory_env
+from utils.model_availability import (
+    check_llm_and_image_provider_api_or_model_availability,
+)
+
+
+async def main(concurrency: int):
+    os.makedirs(get_app_data_directory_env(), exist_ok=True)
+    await create_db_and_tables()
+    await check_llm_and_image_provider_api_or_model_availability()
+
+    # Running jobs are released to other workers on shutdown
+    loop = asyncio.get_running_loop()
+    stopped = asyncio.Event()
+    for each in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(each, stopped.set)
+
+    PRESENTATION_JOB_QUEUE.start(concurrency)
+    await stopped.wait()
+    await PRESENTATION_JOB_QUEUE.stop()
+    await HTTP_SESSION_SERVICE.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a worker for queued presentation generations"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of presentations generated at once, JOB_WORKER_CONCURRENCY by default",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency))
@@ -13,6 +13,8 @@ const DashboardPage: React.FC = () => {
   const [presentations, setPresentations] = useState<any>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     const loadData = async () => {
@@ -25,20 +27,35 @@ const DashboardPage: React.FC = () => {
     try {
       setIsLoading(true);
       setError(null);
-      const data = await DashboardApi.getPresentations();
-      data.sort(
-        (a: any, b: any) =>
-          new Date(b.updated_at).getTime() - new Date(a.updated_at).getTime()
-      );
-      setPresentations(data);
+      // Newest presentations first, one page at a time
+      const page = await DashboardApi.getPresentationsPage();
+      setPresentations(page.presentations);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       setError(null);
       setPresentations([]);
+      setNextCursor(null);
     } finally {
       setIsLoading(false);
     }
   };
 
+  const loadMorePresentations = async () => {
+    if (!nextCursor || isLoadingMore) {
+      return;
+    }
+    try {
+      setIsLoadingMore(true);
+      const page = await DashboardApi.getPresentationsPage(nextCursor);
+      setPresentations((prev: any) => [...(prev || []), ...page.presentations]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error("Error loading more presentations:", err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const removePresentation = (presentationId: string) => {
     setPresentations((prev: any) =>
       prev ? prev.filter((p: any) => p.id !== presentationId) : []
@@ -61,6 +78,17 @@ const DashboardPage: React.FC = () => {
               error={error}
               onPresentationDeleted={removePresentation}
             />
+            {!isLoading && nextCursor && (
+              <div className="flex justify-center mt-8">
+                <button
+                  onClick={loadMorePresentations}
+                  disabled={isLoadingMore}
+                  className="px-6 py-2 rounded-lg border border-gray-400 bg-white/70 hover:bg-white/80 hover:border-primary/60 text-gray-700 disabled:opacity-50 transition-all duration-300"
+                >
+                  {isLoadingMore ? "Loading..." : "Load more"}
+                </button>
+              </div>
+            )}
           </section>
         </main>
       </Wrapper>
@@ -22,23 +22,30 @@ export interface PresentationResponse {
     slides: any[];
 }
 
+export interface PresentationPageResponse {
+  presentations: PresentationResponse[];
+  next_cursor: string | null;
+}
+
 export class DashboardApi {
 
-  static async getPresentations(): Promise<PresentationResponse[]> {
+  static async getPresentationsPage(
+    cursor: string | null = null,
+    limit: number = 24
+  ): Promise<PresentationPageResponse> {
     try {
+      // Pages only carry the fields and first slide the dashboard shows
+      const params = new URLSearchParams({ limit: limit.toString() });
+      if (cursor) {
+        params.set("cursor", cursor);
+      }
       const response = await fetch(
-        `/api/v1/ppt/presentation/all`,
+        `/api/v1/ppt/presentation/list?${params.toString()}`,
         {
           method: "GET",
         }
       );
-      
-      // Handle the special case where 404 means "no presentations found"
-      if (response.status === 404) {
-        console.log("No presentations found");
-        return [];
-      }
-      
+
       return await ApiResponseHandler.handleResponse(response, "Failed to fetch presentations");
     } catch (error) {
       console.error("Error fetching presentations:", error);